@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Persistent build manifest for incremental report rebuilds.
+
+The manifest records, for each processed report, the size, mtime and SHA-256
+of the file as it was written by the build, together with the metadata that
+was extracted from it. On the next run a report whose size and mtime still
+match (or whose content hash still matches, if only the mtime moved) is
+skipped entirely and its metadata is served from the manifest.
+"""
+import os
+import json
+import hashlib
+import logging
+import datetime
+
+from report_pipeline import write_file_atomic
+
+BUILD_CACHE_FILE = ".sway_build_cache.json"
+
+logger = logging.getLogger(__name__)
+
+def content_hash(content):
+    """Return the SHA-256 hex digest of a string or bytes."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+def file_fingerprint(path, content=None):
+    """
+    Return the size, mtime and content hash of a file.
+
+    Args:
+        path: Path to the file
+        content: The file's content, if already in memory, to avoid re-reading it
+    """
+    stat = os.stat(path)
+    if content is None:
+        with open(path, "rb") as f:
+            content = f.read()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": content_hash(content),
+    }
+
+def _encode_deadline(deadline):
+    return deadline.isoformat() if deadline is not None else None
+
+def _decode_deadline(value):
+    return datetime.datetime.fromisoformat(value) if value else None
+
+class BuildCache:
+    """JSON manifest of processed reports keyed by filename."""
+
+    def __init__(self, path=BUILD_CACHE_FILE, version=1):
+        """
+        Args:
+            path: Location of the manifest file
+            version: Build version; entries written by a different version are discarded
+        """
+        self.path = path
+        self.version = str(version)
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache {self.path}: {e}")
+            return
+        if data.get("version") == self.version:
+            self.entries = data.get("files", {})
+        else:
+            # Pipeline changed since the cache was written - rebuild everything
+            self.dirty = True
+
+    def fresh_entry(self, filename):
+        """
+        Return the manifest entry for a file if the file is unchanged, else None.
+
+        The size/mtime check is a stat call; the file is only read and hashed
+        when the mtime moved but the size didn't.
+        """
+        entry = self.entries.get(filename)
+        if entry is None or not os.path.exists(filename):
+            return None
+
+        stat = os.stat(filename)
+        if stat.st_size != entry["size"]:
+            return None
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            fingerprint = file_fingerprint(filename)
+            if fingerprint["sha256"] != entry["sha256"]:
+                return None
+            # Touched but unchanged - remember the new mtime
+            entry["mtime_ns"] = fingerprint["mtime_ns"]
+            self.dirty = True
+        return entry
+
+    def lookup(self, filename):
+        """Return the cached index record for a file, or None if it must be processed."""
+        entry = self.fresh_entry(filename)
+        if entry is None:
+            return None
+        return {
+            "filename": filename,
+            "title": entry["title"],
+            "deadline": _decode_deadline(entry["deadline"]),
+        }
+
+    def store(self, record, fingerprint):
+        """Remember an index record along with the fingerprint of the written file."""
+        self.entries[record["filename"]] = {
+            "size": fingerprint["size"],
+            "mtime_ns": fingerprint["mtime_ns"],
+            "sha256": fingerprint["sha256"],
+            "title": record["title"],
+            "deadline": _encode_deadline(record["deadline"]),
+        }
+        self.dirty = True
+
+    def prune(self, filenames):
+        """Drop entries for files that are no longer part of the build."""
+        keep = set(filenames)
+        for filename in list(self.entries):
+            if filename not in keep:
+                del self.entries[filename]
+                self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": self.version, "files": self.entries}
+        write_file_atomic(self.path, json.dumps(data, indent=2, sort_keys=True))
+        self.dirty = False
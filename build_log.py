@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Logging setup and machine-readable run logs for the report build scripts.
+
+Console output goes through the standard logging module so it can be turned
+down with --quiet or up with --verbose. Expensive diagnostics (like dumping
+the structure of every report) should only run when DEBUG is enabled:
+
+    if logger.isEnabledFor(logging.DEBUG):
+        debug_html_structure(content, filename)
+
+A RunLog writes one JSON object per line (per-file timings, bytes in/out,
+which patterns matched) so a build can be analysed after the fact.
+"""
+import json
+import time
+import logging
+
+LOG_FORMAT = "%(message)s"
+DEBUG_LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+def configure_logging(level=logging.INFO):
+    """Configure the root logger for a command-line run (also used in worker processes)."""
+    logging.basicConfig(
+        level=level,
+        format=DEBUG_LOG_FORMAT if level <= logging.DEBUG else LOG_FORMAT,
+        force=True
+    )
+
+def add_logging_arguments(parser):
+    """Add the shared -v/-q/--log-level/--run-log options to an argparse parser."""
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Show debug output, including per-report structure dumps')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='Only show warnings and errors')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='Set the log level explicitly (overrides -v/-q)')
+    parser.add_argument('--run-log', type=str,
+                        help='Append a JSONL record per processed file to this path')
+
+def level_from_args(args):
+    """Return the logging level selected by the options from add_logging_arguments."""
+    if args.log_level:
+        return getattr(logging, args.log_level)
+    if args.verbose:
+        return logging.DEBUG
+    if args.quiet:
+        return logging.WARNING
+    return logging.INFO
+
+class RunLog:
+    """Append-only JSONL log of a build run. A RunLog without a path discards records."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8") if path else None
+
+    def write(self, event, **fields):
+        if self.file is None:
+            return
+        record = {"time": round(time.time(), 3), "event": event}
+        record.update(fields)
+        self.file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Keyword classifier that infers showcase categories for a report.
+
+All keywords are compiled into one alternation regex, so the report text is
+scanned once, whatever the number of keywords or categories. Each category
+gets a hit count and is assigned when the count reaches its threshold, or
+when one of its keywords is in the report title.
+
+Keywords match whole words by default; a trailing '*' matches any word
+starting with the keyword ("patient*" matches "patients"). Keywords may be
+phrases ("genetic engineering"), and a match also counts for every keyword
+it contains ("genetic engineering" is a hit for "genetic" too).
+
+The keyword table can be loaded from a JSON file (category_keywords.json
+next to the showcase page is used if it exists):
+
+    {
+      "default_categories": ["ethics"],
+      "min_hits": 5,
+      "categories": {
+        "healthcare": ["health*", "hospital*", ...],
+        "bioethics": {"keywords": ["abortion", ...], "min_hits": 2}
+      }
+    }
+
+Run this module to write the built-in table to a file, or to show the
+categories and hit counts for some reports:
+
+    python category_classifier.py --write-config category_keywords.json
+    python category_classifier.py instructor_reports/*.html
+"""
+import os
+import re
+import json
+import argparse
+from collections import Counter
+
+from build_cache import content_hash
+
+KEYWORDS_FILE = "category_keywords.json"
+
+DEFAULT_CONFIG = {
+    "default_categories": ["ethics"],
+    "min_hits": 5,
+    "categories": {
+        "healthcare": ["health*", "hospital*", "patient*", "medical", "doctor*", "care", "treatment*", "therap*", "illness*", "disease*"],
+        "science": ["science*", "scientific", "research*", "biology", "physics", "chemistry", "species", "evolution*", "genetic*"],
+        "philosophy": ["philosoph*", "ethics", "moral*", "value*", "virtue*", "principle*", "duty", "duties", "utilitarian*", "deontolog*"],
+        "bioethics": ["bioethic*", "abortion*", "euthanasia", "clone*", "cloning", "genetic engineering", "enhancement*", "reproductive"],
+        "environment": ["environment*", "climate", "ecolog*", "conservation", "species", "extinction*", "habitat*", "animal*", "sustainab*"],
+        "social-issues": ["social*", "society", "societies", "communit*", "inequalit*", "justice", "discriminat*", "polic*", "politic*", "economic*", "poverty"]
+    }
+}
+
+def keyword_pattern(keyword, word_boundary=True):
+    """Return the regex source for one keyword, without the leading word boundary."""
+    source = re.escape(keyword.rstrip('*'))
+    if not word_boundary:
+        return source
+    return source + (r'\w*' if keyword.endswith('*') else r'\b')
+
+class KeywordClassifier:
+    """Assigns categories from keyword hits in a piece of text.
+
+    Args:
+        keywords: Dict of category -> list of keywords, in display order
+        default_categories: Categories every report gets
+        min_hits: Hits a category needs unless thresholds says otherwise
+        thresholds: Optional dict of category -> hits needed
+        word_boundary: Match whole words (or word prefixes, for '*' keywords) rather than any substring
+    """
+
+    def __init__(self, keywords, default_categories=("ethics",), min_hits=1, thresholds=None,
+                 word_boundary=True):
+        self.keywords = {category: [k.lower() for k in words] for category, words in keywords.items()}
+        self.default_categories = list(default_categories)
+        self.thresholds = {category: max(1, (thresholds or {}).get(category, min_hits))
+                           for category in self.keywords}
+        self.word_boundary = word_boundary
+
+        # keyword -> categories it belongs to (a keyword may be in several)
+        self.keyword_categories = {}
+        for category, words in self.keywords.items():
+            for keyword in words:
+                self.keyword_categories.setdefault(keyword, []).append(category)
+        start = r'\b' if word_boundary else ''
+        self.keyword_patterns = {keyword: re.compile(start + keyword_pattern(keyword, word_boundary))
+                                 for keyword in self.keyword_categories}
+        # Longest first, so phrases win over the words they start with
+        alternatives = sorted(self.keyword_categories, key=lambda k: (-len(k), k))
+        if alternatives:
+            self.pattern = re.compile(start + '(?:' + '|'.join(keyword_pattern(k, word_boundary)
+                                                               for k in alternatives) + ')')
+        else:
+            self.pattern = None
+        self.fingerprint = content_hash(json.dumps(
+            [self.keywords, self.default_categories, self.thresholds, word_boundary], sort_keys=True))[:12]
+        self._match_hits = {}
+
+    def _hits_in_match(self, matched):
+        """Category hits of one match, including keywords inside it. Memoized per matched text."""
+        hits = self._match_hits.get(matched)
+        if hits is None:
+            hits = Counter()
+            for keyword, pattern in self.keyword_patterns.items():
+                count = len(pattern.findall(matched))
+                if count:
+                    for category in self.keyword_categories[keyword]:
+                        hits[category] += count
+            self._match_hits[matched] = hits
+        return hits
+
+    def hits(self, text):
+        """Return a Counter of category -> keyword hits in text."""
+        hits = Counter()
+        if self.pattern is None:
+            return hits
+        for match in self.pattern.finditer(text.lower()):
+            hits.update(self._hits_in_match(match.group()))
+        return hits
+
+    def classify(self, text, title=''):
+        """
+        Return the categories for a report, in table order after the defaults.
+
+        Args:
+            text: Report text; a category needs its threshold of hits in it
+            title: Report title; a single hit in it is enough
+        """
+        hits = self.hits(text)
+        title_hits = self.hits(title)
+        categories = list(self.default_categories)
+        for category in self.keywords:
+            if category not in categories and (title_hits[category]
+                                               or hits[category] >= self.thresholds[category]):
+                categories.append(category)
+        return categories
+
+def classifier_from_config(config):
+    """Build a KeywordClassifier from a config dict (see the module docstring)."""
+    keywords = {}
+    thresholds = {}
+    for category, entry in config.get("categories", {}).items():
+        if isinstance(entry, dict):
+            keywords[category] = entry.get("keywords", [])
+            if "min_hits" in entry:
+                thresholds[category] = entry["min_hits"]
+        else:
+            keywords[category] = entry
+    return KeywordClassifier(keywords, config.get("default_categories", ["ethics"]), config.get("min_hits", 5),
+                             thresholds, config.get("word_boundary", True))
+
+def keywords_file_for(showcase_file):
+    """Return the keyword config file that belongs to a showcase file."""
+    return os.path.join(os.path.dirname(os.path.abspath(showcase_file)), KEYWORDS_FILE)
+
+def load_classifier(path=None):
+    """
+    Load a classifier from a JSON keyword config, or the built-in table.
+
+    Args:
+        path: Config file; the built-in table is used if it is None or doesn't exist
+    """
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return classifier_from_config(json.load(f))
+    return classifier_from_config(DEFAULT_CONFIG)
+
+_default_classifier = None
+
+def default_classifier():
+    """Return the classifier for the built-in keyword table, compiled once per process."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = load_classifier()
+    return _default_classifier
+
+if __name__ == "__main__":
+    from report_document import parse_report_document, visible_text
+
+    parser = argparse.ArgumentParser(description='Infer showcase categories from report keywords')
+    parser.add_argument('files', nargs='*', help='Report HTML files to classify')
+    parser.add_argument('--config', help='Keyword config file (default: built-in table)')
+    parser.add_argument('--write-config', metavar='PATH', help='Write the built-in keyword table to PATH')
+    args = parser.parse_args()
+
+    if args.write_config:
+        with open(args.write_config, "w", encoding="utf-8") as f:
+            json.dump(DEFAULT_CONFIG, f, indent=2)
+            f.write("\n")
+        print(f"Wrote the built-in keyword table to {args.write_config}")
+    classifier = load_classifier(args.config)
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        document = parse_report_document(content, path, classifier)
+        hits = classifier.hits(visible_text(content))
+        print(f"{os.path.basename(path)}: {', '.join(document.categories)}  "
+              f"({', '.join(f'{c}={n}' for c, n in hits.most_common())})")
@@ -1,259 +1,249 @@
 #!/usr/bin/env python3
 import os
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+import copy
+import functools
+import threading
+from contextlib import contextmanager
+from flask import Flask, render_template, request, redirect, url_for, jsonify, make_response
 from bs4 import BeautifulSoup
-import json
-import html
 from pathlib import Path
 
+import update_showcase
+from showcase_jobs import JobRunner
+from category_suggestions import SuggestionIndex, read_report_text, suggestions_path_for
+from showcase_data import (
+    showcase_data_path, load_showcase_data, save_showcase_data, load_or_migrate, ordered_reports,
+    data_from_reports, write_showcase_html, clean_filename, showcase_lock, CategoryIndex
+)
+
 app = Flask(__name__)
 
 # Configuration
 SHOWCASE_FILE = "instructor_reports_showcase.html"
 REPORTS_DIR = "instructor_reports"
+# Processes parsing reports in update_showcase runs started from the manager
+UPDATE_WORKERS = os.cpu_count() or 1
 
-def parse_showcase_file():
-    """Parse the showcase HTML file and extract categories and reports"""
-    with open(SHOWCASE_FILE, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    # Extract categories
-    categories = []
-    category_pills = soup.select('.category-pill')
-    for pill in category_pills:
-        if 'data-category' in pill.attrs:
-            category = pill['data-category']
-            if category != 'all':  # Skip the "All Reports" category
-                categories.append(category)
-    
-    # Extract reports and their assigned categories
-    reports = []
-    report_cards = soup.select('.report-card')
-    for idx, card in enumerate(report_cards):
-        title = html.unescape(card.select_one('.report-title').get_text().strip())
-        description = html.unescape(card.select_one('.report-description').get_text().strip())
-        link = card.select_one('.view-link')['href']
-        filename = os.path.basename(link)
-        # Strip query parameters from filename
-        if '?' in filename:
-            filename = filename.split('?')[0]
-        
-        # Get assigned categories
-        assigned_categories = []
-        if 'data-categories' in card.attrs:
-            assigned_categories = card['data-categories'].split()
-        
-        enabled = not ('data-disabled' in card.attrs and card['data-disabled'] == 'true')
-        
-        reports.append({
-            'title': title,
-            'description': description,
-            'filename': filename,
-            'categories': assigned_categories,
-            'enabled': enabled,
-            'position': idx + 1  # Add position information (1-based)
-        })
-    
-    return categories, reports
+def parse_showcase_file(path=None):
+    """Load the showcase categories and reports (in order) from the JSON data store"""
+    data = load_or_migrate(path or SHOWCASE_FILE)
+    return data['categories'], ordered_reports(data)
 
-def save_showcase_file(categories, reports):
-    """Save updated categories and report assignments back to the showcase file"""
-    with open(SHOWCASE_FILE, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    # Update category pills
-    category_bar = soup.select_one('.category-bar')
-    category_bar.clear()
-    
-    # Add "All Reports" pill
-    all_pill = soup.new_tag('button')
-    all_pill['class'] = 'category-pill active'
-    all_pill['data-category'] = 'all'
-    all_pill.string = 'All Reports'
-    category_bar.append(all_pill)
-    
-    # Add all other category pills
-    for category in categories:
-        pill = soup.new_tag('button')
-        pill['class'] = 'category-pill'
-        pill['data-category'] = category
-        pill.string = category.replace('-', ' ').title()
-        category_bar.append(pill)
-    
-    # Sort reports by position if specified
-    if any('position' in report for report in reports):
-        reports.sort(key=lambda r: r.get('position', float('inf')))
-    
-    # Update report cards
-    report_cards_container = soup.select_one('.report-cards')
-    report_cards_container.clear()
-    while report_cards_container.contents:
-        report_cards_container.contents[0].decompose()
-    
-    for report in reports:
-        # Always strip query parameters from filename before saving
-        filename = report['filename']
-        if '?' in filename:
-            filename = filename.split('?')[0]
-        report['filename'] = filename
-        # Create a new report card
-        card = soup.new_tag('div')
-        card['class'] = 'report-card'
-        
-        # Ensure categories are normalized and non-empty
-        valid_categories = [c.strip().lower() for c in report['categories'] if c.strip()]
-        card['data-categories'] = ' '.join(valid_categories)
-        
-        # Always set the disabled attribute explicitly to ensure frontend JS works correctly
-        card['data-disabled'] = str(not report.get('enabled', True)).lower()
-        if not report.get('enabled', True):
-            card['class'] = 'report-card disabled-report'
-            card['style'] = 'display: none;'  # Initially hidden
-        
-        # Create title div - use a direct HTML approach to avoid escaping issues
-        title_div = soup.new_tag('div')
-        title_div['class'] = 'report-title'
-        title_div.clear()
-        # Insert as raw HTML instead of text to preserve entities
-        title_html = BeautifulSoup(f"<span>{report['title']}</span>", 'html.parser')
-        title_div.append(title_html.span.contents[0])
-        card.append(title_div)
-        
-        # Create description div - same approach
-        desc_div = soup.new_tag('div')
-        desc_div['class'] = 'report-description'
-        desc_div.clear()
-        # Insert as raw HTML instead of text to preserve entities
-        desc_html = BeautifulSoup(f"<span>{report['description']}</span>", 'html.parser')
-        desc_div.append(desc_html.span.contents[0])
-        card.append(desc_div)
-        
-        # Create link
-        link = soup.new_tag('a')
-        link['class'] = 'view-link'
-        link['href'] = f"instructor_reports/{report['filename']}"
-        link['target'] = '_blank'
-        
-        # Create icon for link
-        icon = soup.new_tag('i')
-        icon['class'] = 'fas fa-external-link-alt mr-1'
-        link.append(icon)
-        
-        link.append(' View Full Report')
-        card.append(link)
-        
-        report_cards_container.append(card)
-    
-    # Update the JavaScript to dynamically update category counts
-    script_tag = soup.find('script', string=lambda s: s and 'category filtering' in s.lower())
-    if not script_tag:
-        script_tag = soup.new_tag('script')
-        if soup.body:
-            soup.body.append(script_tag)
-    
-    # Replace or add our enhanced script for dynamic category counts
-    script_tag.string = '''
-    // Function to update category counts
-    function updateCategoryCounts() {
-        const categories = {};
-        const allReportsCount = document.querySelectorAll('.report-card:not([data-disabled="true"])').length;
-        
-        // Reset counts
-        document.querySelectorAll('.category-pill').forEach(pill => {
-            const category = pill.getAttribute('data-category');
-            if (category === 'all') {
-                pill.textContent = `All Reports (${allReportsCount})`;
-            } else {
-                categories[category] = 0;
-            }
-        });
-        
-        // Count reports for each category
-        document.querySelectorAll('.report-card:not([data-disabled="true"])').forEach(card => {
-            const cardCategories = (card.getAttribute('data-categories') || '').split(' ');
-            cardCategories.forEach(category => {
-                if (category && categories.hasOwnProperty(category)) {
-                    categories[category]++;
-                }
-            });
-        });
-        
-        // Update category pills with counts
-        for (const [category, count] of Object.entries(categories)) {
-            const pill = document.querySelector(`.category-pill[data-category="${category}"]`);
-            if (pill) {
-                const name = category.replace(/-/g, ' ').replace(/\\b\\w/g, c => c.toUpperCase());
-                pill.textContent = `${name} (${count})`;
-            }
-        }
-    }
-    
-    // Category filtering
-    document.querySelectorAll('.category-pill').forEach(pill => {
-        pill.addEventListener('click', () => {
-            // Update active state
-            document.querySelectorAll('.category-pill').forEach(p => p.classList.remove('active'));
-            pill.classList.add('active');
-            
-            const category = pill.getAttribute('data-category');
-            
-            // Filter cards
-            document.querySelectorAll('.report-card').forEach(card => {
-                if (category === 'all' || card.getAttribute('data-categories').includes(category)) {
-                    card.style.display = '';
-                } else {
-                    card.style.display = 'none';
-                }
-            });
-        });
-    });
-    
-    // Update category counts on page load
-    document.addEventListener('DOMContentLoaded', updateCategoryCounts);
-    
-    // Theme toggle
-    const themeToggle = document.getElementById('theme-toggle');
-    if (themeToggle) {
-        const body = document.body;
-        const icon = themeToggle.querySelector('i');
-        
-        // Check for saved theme preference
-        const savedTheme = localStorage.getItem('theme');
-        if (savedTheme === 'dark') {
-            body.classList.add('dark-mode');
-            icon.classList.remove('fa-moon');
-            icon.classList.add('fa-sun');
-        }
-        
-        themeToggle.addEventListener('click', () => {
-            body.classList.toggle('dark-mode');
-            
-            if (body.classList.contains('dark-mode')) {
-                icon.classList.remove('fa-moon');
-                icon.classList.add('fa-sun');
-                localStorage.setItem('theme', 'dark');
-            } else {
-                icon.classList.remove('fa-sun');
-                icon.classList.add('fa-moon');
-                localStorage.setItem('theme', 'light');
-            }
-        });
-    }
-    
-    // Don't show disabled reports
-    document.querySelectorAll('.report-card[data-disabled="true"]').forEach(card => {
-        card.style.display = 'none';
-    });
-    '''
-    
-    # Save the updated showcase file with HTML preserved
-    html_output = str(soup)
-    with open(SHOWCASE_FILE, 'w', encoding='utf-8') as file:
-        file.write(html_output)
+def save_showcase_file(categories, reports, path=None):
+    """Save updated categories and report assignments to the data store and re-render the showcase
+    
+    Args:
+        categories: List of category names
+        reports: List of report dicts
+        path: Showcase file to write, defaults to SHOWCASE_FILE
+    
+    Returns:
+        The saved showcase data, including its new version
+    """
+    path = path or SHOWCASE_FILE
+    data_path = showcase_data_path(path)
+    with showcase_lock(data_path):
+        current = load_showcase_data(data_path)
+        data = data_from_reports(categories, reports, version=current['version'] if current else 0)
+        save_showcase_data(data_path, data)
+        write_showcase_html(path, data)
+    return data
+
+class ShowcaseStore:
+    """Process-wide in-memory copy of the showcase categories and reports.
+    
+    The JSON data store is loaded once and reads are served from memory. If it
+    changes on disk (e.g. update_showcase.py saved it) the next access reloads
+    it. Writes go straight through to the store and re-render the showcase
+    page from its template; the in-memory indexes are then updated for just
+    the reports and categories that changed.
+    
+    Read-modify-write sequences must run inside transaction(), which also
+    holds the store's file lock so other workers and update_showcase.py
+    cannot interleave. The store version doubles as the ETag of the data.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.data_path = showcase_data_path(path)
+        self.lock = threading.RLock()
+        self.categories = []
+        self.reports = []
+        self.index = {}
+        self.positions = {}
+        self.category_index = CategoryIndex()
+        self.search_text = {}
+        self.version = 0
+        self.data_state = None
+    
+    @staticmethod
+    def _file_state(path):
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _ensure_store(self):
+        # Migrating from the HTML page writes the store, so it needs the file
+        # lock - which is always taken before self.lock, never while holding it
+        if not os.path.exists(self.data_path):
+            with showcase_lock(self.data_path):
+                load_or_migrate(self.path, self.data_path)
+    
+    def _refresh(self):
+        state = self._file_state(self.data_path)
+        if state is None or state != self.data_state:
+            data = load_or_migrate(self.path, self.data_path)
+            self._load(data)
+            self.category_index = CategoryIndex(self.categories, self.reports)
+            self.search_text = {report['filename']: self._search_text(report) for report in self.reports}
+    
+    @staticmethod
+    def _search_text(report):
+        return f"{report['title']}\n{report['description']}".lower()
+    
+    def _load(self, data):
+        self.categories, self.reports = data['categories'], ordered_reports(data)
+        self.index = {report['filename']: report for report in self.reports}
+        self.positions = {report['filename']: i for i, report in enumerate(self.reports)}
+        self.version = data['version']
+        self.data_state = self._file_state(self.data_path)
+    
+    def _apply_saved(self, data):
+        """Update the indexes for what changed between the loaded data and data we just saved"""
+        old_categories, old_index = self.categories, self.index
+        self._load(data)
+        index = self.category_index
+        
+        for category in set(old_categories) - set(self.categories):
+            index.delete_category(category)
+        for category in self.categories:
+            index.add_category(category)
+        for filename, report in self.index.items():
+            old = old_index.get(filename)
+            if old is None:
+                index.add(filename, report['categories'], report.get('enabled', True))
+            else:
+                if old['categories'] != report['categories']:
+                    index.assign(filename, report['categories'])
+                if old.get('enabled', True) != report.get('enabled', True):
+                    index.set_enabled(filename, report.get('enabled', True))
+            if old is None or (old['title'], old['description']) != (report['title'], report['description']):
+                self.search_text[filename] = self._search_text(report)
+        for filename in old_index.keys() - self.index.keys():
+            index.remove(filename)
+            self.search_text.pop(filename, None)
+    
+    @contextmanager
+    def _current(self):
+        """Hold self.lock with the in-memory data up to date."""
+        self._ensure_store()
+        with self.lock:
+            self._refresh()
+            yield
+    
+    @contextmanager
+    def transaction(self):
+        """Hold the store lock, across threads and processes, for a read-modify-write.
+        
+        The file lock is taken first: waiting for it (e.g. while update_showcase
+        saves its merge) must not block readers on self.lock.
+        """
+        with showcase_lock(self.data_path):
+            self._ensure_store()
+            with self.lock:
+                yield self
+    
+    def etag(self):
+        """Return the ETag of the current data, i.e. its version."""
+        with self._current():
+            return str(self.version)
+    
+    def read(self):
+        """Return the current (categories, reports). Shared - callers must not modify them."""
+        with self._current():
+            return self.categories, self.reports
+    
+    def lookup(self):
+        """Return a filename -> report dict of the current reports. Shared - callers must not modify it."""
+        with self._current():
+            return self.index
+    
+    def query(self, category=None, enabled=None, q=None):
+        """Return the reports matching a category, enabled state and search text, in showcase order.
+        
+        Args:
+            category: Only reports with this category
+            enabled: Only enabled (True) or disabled (False) reports
+            q: Only reports whose title or description contains this text (case-insensitive)
+        
+        Returns:
+            List of shared report dicts - callers must not modify them
+        """
+        with self._current():
+            if category:
+                filenames = self.category_index.filenames(category)
+                reports = [self.index[f] for f in sorted(filenames, key=self.positions.__getitem__)]
+            else:
+                reports = self.reports
+            if enabled is not None:
+                reports = [r for r in reports if r.get('enabled', True) == enabled]
+            if q:
+                q = q.lower()
+                reports = [r for r in reports if q in self.search_text[r['filename']]]
+            return reports
+    
+    def category_counts(self):
+        """Return {category: number of enabled reports}, with the total under 'all'."""
+        with self._current():
+            return self.category_index.counts
+    
+    def snapshot(self):
+        """Return a private copy of (categories, reports) that the caller may modify and save."""
+        with self._current():
+            return list(self.categories), copy.deepcopy(self.reports)
+    
+    def save(self, categories, reports):
+        """Write categories and reports through to the data store and the showcase page.
+        
+        Returns:
+            The new version
+        """
+        with self.transaction():
+            # Make sure the changes are worked out against the data on disk
+            self._refresh()
+            data = save_showcase_file(categories, reports, path=self.path)
+            self._apply_saved(data)
+            return self.version
+
+store = ShowcaseStore(SHOWCASE_FILE)
+
+def locked_mutation(view):
+    """Run a mutating route as one store transaction, honouring If-Match.
+    
+    A request whose If-Match header doesn't match the current version gets a
+    412 and changes nothing. Requests that can't set headers (sendBeacon) may
+    send the version as a "version" field of their JSON body instead. The
+    response carries the new version as its ETag.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method == 'GET':
+            return view(*args, **kwargs)
+        with store.transaction():
+            current = store.etag()
+            body = request.get_json(silent=True) if request.is_json else None
+            expected = body.get('version') if isinstance(body, dict) else None
+            if ((request.if_match and not request.if_match.contains(current))
+                    or (expected is not None and str(expected) != current)):
+                response = jsonify({'success': False, 'version': int(current),
+                                    'error': 'The showcase was changed by someone else; reload and try again'})
+                response.status_code = 412
+            else:
+                response = make_response(view(*args, **kwargs))
+            response.set_etag(store.etag())
+            return response
+    return wrapper
 
 def update_report_title(report_filename, new_title):
     """Update the <title> and main heading in the instructor report HTML file."""
@@ -284,28 +274,177 @@ def update_report_title(report_filename, new_title):
         f.write(str(soup))
     return True
 
-@app.route('/')
-def index():
-    """Main page for category management"""
-    categories, reports = parse_showcase_file()
+def find_report(reports, filename):
+    """Return the report with the given filename (query string and case ignored), or None"""
+    filename = clean_filename(filename).strip().lower()
+    return next((r for r in reports if r['filename'].strip().lower() == filename), None)
+
+def rename_category(categories, reports, old_category, new_category):
+    """Rename a category in the category list and on every report using it. Returns True if renamed."""
+    if old_category not in categories or not new_category or new_category in categories:
+        return False
+    # Replace the category in the list
+    categories[categories.index(old_category)] = new_category
+    # Update all reports using this category
+    for report in reports:
+        if old_category in report['categories']:
+            report['categories'].remove(old_category)
+            report['categories'].append(new_category)
+    return True
+
+def reorder_reports(reports, report_order):
+    """Return the reports in the given filename order, with any reports not listed appended at the end"""
+    # Create a lookup of filename -> report
+    report_lookup = {report['filename']: report for report in reports}
     
-    # Sort reports by position if available, otherwise by title
-    if any('position' in report for report in reports):
-        reports.sort(key=lambda r: r.get('position', float('inf')))
-    else:
-        reports.sort(key=lambda r: r['title'])
+    # Create a new ordered list of reports
+    new_reports = []
+    placed = set()
+    for filename in report_order:
+        if filename in report_lookup and filename not in placed:
+            new_reports.append(report_lookup[filename])
+            placed.add(filename)
+    
+    # Add any reports that weren't in the order list at the end
+    new_reports.extend(report for report in reports if report['filename'] not in placed)
+    for i, report in enumerate(new_reports):
+        report['position'] = i + 1
+    return new_reports
+
+def locate_report_file(filename):
+    """Return (visible_path, hidden_path) for a report file"""
+    return (os.path.join(os.path.abspath(REPORTS_DIR), filename),
+            os.path.join(os.path.abspath("hidden_reports"), filename))
+
+def move_report_file(filename, enabled):
+    """Move a report file between the reports and hidden_reports directories
     
-    # Calculate category counts for sidebar display
-    category_counts = {'all': len([r for r in reports if r.get('enabled', True)])}
-    for category in categories:
-        category_counts[category] = len([r for r in reports if category in r['categories'] and r.get('enabled', True)])
+    Args:
+        filename: Report filename
+        enabled: True to make the report visible, False to hide it
     
-    return render_template('category_manager.html', categories=categories, reports=reports, category_counts=category_counts)
+    Raises:
+        FileNotFoundError: If the report is in neither directory
+    """
+    import shutil
+    visible_path, hidden_path = locate_report_file(filename)
+    os.makedirs(os.path.dirname(hidden_path), exist_ok=True)
+    source, target = (hidden_path, visible_path) if enabled else (visible_path, hidden_path)
+    if os.path.exists(source):
+        if not os.path.exists(target):
+            shutil.move(source, target)
+            print(f"Moved file from {source} to {target}")
+        else:
+            print(f"File already exists in {'visible' if enabled else 'hidden'} path: {target}")
+    elif os.path.exists(target):
+        print(f"File already exists in the correct location: {target}")
+    else:
+        print(f"Error: File not found in either location: {filename}")
+        raise FileNotFoundError(f"File not found: {filename}")
+
+BATCH_OPERATIONS = ('assign', 'rename', 'reorder', 'toggle', 'retitle')
+
+def apply_batch(categories, reports, operations):
+    """Apply a list of batch operations to a snapshot of the showcase
+    
+    Operations are dicts with an "op" key:
+        {"op": "assign", "filename": ..., "categories": [...]}
+        {"op": "retitle", "filename": ..., "title": ...}
+        {"op": "toggle", "filename": ..., "enabled": true/false}
+        {"op": "rename", "old_category": ..., "new_category": ...}
+        {"op": "reorder", "order": [filename, ...]}
+        {"op": "reorder", "filename": ..., "position": n}  (1-based)
+    
+    Nothing is written here; file changes implied by the operations are
+    returned so the caller can perform them once the whole batch is valid.
+    
+    Args:
+        categories: Category list, modified in place
+        reports: Report list, modified in place
+        operations: List of operation dicts
+    
+    Returns:
+        Tuple of (reports in their new order, {filename: enabled}, {filename: title})
+    
+    Raises:
+        ValueError: If an operation is invalid; the message names its index
+    """
+    visibility = {}
+    titles = {}
+    for index, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in BATCH_OPERATIONS:
+            raise ValueError(f"Operation {index}: unknown op {op!r}")
+        
+        if op == 'rename':
+            old_category = operation.get('old_category')
+            new_category = (operation.get('new_category') or '').lower().strip().replace(' ', '-')
+            if not rename_category(categories, reports, old_category, new_category):
+                raise ValueError(f"Operation {index}: cannot rename {old_category!r} to {new_category!r}")
+            continue
+        
+        if op == 'reorder' and 'order' in operation:
+            if not isinstance(operation['order'], list):
+                raise ValueError(f"Operation {index}: order must be a list of filenames")
+            reports[:] = reorder_reports(reports, operation['order'])
+            continue
+        
+        report = find_report(reports, operation.get('filename') or '')
+        if report is None:
+            raise ValueError(f"Operation {index}: report {operation.get('filename')!r} not found")
+        
+        if op == 'assign':
+            new_categories = operation.get('categories')
+            if not isinstance(new_categories, list):
+                raise ValueError(f"Operation {index}: categories must be a list")
+            report['categories'] = new_categories
+        elif op == 'retitle':
+            title = (operation.get('title') or '').strip()
+            if not title:
+                raise ValueError(f"Operation {index}: missing title")
+            report['title'] = title
+            titles[report['filename']] = title
+        elif op == 'toggle':
+            enabled = operation.get('enabled')
+            if not isinstance(enabled, bool):
+                raise ValueError(f"Operation {index}: enabled must be true or false")
+            visible_path, hidden_path = locate_report_file(report['filename'])
+            if not os.path.exists(visible_path) and not os.path.exists(hidden_path):
+                raise ValueError(f"Operation {index}: file not found: {report['filename']}")
+            report['enabled'] = enabled
+            visibility[report['filename']] = enabled
+        elif op == 'reorder':
+            try:
+                position = int(operation.get('position'))
+            except (TypeError, ValueError):
+                position = 0
+            if not 1 <= position <= len(reports):
+                raise ValueError(f"Operation {index}: invalid position {operation.get('position')!r}")
+            reports.remove(report)
+            reports.insert(position - 1, report)
+            for i, r in enumerate(reports):
+                r['position'] = i + 1
+    return reports, visibility, titles
+
+INDEX_PAGE_SIZE = 200
+
+@app.route('/')
+def index():
+    """Main page for category management
+    
+    The page loads its report cards from /api/reports, which filters, searches
+    and pages them on the server, per_page reports at a time.
+    """
+    categories, reports = store.read()
+    per_page = max(1, request.args.get('per_page', INDEX_PAGE_SIZE, type=int))
+    return render_template('category_manager.html', categories=categories, category_counts=store.category_counts(),
+                           version=store.etag(), per_page=per_page, total=len(reports))
 
 @app.route('/categories', methods=['GET', 'POST'])
+@locked_mutation
 def manage_categories():
     """Handle category management"""
-    categories, reports = parse_showcase_file()
+    categories, reports = store.snapshot()
     
     if request.method == 'POST':
         action = request.form.get('action')
@@ -329,46 +468,24 @@ def manage_categories():
             old_category = request.form.get('old_category')
             new_category = request.form.get('new_category').lower().strip().replace(' ', '-')
             
-            if old_category in categories and new_category and new_category not in categories:
-                # Replace the category in the list
-                index = categories.index(old_category)
-                categories[index] = new_category
-                
-                # Update all reports using this category
-                for report in reports:
-                    if old_category in report['categories']:
-                        report['categories'].remove(old_category)
-                        report['categories'].append(new_category)
+            rename_category(categories, reports, old_category, new_category)
         
         # Save changes
-        save_showcase_file(categories, reports)
-        
-        # Force update the showcase file to reflect the category changes
-        showcase_path = os.path.abspath(SHOWCASE_FILE)
-        reports_dir = os.path.abspath(REPORTS_DIR)
+        store.save(categories, reports)
         
-        try:
-            # Import and reload update_showcase module
-            import sys
-            import importlib
-            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-            import update_showcase
-            importlib.reload(update_showcase)
-            
-            # Update the showcase with the new categories
-            update_showcase.update_showcase(showcase_path, reports_dir, refresh_existing=False)
-            print("Automatically updated showcase after category change")
-        except Exception as e:
-            print(f"Error updating showcase after category change: {e}")
+        # Update the showcase in the background to pick up the category changes
+        job = submit_update_job(refresh_existing=False)
+        print(f"Queued showcase update {job['id']} after category change")
         
         return redirect(url_for('index'))
     
     return render_template('category_manager.html', categories=categories, reports=reports)
 
 @app.route('/assign', methods=['POST'])
+@locked_mutation
 def assign_categories():
     """Handle category assignment to reports"""
-    categories, reports = parse_showcase_file()
+    categories, reports = store.snapshot()
     
     report_index = int(request.form.get('report_index'))
     new_categories = request.form.getlist('categories')
@@ -383,14 +500,15 @@ def assign_categories():
             # Also update the actual report file
             update_report_title(reports[report_index]['filename'], new_title)
             
-        save_showcase_file(categories, reports)
+        store.save(categories, reports)
     
     return redirect(url_for('index'))
 
 @app.route('/update_position', methods=['POST'])
+@locked_mutation
 def update_position():
     """Update the position of a report in the showcase"""
-    categories, reports = parse_showcase_file()
+    categories, reports = store.snapshot()
     
     report_index = int(request.form.get('report_index'))
     new_position = int(request.form.get('new_position'))
@@ -413,42 +531,128 @@ def update_position():
             report['position'] = i + 1
         
         # Save the updated showcase
-        save_showcase_file(categories, reports)
+        store.save(categories, reports)
         
         return redirect(url_for('index'))
     
     return jsonify({"success": False, "error": "Invalid report index or position"}), 400
 
+REPORT_FIELDS = ('filename', 'title', 'description', 'categories', 'enabled', 'position')
+
+def parse_bool_arg(value):
+    """Parse a true/false query argument, returning None if it is absent"""
+    if value is None or value == '':
+        return None
+    if value.lower() in ('true', '1', 'yes'):
+        return True
+    if value.lower() in ('false', '0', 'no'):
+        return False
+    raise ValueError(f"Invalid boolean {value!r}")
+
 @app.route('/api/reports', methods=['GET'])
 def get_reports():
-    """API endpoint to get reports data"""
-    categories, reports = parse_showcase_file()
-    return jsonify(reports)
+    """API endpoint to get reports data
+    
+    Query arguments (all optional):
+        category: Only reports in this category
+        enabled: true/false - only enabled or disabled reports
+        q: Only reports whose title or description contains this text
+        offset, limit: Return a slice of the matching reports
+        fields: Comma-separated report fields to include, e.g. "filename,title"
+    
+    The response is the list of matching reports; X-Total-Count holds the
+    number of matches before offset/limit. The ETag is the store version, so a
+    request with a current If-None-Match gets an empty 304.
+    """
+    etag = store.etag()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        enabled = parse_bool_arg(request.args.get('enabled'))
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = request.args.get('limit')
+        limit = max(0, int(limit)) if limit not in (None, '') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()]
+    unknown = [f for f in fields if f not in REPORT_FIELDS]
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown fields: {', '.join(unknown)}"}), 400
+    
+    reports = store.query(category=request.args.get('category') or None, enabled=enabled,
+                          q=request.args.get('q', '').strip() or None)
+    total = len(reports)
+    reports = reports[offset:offset + limit if limit is not None else None]
+    if fields:
+        reports = [{field: report.get(field) for field in fields} for report in reports]
+    
+    response = jsonify(reports)
+    response.set_etag(etag)
+    response.headers['X-Total-Count'] = str(total)
+    return response
 
 @app.route('/api/categories', methods=['GET'])
 def get_categories():
     """API endpoint to get categories data"""
-    categories, reports = parse_showcase_file()
-    return jsonify(categories)
+    categories, reports = store.read()
+    response = jsonify(categories)
+    response.set_etag(store.etag())
+    return response
+
+_suggestions = {'path': None, 'mtime': None, 'index': None}
+
+def suggestion_index():
+    """Return the trained category suggestion index of the showcase, reloaded when the file changes"""
+    path = suggestions_path_for(store.path)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    if (_suggestions['path'], _suggestions['mtime']) != (path, mtime):
+        _suggestions.update(path=path, mtime=mtime, index=SuggestionIndex.load(path) if mtime else None)
+    return _suggestions['index']
+
+@app.route('/api/suggest_categories', methods=['GET'])
+def api_suggest_categories():
+    """API endpoint to suggest categories for a report, learned from the categories already assigned"""
+    filename = request.args.get('filename', '')
+    if not filename or os.path.basename(filename) != filename:
+        return jsonify({'success': False, 'error': 'Missing or invalid filename'}), 400
+    path = next((p for p in locate_report_file(filename) if os.path.exists(p)), None)
+    if path is None:
+        return jsonify({'success': False, 'error': 'Report file not found'}), 404
+    index = suggestion_index()
+    if index is None:
+        return jsonify({'success': False,
+                        'error': 'No suggestion index; run category_suggestions.py --train'}), 404
+    return jsonify({
+        'success': True,
+        'filename': filename,
+        'suggestions': [{'category': category, 'score': score}
+                        for category, score in index.suggest(read_report_text(path))],
+        'trained_version': index.trained_version,
+    })
 
 @app.route('/api/assign', methods=['POST'])
+@locked_mutation
 def api_assign_categories():
     """API endpoint to assign categories to a report"""
     data = request.json
     report_filename = data.get('filename')
     new_categories = data.get('categories', [])
     
-    categories, reports = parse_showcase_file()
+    categories, reports = store.snapshot()
     
     for report in reports:
         if report['filename'] == report_filename:
             report['categories'] = new_categories
-            save_showcase_file(categories, reports)
+            store.save(categories, reports)
             return jsonify({"success": True})
     
     return jsonify({"success": False, "error": "Report not found"})
 
 @app.route('/api/update_title', methods=['POST'])
+@locked_mutation
 def api_update_title():
     """API endpoint to update a report title"""
     data = request.json
@@ -461,15 +665,16 @@ def api_update_title():
     if not ok:
         return jsonify({'success': False, 'error': 'Report file not found'}), 404
     # Update the showcase file
-    categories, reports = parse_showcase_file()
+    categories, reports = store.snapshot()
     for report in reports:
         if report['filename'] == filename:
             report['title'] = new_title
-            save_showcase_file(categories, reports)
+            store.save(categories, reports)
             break
     return jsonify({'success': True})
 
 @app.route('/api/reorder', methods=['POST'])
+@locked_mutation
 def api_reorder_reports():
     """API endpoint to reorder reports in the showcase"""
     data = request.json
@@ -478,34 +683,17 @@ def api_reorder_reports():
     if not report_order:
         return jsonify({'success': False, 'error': 'Missing report order'}), 400
     
-    categories, reports = parse_showcase_file()
-    
-    # Create a lookup of filename -> report
-    report_lookup = {report['filename']: report for report in reports}
-    
-    # Create a new ordered list of reports
-    new_reports = []
-    for idx, filename in enumerate(report_order):
-        if filename in report_lookup:
-            report = report_lookup[filename]
-            report['position'] = idx + 1  # Update position
-            new_reports.append(report)
-    
-    # Add any reports that weren't in the order list at the end
-    for report in reports:
-        if report['filename'] not in report_order:
-            report['position'] = len(new_reports) + 1
-            new_reports.append(report)
+    categories, reports = store.snapshot()
     
     # Save the reordered reports
-    save_showcase_file(categories, new_reports)
+    store.save(categories, reorder_reports(reports, report_order))
     
     return jsonify({'success': True})
 
 @app.route('/api/toggle_visibility', methods=['POST'])
+@locked_mutation
 def api_toggle_visibility():
     """API endpoint to toggle report visibility"""
-    import shutil
     try:
         data = request.json
         if not data:
@@ -523,48 +711,14 @@ def api_toggle_visibility():
         if filename is None or enabled is None:
             return jsonify({'success': False, 'error': 'Missing filename or enabled state'}), 400
         
-        # File paths
-        reports_dir = os.path.abspath(REPORTS_DIR)
-        hidden_dir = os.path.abspath("hidden_reports")
-        os.makedirs(hidden_dir, exist_ok=True)
-        visible_path = os.path.join(reports_dir, filename)
-        hidden_path = os.path.join(hidden_dir, filename)
-        file_moved = False
-        
-        # Move file as needed
-        if enabled:
-            # Show: move from hidden to visible
-            if os.path.exists(hidden_path):
-                if not os.path.exists(visible_path):
-                    shutil.move(hidden_path, visible_path)
-                    print(f"Moved file from {hidden_path} to {visible_path}")
-                else:
-                    print(f"File already exists in visible path: {visible_path}")
-                file_moved = True
-            elif os.path.exists(visible_path):
-                print(f"File already exists in the correct location: {visible_path}")
-                file_moved = True
-            else:
-                print(f"Error: File not found in either location: {filename}")
-                return jsonify({'success': False, 'error': f"File not found: {filename}"}), 404
-        else:
-            # Hide: move from visible to hidden
-            if os.path.exists(visible_path):
-                if not os.path.exists(hidden_path):
-                    shutil.move(visible_path, hidden_path)
-                    print(f"Moved file from {visible_path} to {hidden_path}")
-                else:
-                    print(f"File already exists in hidden path: {hidden_path}")
-                file_moved = True
-            elif os.path.exists(hidden_path):
-                print(f"File already exists in the correct location: {hidden_path}")
-                file_moved = True
-            else:
-                print(f"Error: File not found in either location: {filename}")
-                return jsonify({'success': False, 'error': f"File not found: {filename}"}), 404
+        try:
+            move_report_file(filename, enabled)
+        except FileNotFoundError as e:
+            return jsonify({'success': False, 'error': str(e)}), 404
+        file_moved = True
         
         # Update the showcase metadata
-        categories, reports = parse_showcase_file()
+        categories, reports = store.snapshot()
         print(f"Showcase reports filenames: {[r['filename'] for r in reports]}")
         found = False
         for report in reports:
@@ -573,7 +727,7 @@ def api_toggle_visibility():
                 found = True
                 print(f"Updated showcase metadata for {filename} to enabled={enabled}")
                 break
-        save_showcase_file(categories, reports)
+        store.save(categories, reports)
         if not found:
             print(f"WARNING: Report {filename} not found in showcase metadata. File was still moved.")
         return jsonify({
@@ -588,62 +742,120 @@ def api_toggle_visibility():
         print(error_msg)
         return jsonify({'success': False, 'error': error_msg}), 500
 
+@app.route('/api/batch', methods=['POST'])
+@locked_mutation
+def api_batch():
+    """API endpoint to apply a list of edits at once
+    
+    All operations are applied to one snapshot and saved with a single write;
+    if any operation is invalid nothing is changed.
+    """
+    data = request.json or {}
+    operations = data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'success': False, 'error': 'Missing operations'}), 400
+    
+    categories, reports = store.snapshot()
+    try:
+        reports, visibility, titles = apply_batch(categories, reports, operations)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # The batch is valid; apply the file changes, then persist once
+    for filename, enabled in visibility.items():
+        move_report_file(filename, enabled)
+    for filename, title in titles.items():
+        update_report_title(filename, title)
+    version = store.save(categories, reports)
+    
+    print(f"Applied batch of {len(operations)} operations")
+    return jsonify({'success': True, 'applied': len(operations), 'version': version})
+
+def run_update_job(progress, showcase_path, reports_dir, refresh_existing=False, workers=1):
+    """Run update_showcase for a background job and summarize the result"""
+    result = update_showcase.update_showcase(showcase_path, reports_dir, refresh_existing, progress=progress,
+                                             workers=workers)
+    if result is None:
+        raise RuntimeError(f"Reports directory {reports_dir} not found")
+    new_reports = len(result.get('new_reports', []))
+    updated_reports = len(result.get('updated_reports', []))
+    return {
+        'new_reports': new_reports,
+        'updated_reports': updated_reports,
+        'message': f"Update completed successfully. Added {new_reports} new reports, updated {updated_reports} existing reports."
+    }
+
+jobs = JobRunner(run_update_job)
+
+def submit_update_job(refresh_existing=False, workers=None):
+    """Queue an update_showcase run for the current showcase; the paths are fixed when it is queued"""
+    return jobs.submit(showcase_path=os.path.abspath(store.path), reports_dir=os.path.abspath(REPORTS_DIR),
+                       refresh_existing=refresh_existing, workers=workers or UPDATE_WORKERS)
+
 @app.route('/api/run_update_showcase', methods=['POST'])
 def api_run_update_showcase():
-    """API endpoint to run the update_showcase script"""
-    try:
-        # Get absolute paths
-        showcase_path = os.path.abspath(SHOWCASE_FILE)
-        reports_dir = os.path.abspath(REPORTS_DIR)
-        
-        # Get refresh_existing parameter from request data
-        data = request.json or {}
-        refresh_existing = data.get('refresh_existing', False)
-        
-        # Import the update_showcase module
-        import sys
-        import importlib
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        import update_showcase
-        importlib.reload(update_showcase)
-        
-        # Run the update_showcase function
-        result = update_showcase.update_showcase(showcase_path, reports_dir, refresh_existing)
-        
-        # Return a message with the result
-        return jsonify({
-            'success': True,
-            'message': f"Update completed successfully. Added {len(result.get('new_reports', []))} new reports, updated {len(result.get('updated_reports', []))} existing reports."
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    """API endpoint to queue an update_showcase run; poll /api/jobs/<id> for its progress"""
+    data = request.json or {}
+    workers = data.get('workers')
+    if workers is not None and (not isinstance(workers, int) or isinstance(workers, bool) or workers < 1):
+        return jsonify({'success': False, 'error': 'workers must be a positive integer'}), 400
+    job = submit_update_job(refresh_existing=bool(data.get('refresh_existing', False)), workers=workers)
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': url_for('get_job', job_id=job['id'])
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """API endpoint to get the status, progress and timing of a background job"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify(dict(job, success=True))
+
+HIDDEN_REPORTS_PER_PAGE = 50
+
+def list_hidden_files(hidden_dir):
+    """Return the sorted filenames of the report files in the hidden reports directory"""
+    if not os.path.isdir(hidden_dir):
+        return []
+    with os.scandir(hidden_dir) as entries:
+        return sorted(entry.name for entry in entries
+                      if entry.name.endswith('.html') and not entry.name.startswith('.') and entry.is_file())
 
 @app.route('/hidden_reports')
 def hidden_reports():
-    """Display all hidden reports and allow unhiding them"""
+    """Display the hidden reports, a page at a time, and allow unhiding them"""
     hidden_dir = os.path.abspath("hidden_reports")
+    filenames = list_hidden_files(hidden_dir)
+    
+    per_page = max(1, request.args.get('per_page', HIDDEN_REPORTS_PER_PAGE, type=int))
+    pages = max(1, (len(filenames) + per_page - 1) // per_page)
+    page = min(max(1, request.args.get('page', 1, type=int)), pages)
+    
+    # Metadata comes from the in-memory showcase index, looked up by filename
+    index = store.lookup()
     reports = []
-    if os.path.exists(hidden_dir):
-        for fname in os.listdir(hidden_dir):
-            if fname.endswith('.html') and not fname.startswith('.'):
-                # Try to get metadata from showcase if possible
-                categories, showcase_reports = parse_showcase_file()
-                meta = next((r for r in showcase_reports if r['filename'] == fname), None)
-                if meta:
-                    title = meta['title']
-                    description = meta['description']
-                    categories = meta['categories']
-                else:
-                    title = fname.replace('.html', '').replace('-', ' ')
-                    description = ''
-                    categories = []
-                reports.append({
-                    'filename': fname,
-                    'title': title,
-                    'description': description,
-                    'categories': categories
-                })
-    return render_template('hidden_reports.html', reports=reports)
+    for fname in filenames[(page - 1) * per_page:page * per_page]:
+        meta = index.get(fname)
+        if meta:
+            reports.append({
+                'filename': fname,
+                'title': meta['title'],
+                'description': meta['description'],
+                'categories': meta['categories']
+            })
+        else:
+            reports.append({
+                'filename': fname,
+                'title': fname.replace('.html', '').replace('-', ' '),
+                'description': '',
+                'categories': []
+            })
+    return render_template('hidden_reports.html', reports=reports, page=page, pages=pages,
+                           per_page=per_page, total=len(filenames))
 
 # Create templates directory and template file if they don't exist
 os.makedirs('templates', exist_ok=True)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Category suggestions learned from the categories assigned in the category manager.
+
+The keyword classifier (category_classifier.py) only knows its own keyword
+table. This engine learns from the showcase instead:
+
+- every report in the showcase store with categories is a training example
+- its text (title and visible report body) becomes a TF-IDF vector
+- each category gets a centroid: the normalized mean of its reports' vectors
+
+A new report is vectorized against the stored IDF weights and scored by
+cosine similarity with every centroid at once. The centroids are kept as a
+sparse term -> [(category, weight)] matrix, so scoring is a sparse
+matrix-vector product over the report's terms.
+
+The trained index is saved as .category_suggestions.json next to the
+showcase page, so suggesting categories for a new report only vectorizes
+that report. Vectors are plain dicts; no numeric libraries are needed.
+
+    python category_suggestions.py --train
+    python category_suggestions.py new_report.html
+"""
+import os
+import re
+import json
+import math
+import logging
+import argparse
+from collections import Counter
+
+from report_pipeline import write_file_atomic
+from report_document import report_text
+from showcase_data import load_or_migrate
+
+logger = logging.getLogger(__name__)
+
+SUGGESTIONS_FILE = ".category_suggestions.json"
+INDEX_VERSION = 1
+
+CENTROID_TERMS = 400      # Strongest terms kept per category centroid
+MAX_SUGGESTIONS = 3
+MIN_SIMILARITY = 0.1      # Minimum cosine similarity for a suggestion
+RELATIVE_SIMILARITY = 0.6 # Suggestions must also score this fraction of the best one
+
+TOKEN_RE = re.compile(r"[a-z]{3,}")
+STOPWORDS = frozenset("""
+    about above after again against all also and any are because been before being below between both but
+    can could did does doing down during each few for from further had has have having her here hers herself
+    him himself his how into its itself just more most not now off once only other our ours ourselves out over
+    own same she should some such than that the their theirs them themselves then there these they this those
+    through too under until very was were what when where which while who whom why will with would you your
+    yours yourself yourselves one two may might must many much well also like even still yet get got make made
+    student students report reports instructor class discussion discussions assignment
+""".split())
+
+def tokenize(text):
+    """Return the lowercase terms of a text, without stopwords."""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+def normalize(vector):
+    """Scale a sparse vector (dict) to unit length, in place."""
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm:
+        for term in vector:
+            vector[term] /= norm
+    return vector
+
+def tfidf_vector(text, idf):
+    """Return the unit-length TF-IDF vector of a text; terms without an IDF weight are ignored."""
+    counts = Counter(term for term in tokenize(text) if term in idf)
+    return normalize({term: (1 + math.log(count)) * idf[term] for term, count in counts.items()})
+
+class SuggestionIndex:
+    """Trained IDF weights and category centroids.
+
+    Args:
+        idf: Dict of term -> inverse document frequency
+        centroids: Dict of category -> unit-length sparse centroid vector
+        documents: Number of reports the index was trained on
+        trained_version: Showcase store version the index was trained from
+    """
+
+    def __init__(self, idf, centroids, documents=0, trained_version=None):
+        self.idf = idf
+        self.centroids = centroids
+        self.documents = documents
+        self.trained_version = trained_version
+        # Centroid matrix by term, so scoring only touches the terms a report has
+        self.postings = {}
+        for category, centroid in centroids.items():
+            for term, weight in centroid.items():
+                self.postings.setdefault(term, []).append((category, weight))
+
+    @classmethod
+    def train(cls, examples, trained_version=None, centroid_terms=CENTROID_TERMS):
+        """
+        Train an index from labeled texts.
+
+        Args:
+            examples: List of (text, categories) tuples
+            trained_version: Showcase store version, recorded to detect stale indexes
+            centroid_terms: Strongest terms kept per centroid
+
+        Returns:
+            A SuggestionIndex
+        """
+        examples = [(Counter(tokenize(text)), categories) for text, categories in examples]
+        document_frequency = Counter()
+        for counts, categories in examples:
+            document_frequency.update(counts.keys())
+        total = len(examples)
+        # Smoothed IDF; terms found in a single report carry no category signal
+        idf = {term: math.log((1 + total) / (1 + df)) + 1
+               for term, df in document_frequency.items() if df > 1 or total < 3}
+
+        sums = {}
+        members = Counter()
+        for counts, categories in examples:
+            vector = normalize({term: (1 + math.log(count)) * idf[term]
+                                for term, count in counts.items() if term in idf})
+            for category in dict.fromkeys(categories):
+                members[category] += 1
+                centroid = sums.setdefault(category, Counter())
+                for term, weight in vector.items():
+                    centroid[term] += weight
+
+        centroids = {}
+        for category, centroid in sums.items():
+            strongest = centroid.most_common(centroid_terms)
+            centroids[category] = normalize({term: weight / members[category] for term, weight in strongest})
+        return cls(idf, centroids, total, trained_version)
+
+    def scores(self, vectors):
+        """
+        Score many report vectors against every centroid.
+
+        Args:
+            vectors: List of unit-length sparse vectors (as from tfidf_vector)
+
+        Returns:
+            List of dicts of category -> cosine similarity, one per vector
+        """
+        results = []
+        for vector in vectors:
+            row = Counter()
+            for term, weight in vector.items():
+                for category, centroid_weight in self.postings.get(term, ()):
+                    row[category] += weight * centroid_weight
+            results.append(row)
+        return results
+
+    def suggest_many(self, texts, limit=MAX_SUGGESTIONS, min_similarity=MIN_SIMILARITY):
+        """
+        Suggest categories for many report texts in one batch.
+
+        Returns:
+            List of lists of (category, similarity), best first, one list per text
+        """
+        suggestions = []
+        for row in self.scores([tfidf_vector(text, self.idf) for text in texts]):
+            ranked = sorted(row.items(), key=lambda item: (-item[1], item[0]))
+            best = ranked[0][1] if ranked else 0
+            suggestions.append([(category, round(score, 4)) for category, score in ranked[:limit]
+                                if score >= min_similarity and score >= best * RELATIVE_SIMILARITY])
+        return suggestions
+
+    def suggest(self, text, limit=MAX_SUGGESTIONS, min_similarity=MIN_SIMILARITY):
+        """Suggest categories for one report text, as a list of (category, similarity)."""
+        return self.suggest_many([text], limit, min_similarity)[0]
+
+    def save(self, path):
+        data = {
+            "version": INDEX_VERSION,
+            "documents": self.documents,
+            "trained_version": self.trained_version,
+            "idf": self.idf,
+            "centroids": self.centroids,
+        }
+        write_file_atomic(path, json.dumps(data, sort_keys=True))
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved index, returning None if there is none (or it is from another index version)."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable suggestion index {path}: {e}")
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        return cls(data["idf"], data["centroids"], data.get("documents", 0), data.get("trained_version"))
+
+def suggestions_path_for(showcase_file):
+    """Return the suggestion index file that belongs to a showcase file."""
+    return os.path.join(os.path.dirname(os.path.abspath(showcase_file)), SUGGESTIONS_FILE)
+
+def read_report_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return report_text(f.read())
+
+def train_showcase_index(showcase_file, reports_dir):
+    """
+    Train the suggestion index from the showcase's categorized reports and save it.
+
+    Report files are looked up in reports_dir and the hidden_reports directory next to it.
+
+    Returns:
+        The trained SuggestionIndex
+    """
+    data = load_or_migrate(showcase_file)
+    directories = [reports_dir, os.path.join(os.path.dirname(os.path.abspath(reports_dir)), "hidden_reports")]
+    examples = []
+    for filename in data["order"]:
+        categories = data["reports"][filename]["categories"]
+        path = next((os.path.join(d, filename) for d in directories if os.path.exists(os.path.join(d, filename))),
+                    None)
+        if categories and path:
+            examples.append((read_report_text(path), categories))
+    index = SuggestionIndex.train(examples, data.get("version"))
+    path = suggestions_path_for(showcase_file)
+    index.save(path)
+    print(f"Trained category suggestions on {len(examples)} reports ({len(index.centroids)} categories), "
+          f"saved to {path}")
+    return index
+
+def load_showcase_index(showcase_file, version=None):
+    """
+    Load the suggestion index of a showcase, noting if the store changed since it was trained.
+
+    Args:
+        showcase_file: Showcase HTML file
+        version: Current store version, if already known
+
+    Returns:
+        The SuggestionIndex, or None if it hasn't been trained
+    """
+    index = SuggestionIndex.load(suggestions_path_for(showcase_file))
+    if index is not None:
+        if version is None:
+            version = load_or_migrate(showcase_file).get("version")
+        if version != index.trained_version:
+            print(f"Note: Category suggestions were trained on showcase version {index.trained_version}, "
+                  f"the showcase is at version {version}; run category_suggestions.py --train to update")
+    return index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Suggest report categories from the categories already assigned')
+    parser.add_argument('files', nargs='*', help='Report HTML files to suggest categories for')
+    parser.add_argument('--train', action='store_true', help='Train the suggestion index from the showcase first')
+    parser.add_argument('--showcase-file', default='instructor_reports_showcase.html',
+                        help='Path to the showcase HTML file')
+    parser.add_argument('--reports-dir', default='instructor_reports',
+                        help='Path to the directory containing instructor reports')
+    args = parser.parse_args()
+
+    index = train_showcase_index(args.showcase_file, args.reports_dir) if args.train \
+        else load_showcase_index(args.showcase_file)
+    if index is None:
+        parser.error("No suggestion index yet; run with --train")
+    suggestions = index.suggest_many([read_report_text(path) for path in args.files])
+    for path, suggested in zip(args.files, suggestions):
+        print(f"{os.path.basename(path)}: "
+              f"{', '.join(f'{category} ({score:.2f})' for category, score in suggested) or 'no suggestions'}")
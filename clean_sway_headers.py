@@ -1,27 +1,36 @@
 #!/usr/bin/env python3
 import os
 import re
+import time
 import shutil
+import logging
+import argparse
 from pathlib import Path
 from bs4 import BeautifulSoup
 
-def clean_sway_headers(directory):
+from build_log import RunLog, configure_logging, add_logging_arguments, level_from_args
+
+logger = logging.getLogger(__name__)
+
+def clean_sway_headers(directory, run_log=None):
     """
     Remove only the "Sway Assignment Report Share this assignment with your colleagues" 
     header from instructor reports, without modifying any other content.
     
     Args:
         directory: Path to the directory containing the HTML files
+        run_log: Optional RunLog that receives a record per file
     """
     # Make sure the directory exists
     if not os.path.exists(directory):
-        print(f"Directory {directory} not found.")
+        logger.error("Directory %s not found.", directory)
         return
+    run_log = run_log or RunLog()
 
     # Create a backup directory
     backup_dir = os.path.join(os.path.dirname(directory), "instructor_reports_backup")
     os.makedirs(backup_dir, exist_ok=True)
-    print(f"Using backup directory: {backup_dir}")
+    logger.info("Using backup directory: %s", backup_dir)
 
     # Get all HTML files in the directory
     html_files = [f for f in os.listdir(directory) if f.endswith('.html') and not f.startswith('.')]
@@ -36,23 +45,28 @@ def clean_sway_headers(directory):
         # Create a backup of the original file if it doesn't already exist
         if not os.path.exists(backup_path):
             shutil.copy2(file_path, backup_path)
-            print(f"Created backup of {filename}")
+            logger.info("Created backup of %s", filename)
         
+        start = time.perf_counter()
         try:
+            bytes_in = os.path.getsize(file_path)
             # Parse the HTML with BeautifulSoup
             with open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
             
-            # DEBUG: Print the file size, first and last 1000 characters of the file content
-            print(f"\n--- DEBUG: {filename} size: {len(content)} bytes ---")
-            print(f"--- DEBUG: Start of {filename} ---\n" + content[:1000] + "\n--- END START DEBUG ---")
-            print(f"--- DEBUG: End of {filename} ---\n" + content[-1000:] + "\n--- END END DEBUG ---\n")
+            # DEBUG: Log the file size, first and last 1000 characters of the file content
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("--- %s size: %d bytes ---", filename, bytes_in)
+                logger.debug("--- Start of %s ---\n%s\n--- END START ---", filename, content[:1000])
+                logger.debug("--- End of %s ---\n%s\n--- END END ---", filename, content[-1000:])
 
             # Check if the specific header text exists in the file
             header_pattern = r'Sway Assignment Report[\s\n]*Share this assignment with your colleagues'
             if not re.search(header_pattern, content, re.IGNORECASE):
-                print(f"No header to remove in {filename}, skipping")
+                logger.info("No header to remove in %s, skipping", filename)
                 unchanged_count += 1
+                run_log.write("file", file=filename, seconds=round(time.perf_counter() - start, 6),
+                              bytes_in=bytes_in, bytes_out=bytes_in, matched="none")
                 continue
             
             # Skip entire <div> blocks by counting nested <div> and </div> tags
@@ -86,22 +100,35 @@ def clean_sway_headers(directory):
                 with open(file_path, 'w', encoding='utf-8') as file:
                     file.write(content)
                 processed_count += 1
-                print(f"Processed {filename} - removed Sway header and/or share banner")
+                logger.info("Processed %s - removed Sway header and/or share banner", filename)
             else:
-                print(f"No header to remove in {filename}, skipping")
+                logger.info("No header to remove in %s, skipping", filename)
                 unchanged_count += 1
+            run_log.write("file", file=filename, seconds=round(time.perf_counter() - start, 6),
+                          bytes_in=bytes_in, bytes_out=os.path.getsize(file_path),
+                          matched="header-block" if header_removed else "header-text-only")
             
-            # DEBUG: Print line number and content for lines containing the target class names
-            for idx, line in enumerate(lines):
-                if 'sway-header-centered' in line or 'share-banner' in line:
-                    print(f"DEBUG: Line {idx}: {line.strip()[:200]}")
+            # DEBUG: Log line number and content for lines containing the target class names
+            if logger.isEnabledFor(logging.DEBUG):
+                for idx, line in enumerate(lines):
+                    if 'sway-header-centered' in line or 'share-banner' in line:
+                        logger.debug("Line %d: %s", idx, line.strip()[:200])
             
         except Exception as e:
-            print(f"Error processing {filename}: {e}")
+            logger.error("Error processing %s: %s", filename, e)
+            run_log.write("error", file=filename, error=str(e))
     
-    print(f"\nProcessed {processed_count} of {len(html_files)} HTML files.")
-    print(f"Skipped {unchanged_count} files (no header found or unable to locate).")
+    logger.info("Processed %d of %d HTML files.", processed_count, len(html_files))
+    logger.info("Skipped %d files (no header found or unable to locate).", unchanged_count)
 
 if __name__ == "__main__":
-    instructor_reports_dir = "instructor_reports"
-    clean_sway_headers(instructor_reports_dir) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Remove the Sway header from instructor reports.')
+    parser.add_argument('directory', nargs='?', default="instructor_reports",
+                        help='Directory containing the report HTML files')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args()
+    configure_logging(level_from_args(args))
+    
+    with RunLog(args.run_log) as run_log:
+        clean_sway_headers(args.directory, run_log=run_log) 
\ No newline at end of file
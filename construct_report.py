@@ -3,53 +3,44 @@ import glob
 import re
 import sys
 import time
+import logging
+import argparse
 import datetime
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from report_injection import apply_injections, strip_injections, INJECTION_VERSION
+from report_pipeline import ReportPipeline, write_file_atomic
+from build_cache import BuildCache, BUILD_CACHE_FILE, file_fingerprint
+from report_metadata import extract_metadata, redact_spans
+from build_log import RunLog, configure_logging, add_logging_arguments, level_from_args
+from dark_theme import check_theme_coverage
+from report_assets import extract_inline_images
+from precompress import manifest_path_for, precompress_files
+
+# Bump when the pipeline stages change so cached build results are discarded
+PIPELINE_VERSION = 2
+BUILD_VERSION = f"{PIPELINE_VERSION}.{INJECTION_VERSION}"
+
+logger = logging.getLogger(__name__)
 
 # Append custom path so config can be imported (if needed)
 sys.path.append('/Users/simon/Documents/GitHub')
 
 # Function to extract the generated title from the HTML content.
-# Update this to use a more robust pattern that matches your actual HTML structure
+# The patterns live in report_metadata.py, shared with create_html_index.py
 def extract_generated_title(html):
-    # First try the original pattern
-    match = re.search(r'<div\s+class="generated-title\s+text-info\s+mb-1">(.*?)</div>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    # If that fails, try looking for any h1 or h2 element that might contain the title
-    match = re.search(r'<h1[^>]*>(.*?)</h1>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    match = re.search(r'<h2[^>]*>(.*?)</h2>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    # If still no match, try looking for "Assignment Details" section title
-    match = re.search(r'<div[^>]*>Assignment Details</div>\s*<div[^>]*>(.*?)</div>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    return None
+    return extract_metadata(html).title
 
 # Function to extract the completion deadline (UTC) from the HTML content.
 def extract_completion_deadline(html):
-    pattern = (r'<div\s+class="col-5\s+col-label">\s*Completion deadline:\s*</div>\s*'
-               r'<div\s+class="col-7\s+col-value">.*?<span\s+class="utc-time"\s+data-utc-time="([^"]+)"')
-    match = re.search(pattern, html, flags=re.DOTALL)
-    if match:
-        deadline_str = match.group(1).strip()
-        try:
-            deadline = datetime.datetime.strptime(deadline_str, "%Y-%m-%d %H:%M:%S%z")
-            return deadline
-        except Exception as e:
-            print(f"Error parsing deadline '{deadline_str}':", e)
-    return None
+    return extract_metadata(html).deadline
 
 # Function to redact instructor information
-def redact_instructor_info(html):
-    pattern = r'(<div\s+class="col-5\s+col-label">\s*Instructor:\s*</div>\s*<div\s+class="col-7\s+col-value">)([^<]*)(</div>)'
-    return re.sub(pattern, r'\1[redacted]\3', html, flags=re.DOTALL)
+def redact_instructor_info(html, instructor_spans=None):
+    if instructor_spans is None:
+        instructor_spans = extract_metadata(html).instructor_spans
+    return redact_spans(html, instructor_spans)
 
 # Function to modify the HTML structure of individual reports
 def modify_report_structure(html, title):
@@ -77,29 +68,9 @@ def modify_report_structure(html, title):
                 cleaned_title = cleaned_title.replace(pattern, pattern + ":")
                 break
     
-    # Create CSS for styling
-    css_to_add = """
-    <style>
-    /* Style for our custom title */
-    .custom-report-title {
-        font-size: 1.75rem;
-        font-weight: 600;
-        color: #23004D;
-        margin: 0 0 15px;
-        padding: 15px 15px 0;
-        line-height: 1.3;
-    }
-    
-    /* Style for social sharing section */
-    .social-sharing {
-        margin-top: 0 !important;
-        padding-top: 0 !important;
-    }
-    </style>
-    """
-    
-    # Insert the CSS before the closing </head> tag
-    html = re.sub('</head>', f'{css_to_add}</head>', html, flags=re.IGNORECASE)
+    # Insert (or refresh) the custom title CSS before the closing </head> tag,
+    # dropping any unmarked copies appended by older builds
+    html = apply_injections(html, names=['custom-title-css'])
     
     # Create the new custom title div
     custom_title_html = f'<div class="custom-report-title">{cleaned_title}</div>'
@@ -140,96 +111,193 @@ def extract_body(html):
 
 # Add a debugging function to help understand what's in the HTML
 def debug_html_structure(html, filename):
-    """Print key parts of the HTML to understand its structure"""
-    print(f"\nDebugging HTML structure for {filename}:")
+    """Log key parts of the HTML to understand its structure (DEBUG level only)"""
+    # Three extra regex passes over the whole file - skip them unless someone will see the output
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("Debugging HTML structure for %s:", filename)
     
     # Look for div elements with class containing "title"
     title_divs = re.findall(r'<div[^>]*class="[^"]*title[^"]*"[^>]*>(.*?)</div>', html, flags=re.DOTALL)
     if title_divs:
-        print("Found potential title divs:")
+        logger.debug("Found potential title divs:")
         for i, div in enumerate(title_divs[:3]):  # Show just the first few
-            print(f"  {i+1}. {div.strip()[:100]}...")
+            logger.debug("  %d. %s...", i + 1, div.strip()[:100])
     else:
-        print("No div elements with 'title' in class found.")
+        logger.debug("No div elements with 'title' in class found.")
     
     # Look for h1/h2 elements
     headers = re.findall(r'<h[12][^>]*>(.*?)</h[12]>', html, flags=re.DOTALL)
     if headers:
-        print("Found h1/h2 elements:")
+        logger.debug("Found h1/h2 elements:")
         for i, header in enumerate(headers[:3]):
-            print(f"  {i+1}. {header.strip()[:100]}...")
+            logger.debug("  %d. %s...", i + 1, header.strip()[:100])
     else:
-        print("No h1/h2 elements found.")
+        logger.debug("No h1/h2 elements found.")
     
     # Look for Assignment Details section
     assignment_section = re.search(r'<div[^>]*>Assignment Details</div>\s*<div[^>]*>(.*?)</div>', 
                                   html, flags=re.DOTALL)
     if assignment_section:
-        print("Found Assignment Details section:")
-        print(f"  Content: {assignment_section.group(1).strip()[:100]}...")
+        logger.debug("Found Assignment Details section:")
+        logger.debug("  Content: %s...", assignment_section.group(1).strip()[:100])
     else:
-        print("No Assignment Details section found with expected pattern.")
+        logger.debug("No Assignment Details section found with expected pattern.")
 
-def main():
-    # Look for all .html files in the "html" folder
-    report_files = [f for f in glob.glob("html/*.html") if os.path.basename(f) != "index.html"]
+def format_index_title(title):
+    """Clean up a report title for display in the index"""
+    index_title = title.replace("-", " ")
+    # Handle colon restoration for the index too
+    if ":" not in index_title:
+        for pattern in ["Debate", "Ethics", "Exploring", "Debating", "Frontiers", "Dimensions of", "Worth", "A Debate", "Norms"]:
+            if pattern in index_title:
+                index_title = index_title.replace(pattern, pattern + ":")
+                break
+    return index_title
+
+# Pipeline stages - each takes the report dict and updates it in place
+
+def debug_stage(report):
+    # Debug the HTML structure to see what we're working with (a no-op unless DEBUG logging is on)
+    debug_html_structure(report["content"], report["filename"])
+
+def extract_metadata_stage(report):
+    # Extract title, deadline and instructor offsets in one scan before redacting
+    metadata = extract_metadata(report["content"])
+    title = metadata.title
+    if not title:
+        # Use better fallback - remove file extension and clean up the filename
+        base_name = os.path.splitext(os.path.basename(report["filename"]))[0]
+        # Remove any random hex/id strings at the end
+        cleaned_name = re.sub(r'_[0-9a-f]{8,}.*$', '', base_name)
+        title = cleaned_name
+        logger.warning("  Could not extract title, using cleaned filename: %s", title)
+    else:
+        logger.debug("  Successfully extracted title: %s", title)
+    
+    report["title"] = title
+    report["title_source"] = metadata.title_source or "filename"
+    report["deadline"] = metadata.deadline
+    report["instructor_spans"] = metadata.instructor_spans
+
+def redact_stage(report):
+    # Offsets from the extraction stage are still valid - nothing has edited the content yet
+    report["content"] = redact_instructor_info(report["content"], report["instructor_spans"])
+
+def restructure_stage(report):
+    # Modify the HTML structure and add custom title in one go
+    content = report["content"]
+    report["content"] = modify_report_structure(content, report["title"])
+    report["restructured"] = report["content"] != content
+
+def inject_dark_mode_stage(report):
+    # Existing copies are replaced rather than appended, so reruns don't grow the files
+    report["content"] = apply_injections(report["content"], names=['dark-mode-head', 'dark-mode-body'])
+
+def extract_assets_stage(report):
+    # Move inline base64 images to shared, content-addressed files in html/assets
+    report["content"], report["assets"], report["assets_written"] = extract_inline_images(
+        report["content"], report["filename"])
+
+def build_report_pipeline(extract_assets=True):
+    """Create the pipeline that reads, transforms and writes each report once"""
+    stages = [
+        debug_stage,
+        extract_metadata_stage,
+        redact_stage,
+        restructure_stage,
+        inject_dark_mode_stage,
+    ]
+    if extract_assets:
+        stages.append(extract_assets_stage)
+    return ReportPipeline(stages)
+
+def process_report_file(filename, extract_assets=True):
+    """Run the report pipeline over one file and return its index record.
+    
+    Kept at module level so it can be sent to worker processes. The record
+    also carries the fingerprint of the written file for the build cache.
+    """
+    logger.info("Processing file: %s", filename)
+    
+    # Read once, run every stage in memory, write once
+    start = time.perf_counter()
+    report = build_report_pipeline(extract_assets).run(filename)
+    
+    logger.info("  Redacted instructor information in %s", filename)
+    return {
+        "filename": filename,
+        "title": format_index_title(report["title"]),
+        "deadline": report["deadline"],  # may be None if not found
+        "fingerprint": file_fingerprint(filename, report["content"]),
+        "stats": {
+            "seconds": round(time.perf_counter() - start, 6),
+            "bytes_in": report["bytes_in"],
+            "bytes_out": report["bytes_out"],
+            "changed": report["changed"],
+            "stage_seconds": report["timings"],
+            "assets": len(report.get("assets", [])),
+            "assets_written": report.get("assets_written", 0),
+            "matched": {
+                "title": report["title_source"],
+                "deadline": report["deadline"] is not None,
+                "instructor": len(report["instructor_spans"]),
+                "card_header": report["restructured"],
+            },
+        }
+    }
+
+def main(jobs=1, use_cache=True, run_log=None, extract_assets=True, precompress=True):
+    # Look for all .html files in the "html" folder; sorted so the index
+    # order doesn't depend on directory listing order
+    report_files = sorted(f for f in glob.glob("html/*.html") if os.path.basename(f) != "index.html")
     if not report_files:
-        print("No .html files found in the 'html' folder.")
+        logger.warning("No .html files found in the 'html' folder.")
         return
+    # The dark theme is static CSS now, so it has to cover every colour the
+    # old runtime polling used to patch
+    missing_colors = check_theme_coverage()
+    if missing_colors:
+        raise ValueError(f"Dark theme does not cover: {', '.join(missing_colors)}")
+    run_log = run_log or RunLog()
 
-    file_info = []
+    # Serve unchanged reports from the build cache, process the rest
+    # Reports built with and without asset extraction differ, so they are cached separately
+    cache_version = BUILD_VERSION if extract_assets else f"{BUILD_VERSION}.inline"
+    cache = BuildCache(BUILD_CACHE_FILE, version=cache_version) if use_cache else None
+    records = {}
+    pending_files = []
     for filename in report_files:
-        print(f"Processing file: {filename}")
-        
-        # Read the file
-        with open(filename, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        # Debug the HTML structure to see what we're working with
-        debug_html_structure(content, filename)
-        
-        # Extract title and deadline before redacting
-        title = extract_generated_title(content)
-        if not title:
-            # Use better fallback - remove file extension and clean up the filename
-            base_name = os.path.splitext(os.path.basename(filename))[0]
-            # Remove any random hex/id strings at the end
-            cleaned_name = re.sub(r'_[0-9a-f]{8,}.*$', '', base_name)
-            title = cleaned_name
-            print(f"  WARNING: Could not extract title, using cleaned filename: {title}")
+        record = cache.lookup(filename) if cache else None
+        if record is not None:
+            records[filename] = record
+            run_log.write("report", file=filename, cached=True)
         else:
-            print(f"  Successfully extracted title: {title}")
-            
-        deadline = extract_completion_deadline(content)
-        
-        # Redact instructor information
-        redacted_content = redact_instructor_info(content)
-        
-        # Modify the HTML structure and add custom title in one go
-        modified_content = modify_report_structure(redacted_content, title)
-        
-        # Write the modified content back to the same file
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(modified_content)
-        
-        # Process title for the index
-        index_title = title.replace("-", " ")
-        # Handle colon restoration for the index too
-        if ":" not in index_title:
-            for pattern in ["Debate", "Ethics", "Exploring", "Debating", "Frontiers", "Dimensions of", "Worth", "A Debate", "Norms"]:
-                if pattern in index_title:
-                    index_title = index_title.replace(pattern, pattern + ":")
-                    break
-        
-        # Store info for index.html creation
-        file_info.append({
-            "filename": filename,
-            "title": index_title,
-            "deadline": deadline  # may be None if not found
-        })
-        
-        print(f"  Redacted instructor information in {filename}")
-        time.sleep(0.2)
+            pending_files.append(filename)
+    logger.info("%d reports unchanged since last build, processing %d.", len(records), len(pending_files))
+    
+    if jobs > 1 and len(pending_files) > 1:
+        # Workers get the same log level as the parent
+        with ProcessPoolExecutor(max_workers=jobs, initializer=configure_logging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            processed = list(executor.map(partial(process_report_file, extract_assets=extract_assets),
+                                          pending_files))
+    else:
+        processed = [process_report_file(filename, extract_assets) for filename in pending_files]
+    
+    for record in processed:
+        fingerprint = record.pop("fingerprint")
+        run_log.write("report", file=record["filename"], cached=False, **record.pop("stats"))
+        if cache:
+            cache.store(record, fingerprint)
+        records[record["filename"]] = record
+    
+    if cache:
+        cache.prune(report_files)
+        cache.save()
+    
+    # Collect info for index.html creation, in report_files order either way
+    file_info = [records[filename] for filename in report_files]
     
     # Create an offset-aware maximum datetime for sorting.
     max_dt = datetime.datetime(9999, 12, 31, tzinfo=datetime.timezone.utc)
@@ -394,10 +462,17 @@ def main():
       color: #bb86fc;
     }
     
+    /* Holder for the report iframe, which is only attached near the viewport */
+    .report-frame {
+      width: 100%;
+      height: calc(100% - 75px); /* Adjust for title height */
+      background: var(--container-bg);
+    }
+    
     iframe {
       width: 100%;
+      height: 100%;
       border: none;
-      height: calc(100% - 75px); /* Adjust for title height */
       background: var(--container-bg);
     }
     
@@ -524,14 +599,15 @@ def main():
     ''')
 
     html_parts.append('<div class="container">')
-    # Add each report section with iframe pointing to the original file.
+    # Add each report section with a placeholder for the iframe pointing to the
+    # original file. The script below only creates iframes near the viewport.
     for info in file_info:
         section_id = os.path.splitext(os.path.basename(info["filename"]))[0]
         html_parts.append(f'<section id="{section_id}" class="report-section">')
         html_parts.append(f'  <div class="report-assignment-title">')
         html_parts.append(f'    <h3>{info["title"]}</h3>')
         html_parts.append(f'  </div>')
-        html_parts.append(f'  <iframe src="{info["filename"]}" class="report-iframe" data-src="{info["filename"]}"></iframe>')
+        html_parts.append(f'  <div class="report-frame" data-src="{info["filename"]}"></div>')
         html_parts.append("</section>")
     html_parts.append("</div>")  # close container
     
@@ -542,22 +618,39 @@ def main():
     const darkModeToggle = document.getElementById('darkModeToggle');
     const body = document.body;
     
-    // More reliable approach to apply dark mode to iframes
+    // Push the dark mode state to a loaded report without reloading it
+    function sendDarkMode(iframe, isDarkMode) {
+      if (iframe.contentWindow) {
+        iframe.contentWindow.postMessage({ type: 'sway-darkmode', enabled: isDarkMode }, '*');
+      }
+    }
+    
     function applyDarkModeToIframes(isDarkMode) {
-      // Add a style tag directly to each HTML file loaded in the iframe
-      const iframes = document.querySelectorAll('.report-iframe');
+      document.querySelectorAll('.report-iframe').forEach(iframe => sendDarkMode(iframe, isDarkMode));
+    }
+    
+    // Create the iframe for a report section
+    function attachFrame(section) {
+      const holder = section.querySelector('.report-frame');
+      if (holder.querySelector('iframe')) return;
       
-      iframes.forEach(iframe => {
-        // Get the base src
-        const baseSrc = iframe.getAttribute('data-src');
-        
-        // Update iframe src with or without dark mode parameter
-        if (isDarkMode) {
-          iframe.src = baseSrc + (baseSrc.includes('?') ? '&' : '?') + 'darkmode=true&timestamp=' + new Date().getTime();
-        } else {
-          iframe.src = baseSrc + (baseSrc.includes('?') ? '&' : '?') + 'timestamp=' + new Date().getTime();
-        }
-      });
+      const baseSrc = holder.getAttribute('data-src');
+      const iframe = document.createElement('iframe');
+      iframe.className = 'report-iframe';
+      iframe.loading = 'lazy';
+      // Start in the right mode to avoid a flash of light content
+      iframe.src = body.classList.contains('dark-mode')
+        ? baseSrc + (baseSrc.includes('?') ? '&' : '?') + 'darkmode=true'
+        : baseSrc;
+      // Catch up with any toggles that happened while the report was loading
+      iframe.addEventListener('load', () => sendDarkMode(iframe, body.classList.contains('dark-mode')));
+      holder.appendChild(iframe);
+    }
+    
+    // Remove the iframe of a report section that is far from the viewport
+    function detachFrame(section) {
+      const iframe = section.querySelector('.report-frame iframe');
+      if (iframe) iframe.remove();
     }
     
     // Function to toggle dark mode
@@ -570,7 +663,7 @@ def main():
         localStorage.setItem('darkMode', 'disabled');
       }
       
-      // Apply dark mode to iframes
+      // Apply dark mode to the iframes that are currently loaded
       applyDarkModeToIframes(isDarkMode);
     }
     
@@ -583,18 +676,31 @@ def main():
       body.classList.add('dark-mode');
     }
     
-    // Apply to iframes when page has fully loaded
-    window.addEventListener('load', function() {
-      if (isDarkModeEnabled) {
-        applyDarkModeToIframes(true);
-      }
-    });
-    
     // Toggle dark mode on change
     darkModeToggle.addEventListener('change', function() {
       toggleDarkMode(this.checked);
     });
     
+    // Only keep iframes for reports in or near the viewport: attach within one
+    // screen of the visible area, tear down beyond three screens
+    const reportSections = document.querySelectorAll('.report-section');
+    const reportContainer = document.querySelector('.container');
+    if ('IntersectionObserver' in window) {
+      const attachObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => { if (entry.isIntersecting) attachFrame(entry.target); });
+      }, { root: reportContainer, rootMargin: '100% 0px' });
+      const detachObserver = new IntersectionObserver(entries => {
+        entries.forEach(entry => { if (!entry.isIntersecting) detachFrame(entry.target); });
+      }, { root: reportContainer, rootMargin: '300% 0px' });
+      reportSections.forEach(section => {
+        attachObserver.observe(section);
+        detachObserver.observe(section);
+      });
+    } else {
+      // Older browsers: rely on native lazy loading
+      reportSections.forEach(attachFrame);
+    }
+    
     // Sidebar toggle functionality
     const sidebarToggle = document.querySelector('.sidebar-toggle');
     const sidebar = document.querySelector('.sidebar');
@@ -640,283 +746,53 @@ def main():
     }
   </script>""")
 
-    # Now inject the dark mode handler script into each HTML file as well
+    output_filename = "index.html"
+    write_file_atomic(output_filename, "\n".join(html_parts))
+    
+    if precompress:
+        # .gz/.br siblings for static serving; unchanged files are skipped. The
+        # manifest goes next to index.html, like the showcase page's manifest
+        precompress_files(report_files + [output_filename], manifest_path_for([output_filename]))
+    
+    logger.info("Successfully redacted instructor information in %d files.", len(report_files))
+    logger.info("Created %s that references the files in the html folder.", output_filename)
+
+def strip_report_injections():
+    """Remove every injected block from the reports, restoring clean files"""
+    report_files = [f for f in glob.glob("html/*.html") if os.path.basename(f) != "index.html"]
+    stripped_count = 0
     for filename in report_files:
         with open(filename, "r", encoding="utf-8") as f:
             content = f.read()
         
-        # Completely new approach for dark mode in iframes
-        # Replace with a more robust dark mode solution
-        if "</head>" in content:
-            # Add dark mode detector to the head section
-            head_script = """
-<script>
-  // Detect dark mode from URL parameter
-  function isDarkModeEnabled() {
-    const urlParams = new URLSearchParams(window.location.search);
-    return urlParams.get('darkmode') === 'true';
-  }
-
-  // Initialize dark mode if needed
-  if (isDarkModeEnabled()) {
-    // Add immediate style to prevent flash of light content
-    document.documentElement.style.backgroundColor = '#1a1a1a';
-    document.documentElement.style.color = '#e6e6e6';
-  }
-</script>
-
-<style id="darkmode-styles">
-  /* Dark mode styles will be enabled via JavaScript */
-</style>
-</head>"""
-            content = content.replace("</head>", head_script)
-        
-        # Add the thorough dark mode script before the closing body tag
-        if "</body>" in content:
-            body_script = """
-<script>
-  // Dark mode implementation
-  (function() {
-    // Only apply if the darkmode parameter is true
-    if (!isDarkModeEnabled()) return;
-    
-    // Get our style element
-    const darkStyles = document.getElementById('darkmode-styles');
-    
-    // Set comprehensive dark mode styles
-    darkStyles.textContent = `
-      /* Force literally everything to dark mode */
-      html, body { 
-        background-color: #1a1a1a !important;
-        color: #e6e6e6 !important;
-      }
-      
-      /* Target ALL elements with a wildcard selector */
-      * {
-        background-color: transparent !important;
-        border-color: #444 !important;
-      }
-      
-      /* Explicitly target common containers */
-      div, section, article, aside, header, footer, main, nav,
-      .container, .row, .col, .card, .panel, .jumbotron, .well,
-      [class*="container"], [class*="wrapper"], [class*="panel"], 
-      [class*="card"], [class*="box"], [class*="section"],
-      [id*="container"], [id*="wrapper"], [id*="panel"], 
-      [id*="card"], [id*="box"], [id*="section"] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-        border-color: #444 !important;
-      }
-      
-      /* Force background colors for specific elements */
-      [class*="bg-"], [class*="background"], 
-      [style*="background"], [style*="bg"] {
-        background-color: #2a2a2a !important;
-      }
-      
-      /* White elements and their children */
-      [class*="white"], [class*="light"],
-      [style*="white"], [style*="rgb(255"], [style*="rgb(248"],
-      [style*="rgb(250"], [style*="rgb(252"], [style*="rgb(240"],
-      [style*="rgb(245"], [style*="#fff"], [style*="#ffffff"] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-      }
-      
-      /* Bootstrap and common framework classes */
-      .bg-white, .bg-light, .bg-default, .bg-secondary,
-      .text-dark, .text-black {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-      }
-      
-      /* Links */
-      a, a:visited, a:hover, a:active, .link, [class*="link"] {
-        color: #88afd3 !important;
-      }
-      
-      /* Code and pre elements */
-      pre, code, .code, .pre, [class*="code"], [class*="pre"] {
-        background-color: #333 !important;
-        color: #f8f8f8 !important;
-      }
-      
-      /* Tables */
-      table, tr, td, th, thead, tbody, tfoot,
-      .table, [class*="table"] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-        border-color: #444 !important;
-      }
-      
-      /* Form elements */
-      input, textarea, select, button, .form-control,
-      [class*="input"], [class*="button"], [class*="form"] {
-        background-color: #333 !important;
-        color: #e6e6e6 !important;
-        border-color: #555 !important;
-      }
-      
-      /* Modals and popups */
-      .modal, .popover, .tooltip, .dropdown-menu,
-      [class*="modal"], [class*="popover"], [class*="tooltip"], [class*="dropdown"] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-        border-color: #444 !important;
-      }
-      
-      /* Sway specific elements observed in screenshot */
-      [class*="assignment-details"], [class*="details"],
-      .card-like, .topic-section, [class*="topic"],
-      [class*="student"], [class*="discuss"], [class*="debate"],
-      [class*="abortion"], [class*="timeline"],
-      .marquis, .hendricks, .thomson, .singer,
-      .guide, .completion {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-      }
-      
-      /* Specific elements in the screenshot */
-      .students-discuss, .student-debate, .debate-section,
-      [class*="discuss"], [class*="debate"], 
-      [style*="background-color: rgb(255, 255, 255)"] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-      }
-
-      /* General text colors and backgrounds */
-      h1, h2, h3, h4, h5, h6, p, span, li, strong, em, b, i, u,
-      label, small, .text, [class*="text"] {
-        color: #e6e6e6 !important;
-      }
-      
-      /* Target RGB inline styles specifically */
-      [style*="rgb("] {
-        background-color: #2a2a2a !important;
-        color: #e6e6e6 !important;
-      }
-      
-      /* Override any !important inline styles with double !important (hack but effective) */
-      [style*="!important"] {
-        background-color: #2a2a2a !important !important;
-        color: #e6e6e6 !important !important;
-      }
-      
-      /* Fix for dark purple text against dark background */
-      h1, h2, h3, h4, h5, h6, 
-      [style*="purple"], [style*="violet"], 
-      [class*="purple"], [class*="violet"],
-      [style*="rgb(128, 0, 128)"], [style*="rgb(138, 43, 226)"],
-      [style*="rgb(75, 0, 130)"], [style*="rgb(106, 90, 205)"],
-      [style*="rgb(147, 112, 219)"], [style*="rgb(153, 50, 204)"],
-      [style*="color: #800080"], [style*="color: #8a2be2"],
-      [style*="color: #4b0082"], [style*="color: #6a5acd"] {
-        color: #bb86fc !important; /* Light purple that works on dark backgrounds */
-      }
-      
-      /* Specific fix for topic headers and main title */
-      .generated-title, [class*="title"],
-      [id*="topic"], [class*="topic"],
-      [id*="marquis"], [class*="marquis"],
-      [id*="hendricks"], [class*="hendricks"],
-      [id*="thomson"], [class*="thomson"],
-      [id*="singer"], [class*="singer"],
-      [id*="abortion"], [class*="abortion"] {
-        color: #bb86fc !important; /* Light purple */
-      }
-
-      /* Add specific targeting for the #23004D dark purple color */
-      [style*="color: #23004D"], [style*="color:#23004D"],
-      [style*="color: rgb(35, 0, 77)"], [style*="color:rgb(35, 0, 77)"],
-      [style*="color: rgba(35, 0, 77"], [style*="color:rgba(35, 0, 77"],
-      [class*="text-primary"], /* Common bootstrap class that might use this color */
-      .assignment-details h1 + div, /* Target divs immediately after headings in assignment details */
-      .topic-list span, /* Target spans in topic lists */
-      .topic-container * /* Target all elements in topic containers */
-      {
-        color: #bb86fc !important; /* Light purple for readability */
-      }
-    `;
+        clean_content = strip_injections(content)
+        if clean_content != content:
+            write_file_atomic(filename, clean_content)
+            stripped_count += 1
+            logger.info("Stripped injected blocks from %s (%d -> %d bytes)", filename, len(content), len(clean_content))
     
-    // Function to force dark backgrounds on elements that resist
-    function forceDarkElements() {
-      // Get all elements
-      const allElements = document.querySelectorAll('*');
-      
-      // Check the computed style of all elements
-      allElements.forEach(el => {
-        const style = window.getComputedStyle(el);
-        const bgColor = style.backgroundColor;
-        const textColor = style.color;
-        
-        // If it's still white or very light (rgb values close to 255)
-        if (bgColor.includes('rgb(255, 255, 255)') || 
-            bgColor.includes('rgb(248') ||
-            bgColor.includes('rgb(250') ||
-            bgColor.includes('rgb(252') ||
-            bgColor.includes('rgb(245')) {
-          // Force it to be dark with inline style (highest specificity)
-          el.style.setProperty('background-color', '#2a2a2a', 'important');
-          el.style.setProperty('color', '#e6e6e6', 'important');
-        }
-        
-        // Check for dark purple text that would be hard to read
-        if (textColor.includes('rgb(128, 0, 128)') || // purple
-            textColor.includes('rgb(75, 0, 130)') ||  // indigo
-            textColor.includes('rgb(106, 90, 205)') || // slate blue
-            textColor.includes('rgb(138, 43, 226)') || // blue violet
-            textColor.includes('rgb(147, 112, 219)') || // medium purple
-            textColor.includes('rgb(153, 50, 204)') || // dark orchid
-            textColor.includes('rgb(102, 51, 153)') || // rebecca purple
-            (textColor.includes('rgb(') && 
-             parseInt(textColor.match(/\d+/g)[0]) < 150 && 
-             parseInt(textColor.match(/\d+/g)[1]) < 100 && 
-             parseInt(textColor.match(/\d+/g)[2]) > 150)) { // Any dark purplish color
-          
-          // Replace with a lighter purple that's readable on dark backgrounds
-          el.style.setProperty('color', '#bb86fc', 'important'); // Material Design purple
-        }
-
-        // Add specific check for the #23004D dark purple
-        if (textColor === 'rgb(35, 0, 77)' || 
-            textColor.includes('#23004D') ||
-            (textColor.includes('rgb(') && 
-             parseInt(textColor.match(/\d+/g)[0]) === 35 && 
-             parseInt(textColor.match(/\d+/g)[1]) === 0 && 
-             parseInt(textColor.match(/\d+/g)[2]) === 77)) {
-          
-          // Replace with a lighter purple that's readable on dark backgrounds
-          el.style.setProperty('color', '#bb86fc', 'important');
-        }
-      });
-    }
-    
-    // Run once when loaded
-    document.addEventListener('DOMContentLoaded', function() {
-      forceDarkElements();
-      
-      // And again after all images and resources load
-      window.addEventListener('load', forceDarkElements);
-      
-      // And periodically check for any dynamic content
-      setInterval(forceDarkElements, 1000);
-    });
-  })();
-</script>
-</body>"""
-            content = content.replace("</body>", body_script)
-            
-            # Write the updated content back to the file
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(content)
-    
-    output_filename = "index.html"
-    with open(output_filename, "w", encoding="utf-8") as f:
-        f.write("\n".join(html_parts))
-    
-    print(f"Successfully redacted instructor information in {len(report_files)} files.")
-    print(f"Created {output_filename} that references the files in the html folder.")
+    logger.info("Stripped injected blocks from %d of %d files.", stripped_count, len(report_files))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Redact instructor reports and build index.html.')
+    parser.add_argument('--strip-injections', action='store_true',
+                        help='Remove all injected CSS/script blocks from the reports and exit')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of worker processes for report processing (0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'Reprocess every report, ignoring the {BUILD_CACHE_FILE} build cache')
+    parser.add_argument('--keep-inline-images', action='store_true',
+                        help='Leave base64 images inline instead of moving them to html/assets')
+    parser.add_argument('--no-precompress', action='store_true',
+                        help='Skip writing pre-compressed .gz/.br copies of the generated files')
+    add_logging_arguments(parser)
+    
+    args = parser.parse_args()
+    configure_logging(level_from_args(args))
+    
+    if args.strip_injections:
+        strip_report_injections()
+    else:
+        with RunLog(args.run_log) as run_log:
+            main(jobs=args.jobs or os.cpu_count() or 1, use_cache=not args.no_cache, run_log=run_log,
+                 extract_assets=not args.keep_inline_images, precompress=not args.no_precompress)
\ No newline at end of file
@@ -3,27 +3,11 @@ import glob
 import re
 import urllib.parse  # Add this import for URL encoding
 
+from report_metadata import extract_metadata
+
 def extract_generated_title(html):
-    # First try the original pattern
-    match = re.search(r'<div\s+class="generated-title\s+text-info\s+mb-1">(.*?)</div>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    # If that fails, try looking for any h1 or h2 element
-    match = re.search(r'<h1[^>]*>(.*?)</h1>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    match = re.search(r'<h2[^>]*>(.*?)</h2>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    # If still no match, try looking for "Assignment Details" section title
-    match = re.search(r'<div[^>]*>Assignment Details</div>\s*<div[^>]*>(.*?)</div>', html, flags=re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    
-    return None
+    # Shared single-scan extractor, same patterns as construct_report.py
+    return extract_metadata(html).title
 
 def main():
     # Create html directory if it doesn't exist
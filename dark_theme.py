@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Static dark theme for the reports shown in the index page iframes.
+
+The theme is a set of CSS custom properties plus rules scoped to
+`html.sway-dark`, so switching dark mode on or off is a single class change
+on the document element. It replaces the old approach of calling
+getComputedStyle() on every element of the report once a second.
+
+The build checks the generated stylesheet against the colours the old
+polling loop used to patch, so the static theme can't silently stop covering
+one of them (see check_theme_coverage).
+"""
+import re
+
+DARK_CLASS = 'sway-dark'
+
+DARK_THEME_VARIABLES = {
+    '--sway-dark-bg': '#1a1a1a',
+    '--sway-dark-surface': '#2a2a2a',
+    '--sway-dark-raised': '#333',
+    '--sway-dark-text': '#e6e6e6',
+    '--sway-dark-code-text': '#f8f8f8',
+    '--sway-dark-border': '#444',
+    '--sway-dark-input-border': '#555',
+    '--sway-dark-link': '#88afd3',
+    '--sway-dark-accent': '#bb86fc',  # Light purple that works on dark backgrounds
+}
+
+# Colours the old forceDarkElements() loop patched at runtime. Background
+# entries are prefixes, exactly as the loop matched them. These lists are
+# only used to check the stylesheet, not to build it.
+PATCHED_BACKGROUNDS = [
+    'rgb(255, 255, 255)', 'rgb(248', 'rgb(250', 'rgb(252', 'rgb(245',
+    '#fff', '#ffffff', 'white',
+]
+PATCHED_TEXT_COLORS = [
+    'rgb(128, 0, 128)', '#800080',    # purple
+    'rgb(75, 0, 130)', '#4b0082',     # indigo
+    'rgb(106, 90, 205)', '#6a5acd',   # slate blue
+    'rgb(138, 43, 226)', '#8a2be2',   # blue violet
+    'rgb(147, 112, 219)', '#9370db',  # medium purple
+    'rgb(153, 50, 204)', '#9932cc',   # dark orchid
+    'rgb(102, 51, 153)', '#663399',   # rebecca purple
+    'rgb(35, 0, 77)', '#23004d',      # Sway dark purple
+]
+
+SURFACE = {'background-color': 'var(--sway-dark-surface)', 'color': 'var(--sway-dark-text)'}
+SURFACE_WITH_BORDER = dict(SURFACE, **{'border-color': 'var(--sway-dark-border)'})
+ACCENT_TEXT = {'color': 'var(--sway-dark-accent)'}
+
+# (selectors, declarations) in cascade order. Every declaration is !important.
+DARK_THEME_RULES = [
+    # Force literally everything to dark mode
+    (['html', 'body'], {'background-color': 'var(--sway-dark-bg)', 'color': 'var(--sway-dark-text)'}),
+    (['*'], {'background-color': 'transparent', 'border-color': 'var(--sway-dark-border)'}),
+    # Explicitly target common containers
+    (['div', 'section', 'article', 'aside', 'header', 'footer', 'main', 'nav',
+      '.container', '.row', '.col', '.card', '.panel', '.jumbotron', '.well',
+      '[class*="container"]', '[class*="wrapper"]', '[class*="panel"]',
+      '[class*="card"]', '[class*="box"]', '[class*="section"]',
+      '[id*="container"]', '[id*="wrapper"]', '[id*="panel"]',
+      '[id*="card"]', '[id*="box"]', '[id*="section"]'], SURFACE_WITH_BORDER),
+    # Force background colors for specific elements
+    (['[class*="bg-"]', '[class*="background"]', '[style*="background"]', '[style*="bg"]'],
+     {'background-color': 'var(--sway-dark-surface)'}),
+    # White elements and their children, including every light background the
+    # polling loop used to catch
+    (['[class*="white"]', '[class*="light"]', '[style*="rgb(240"]',
+      '[style*="rgb(255, 255, 255)" i]', '[style*="rgb(248" i]', '[style*="rgb(250" i]',
+      '[style*="rgb(252" i]', '[style*="rgb(245" i]',
+      '[style*="#fff" i]', '[style*="#ffffff" i]', '[style*="white" i]'], SURFACE),
+    # Bootstrap and common framework classes
+    (['.bg-white', '.bg-light', '.bg-default', '.bg-secondary', '.text-dark', '.text-black'], SURFACE),
+    # Links
+    (['a', 'a:visited', 'a:hover', 'a:active', '.link', '[class*="link"]'],
+     {'color': 'var(--sway-dark-link)'}),
+    # Code and pre elements
+    (['pre', 'code', '.code', '.pre', '[class*="code"]', '[class*="pre"]'],
+     {'background-color': 'var(--sway-dark-raised)', 'color': 'var(--sway-dark-code-text)'}),
+    # Tables
+    (['table', 'tr', 'td', 'th', 'thead', 'tbody', 'tfoot', '.table', '[class*="table"]'],
+     SURFACE_WITH_BORDER),
+    # Form elements
+    (['input', 'textarea', 'select', 'button', '.form-control',
+      '[class*="input"]', '[class*="button"]', '[class*="form"]'],
+     {'background-color': 'var(--sway-dark-raised)', 'color': 'var(--sway-dark-text)',
+      'border-color': 'var(--sway-dark-input-border)'}),
+    # Modals and popups
+    (['.modal', '.popover', '.tooltip', '.dropdown-menu',
+      '[class*="modal"]', '[class*="popover"]', '[class*="tooltip"]', '[class*="dropdown"]'],
+     SURFACE_WITH_BORDER),
+    # Sway specific elements
+    (['[class*="assignment-details"]', '[class*="details"]',
+      '.card-like', '.topic-section', '[class*="topic"]',
+      '[class*="student"]', '[class*="discuss"]', '[class*="debate"]',
+      '[class*="abortion"]', '[class*="timeline"]',
+      '.marquis', '.hendricks', '.thomson', '.singer', '.guide', '.completion',
+      '.students-discuss', '.student-debate', '.debate-section'], SURFACE),
+    # General text colors
+    (['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'span', 'li', 'strong', 'em', 'b', 'i', 'u',
+      'label', 'small', '.text', '[class*="text"]'], {'color': 'var(--sway-dark-text)'}),
+    # Target RGB inline styles specifically
+    (['[style*="rgb("]'], SURFACE),
+    # Fix for dark purple text against dark background, including every
+    # purple the polling loop used to catch
+    (['h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+      '[style*="purple"]', '[style*="violet"]', '[class*="purple"]', '[class*="violet"]',
+      '[style*="rgb(128, 0, 128)" i]', '[style*="#800080" i]',
+      '[style*="rgb(75, 0, 130)" i]', '[style*="#4b0082" i]',
+      '[style*="rgb(106, 90, 205)" i]', '[style*="#6a5acd" i]',
+      '[style*="rgb(138, 43, 226)" i]', '[style*="#8a2be2" i]',
+      '[style*="rgb(147, 112, 219)" i]', '[style*="#9370db" i]',
+      '[style*="rgb(153, 50, 204)" i]', '[style*="#9932cc" i]',
+      '[style*="rgb(102, 51, 153)" i]', '[style*="#663399" i]',
+      '[style*="rgb(35, 0, 77)" i]', '[style*="#23004d" i]'], ACCENT_TEXT),
+    # Topic headers and main title
+    (['.generated-title', '[class*="title"]',
+      '[id*="topic"]', '[class*="topic"]',
+      '[id*="marquis"]', '[class*="marquis"]',
+      '[id*="hendricks"]', '[class*="hendricks"]',
+      '[id*="thomson"]', '[class*="thomson"]',
+      '[id*="singer"]', '[class*="singer"]',
+      '[id*="abortion"]', '[class*="abortion"]'], ACCENT_TEXT),
+    # Elements that usually carry the #23004D dark purple
+    (['[style*="rgba(35, 0, 77" i]', '[class*="text-primary"]',
+      '.assignment-details h1 + div', '.topic-list span', '.topic-container *'], ACCENT_TEXT),
+]
+
+def _scope(selector):
+    """Scope a selector to the dark mode class on the document element."""
+    if selector == 'html':
+        return f'html.{DARK_CLASS}'
+    return f'html.{DARK_CLASS} {selector}'
+
+def build_theme_css(rules=DARK_THEME_RULES, variables=DARK_THEME_VARIABLES, indent='  '):
+    """Render the theme variables and rules as a stylesheet."""
+    lines = [f'{indent}:root {{']
+    lines += [f'{indent}  {name}: {value};' for name, value in variables.items()]
+    lines.append(f'{indent}}}')
+    for selectors, declarations in rules:
+        lines.append('')
+        lines.append(',\n'.join(f'{indent}{_scope(selector)}' for selector in selectors) + ' {')
+        lines += [f'{indent}  {prop}: {value} !important;' for prop, value in declarations.items()]
+        lines.append(f'{indent}}}')
+    return '\n'.join(lines) + '\n'
+
+# One rule of a stylesheet: its selector list and its declarations
+CSS_RULE_RE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+# One selector of a selector list; commas inside [...] don't separate selectors
+CSS_SELECTOR_RE = re.compile(r'(?:[^,\[]|\[[^\]]*\])+')
+
+def parse_css_rules(css):
+    """Return the (selectors, declarations) rules of a stylesheet, ignoring !important."""
+    rules = []
+    for selector_text, declaration_text in CSS_RULE_RE.findall(css):
+        selectors = [' '.join(selector.split()) for selector in CSS_SELECTOR_RE.findall(selector_text)]
+        declarations = {}
+        for declaration in declaration_text.split(';'):
+            prop, _, value = declaration.partition(':')
+            if value:
+                declarations[prop.strip()] = value.replace('!important', '').strip()
+        rules.append(([selector for selector in selectors if selector], declarations))
+    return rules
+
+DARK_THEME_CSS = build_theme_css()
+
+def check_theme_coverage(css=DARK_THEME_CSS):
+    """
+    Check that a generated stylesheet handles every colour the polling loop patched.
+
+    Light backgrounds must get a dark background and purples must be turned
+    into the accent colour, through an inline-style selector for that colour
+    in dark mode.
+
+    Args:
+        css: Stylesheet text, defaults to the one injected into reports
+
+    Returns:
+        List of colours that are not covered (empty when the theme is complete)
+    """
+    rules = parse_css_rules(css)
+
+    def covered(color, prop, value):
+        selector = f'html.{DARK_CLASS} [style*="{color}" i]'
+        return any(selector in selectors and declarations.get(prop) == value for selectors, declarations in rules)
+
+    missing = [c for c in PATCHED_BACKGROUNDS if not covered(c, 'background-color', 'var(--sway-dark-surface)')]
+    missing += [c for c in PATCHED_TEXT_COLORS if not covered(c, 'color', 'var(--sway-dark-accent)')]
+    return missing
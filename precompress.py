@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Pre-compressed copies of the generated static files.
+
+The reports and the showcase page are served as static files, so instead of
+having the server compress them on every request, the build writes a .gz
+sibling next to each one (and a .br sibling when the brotli package is
+installed):
+
+    html/report.html
+    html/report.html.gz
+    html/report.html.br
+
+A manifest next to the files records the content hash, size and compressed
+sizes of every file. A file whose hash matches its manifest entry, and whose
+siblings are all present, is not compressed again.
+"""
+import os
+import gzip
+import json
+import logging
+
+from build_cache import content_hash
+from report_pipeline import write_file_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MANIFEST = "compression_manifest.json"
+
+def gzip_compress(data):
+    # mtime=0 so unchanged input always gives byte-identical output
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def brotli_compress(data):
+    return brotli.compress(data, quality=11)
+
+def available_encodings():
+    """Return a dict of sibling file suffix -> compress function for the installed libraries."""
+    encodings = {".gz": gzip_compress}
+    if brotli is not None:
+        encodings[".br"] = brotli_compress
+    return encodings
+
+def manifest_path_for(paths):
+    """Return the manifest for a set of files: COMPRESSION_MANIFEST in the directory that contains them all."""
+    directory = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+    return os.path.join(directory, COMPRESSION_MANIFEST)
+
+def load_manifest(manifest_path):
+    """Load the compression manifest, returning an empty one if missing or unreadable."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def compress_file(path, data, encodings):
+    """
+    Write a compressed sibling of path for each encoding.
+
+    Returns:
+        Manifest entry for the file
+    """
+    entry = {"sha256": content_hash(data), "size": len(data), "encodings": {}}
+    for suffix, compress in encodings.items():
+        compressed = compress(data)
+        write_file_atomic(path + suffix, compressed)
+        entry["encodings"][suffix] = {
+            "size": len(compressed),
+            "ratio": round(len(compressed) / len(data), 4) if data else 1.0,
+        }
+    return entry
+
+def precompress_files(paths, manifest_path=None):
+    """
+    Write .gz/.br siblings for files whose content changed since the last build.
+
+    Args:
+        paths: Generated files to compress
+        manifest_path: Manifest of previously compressed files, defaults to
+            manifest_path_for(paths); paths are stored relative to its directory
+
+    Returns:
+        Dict with the number of files compressed and skipped
+    """
+    if manifest_path is None:
+        if not paths:
+            return {"compressed": 0, "skipped": 0}
+        manifest_path = manifest_path_for(paths)
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    manifest = load_manifest(manifest_path)
+    encodings = available_encodings()
+    compressed = skipped = 0
+
+    for path in paths:
+        key = os.path.relpath(os.path.abspath(path), manifest_dir).replace(os.sep, "/")
+        with open(path, "rb") as f:
+            data = f.read()
+        entry = manifest.get(key)
+        if (entry and entry["sha256"] == content_hash(data)
+                and all(os.path.exists(path + suffix) for suffix in encodings)):
+            skipped += 1
+            continue
+        manifest[key] = compress_file(path, data, encodings)
+        compressed += 1
+        logger.debug("Compressed %s: %s", path, manifest[key]["encodings"])
+
+    # Forget files that no longer exist
+    for key in [k for k in manifest if not os.path.exists(os.path.join(manifest_dir, k))]:
+        del manifest[key]
+
+    write_file_atomic(manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+    logger.info("Pre-compressed %d files (%s), %d unchanged.", compressed,
+                "/".join(suffix.lstrip(".") for suffix in encodings), skipped)
+    return {"compressed": compressed, "skipped": skipped}
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Move inline base64 images out of report HTML into content-addressed files.
+
+Reports embed their histogram/chart PNGs as data: URIs, which makes every
+file about a third bigger and stops the browser from caching an image that
+appears in several reports. extract_inline_images() decodes each inline image,
+writes it once to an assets directory under the SHA-256 of its bytes, and
+points the src attribute at that file instead:
+
+    <img src="data:image/png;base64,iVBOR...">  ->  <img src="assets/3f9a...c2.png">
+
+Identical images across reports end up as a single file. Extraction is
+idempotent - once a report has no data: URIs left there is nothing to do.
+"""
+import os
+import re
+import base64
+import hashlib
+import binascii
+import logging
+
+from report_pipeline import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = "assets"
+
+# Only src attributes of img tags; data: URIs in CSS are left alone
+INLINE_IMAGE_RE = re.compile(
+    r'(?P<before><img\b[^>]*?\bsrc=)(?P<quote>["\'])'
+    r'data:image/(?P<type>[a-z0-9.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]+)'
+    r'(?P=quote)',
+    flags=re.IGNORECASE
+)
+
+IMAGE_EXTENSIONS = {
+    'png': '.png',
+    'jpeg': '.jpg',
+    'jpg': '.jpg',
+    'gif': '.gif',
+    'webp': '.webp',
+    'svg+xml': '.svg',
+}
+
+def asset_name(data, image_type):
+    """Return the content-addressed file name for decoded image bytes."""
+    extension = IMAGE_EXTENSIONS.get(image_type.lower(), '.' + re.sub(r'[^a-z0-9]', '', image_type.lower()))
+    return hashlib.sha256(data).hexdigest() + extension
+
+def write_asset(data, image_type, assets_dir):
+    """
+    Write image bytes to the assets directory unless an identical file exists.
+
+    Returns:
+        Tuple of (path of the asset file, True if it was written now)
+    """
+    path = os.path.join(assets_dir, asset_name(data, image_type))
+    if os.path.exists(path):
+        return path, False
+    os.makedirs(assets_dir, exist_ok=True)
+    # Atomic, so parallel workers writing the same image can't leave a partial file
+    write_file_atomic(path, data)
+    return path, True
+
+def extract_inline_images(html, html_path, assets_dir=None):
+    """
+    Replace inline base64 images in a report with links to asset files.
+
+    Args:
+        html: The report HTML
+        html_path: Path the HTML is (or will be) saved at, used to build relative links
+        assets_dir: Where to write images, defaults to ASSETS_DIR next to the report
+
+    Returns:
+        Tuple of (updated HTML, list of asset paths referenced, number of new files written)
+    """
+    html_dir = os.path.dirname(os.path.abspath(html_path))
+    assets_dir = assets_dir or os.path.join(html_dir, ASSETS_DIR)
+    assets = []
+    written = 0
+
+    def replace(match):
+        nonlocal written
+        try:
+            data = base64.b64decode(re.sub(r'\s+', '', match.group('data')), validate=True)
+        except (binascii.Error, ValueError) as e:
+            logger.warning("Leaving undecodable inline image in %s: %s", html_path, e)
+            return match.group(0)
+        path, is_new = write_asset(data, match.group('type'), assets_dir)
+        written += is_new
+        if path not in assets:
+            assets.append(path)
+        src = os.path.relpath(os.path.abspath(path), html_dir).replace(os.sep, '/')
+        return f"{match.group('before')}{match.group('quote')}{src}{match.group('quote')}"
+
+    html = INLINE_IMAGE_RE.sub(replace, html)
+    return html, assets, written
+
+def extract_assets_in_file(html_path, assets_dir=None):
+    """
+    Extract the inline images of a report file in place.
+
+    Returns:
+        Tuple of (list of asset paths referenced, number of new files written);
+        the report is only rewritten if it had inline images
+    """
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    updated, assets, written = extract_inline_images(html, html_path, assets_dir)
+    if updated != html:
+        write_file_atomic(html_path, updated)
+    return assets, written
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Read-once, parse-once loading of the showcase fields of a report.
+
+update_showcase.py needs three things from each report: its title, a set of
+categories inferred from keywords, and a snippet of the first paragraph of
+the report body. read_report_document() reads the file once and gets all
+three from that one string:
+
+- the title with a regex over the header
+- the categories with a keyword scan (category_classifier) of the title and
+  the start of the visible text of the report body
+- the snippet with a streaming html.parser.HTMLParser. The parser starts at
+  the report body (#report-content) and stops as soon as the body's first <p>
+  is closed, so no tree is built and the rest of the file is never parsed
+
+DocumentCache keeps the extracted fields in a sidecar file next to the
+showcase. A report is only read and parsed again when its size, mtime and
+content hash no longer match the cache.
+"""
+import os
+import re
+import html
+from itertools import repeat
+from collections import namedtuple
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import BuildCache, file_fingerprint
+from category_classifier import default_classifier
+
+ReportDocument = namedtuple('ReportDocument', [
+    'title',        # Plain-text title (the generated title, or derived from the filename)
+    'categories',   # Inferred category slugs
+    'description',  # First paragraph of the report body, truncated to SNIPPET_WORDS words
+])
+
+DEFAULT_DESCRIPTION = "Instructor report for this assignment."
+SNIPPET_WORDS = 50
+CATEGORY_SCAN_CHARS = 10000  # Characters of visible report text searched for keywords
+REPORT_TEXT_CHARS = 50000    # Characters of visible report text used for category suggestions
+PARSER_CHUNK_SIZE = 16384
+
+DOCUMENT_CACHE_FILE = ".report_document_cache.json"
+# Bump when the extraction below changes, so cached fields are re-extracted
+DOCUMENT_CACHE_VERSION = 2
+
+TITLE_RE = re.compile(r'<h1\s+class="generated-title">\s*(.*?)\s*</h1>', re.DOTALL)
+REPORT_BODY_RE = re.compile(r'<div\b[^>]*(?:id="report-content"|class="[^"]*\bmarkdown-content\b)')
+SENTENCE_END_RE = re.compile(r'^(.*?[.!?])')
+INVISIBLE_RE = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+
+def filename_title(path):
+    """Return the fallback title for a report, derived from its filename."""
+    return os.path.basename(path).replace('.html', '').replace('-', ' ')
+
+class FirstParagraphParser(HTMLParser):
+    """Collects the text of the first <p> inside the report body <div>, then stops."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.div_depth = 0      # Depth of nested divs inside the report body, 0 = outside
+        self.in_paragraph = False
+        self.parts = []
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'div':
+            if self.div_depth:
+                self.div_depth += 1
+            else:
+                attrs = dict(attrs)
+                if attrs.get('id') == 'report-content' or 'markdown-content' in (attrs.get('class') or '').split():
+                    self.div_depth = 1
+        elif tag == 'p' and self.div_depth and not self.in_paragraph:
+            self.in_paragraph = True
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if tag == 'p' and self.in_paragraph:
+            self.done = True
+        elif tag == 'div' and self.div_depth:
+            self.div_depth -= 1
+            if not self.div_depth:
+                # Left the report body without finding a paragraph
+                self.done = True
+
+    def handle_data(self, data):
+        if self.in_paragraph and not self.done:
+            self.parts.append(data)
+
+    def paragraph(self):
+        """Return the paragraph text, or None if no paragraph was found."""
+        return ''.join(self.parts).strip() if self.in_paragraph else None
+
+def first_paragraph(content):
+    """
+    Return the text of the first paragraph of the report body, or None.
+
+    Parsing starts at the report body and is fed in chunks, so it ends
+    shortly after the paragraph instead of running to the end of the file.
+    """
+    match = REPORT_BODY_RE.search(content)
+    if not match:
+        return None
+    parser = FirstParagraphParser()
+    for start in range(match.start(), len(content), PARSER_CHUNK_SIZE):
+        parser.feed(content[start:start + PARSER_CHUNK_SIZE])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.paragraph()
+
+def truncate_snippet(text, words_limit=SNIPPET_WORDS):
+    """Limit text to words_limit words plus the remainder of the current sentence, followed by an ellipsis."""
+    words = text.split()
+    if len(words) <= words_limit:
+        # If the paragraph is short enough, return it all
+        return text
+
+    truncated_text = ' '.join(words[:words_limit])
+    # Find the end of the current sentence
+    sentence_end_match = SENTENCE_END_RE.search(' '.join(words[words_limit:]))
+    if sentence_end_match:
+        truncated_text += ' ' + sentence_end_match.group(1)
+    return truncated_text + '...'
+
+def visible_text(content, limit=CATEGORY_SCAN_CHARS):
+    """
+    Return up to limit characters of the visible text of the report body.
+
+    Only a bounded slice of the HTML after the start of the body is looked
+    at, so the cost doesn't grow with the size of the report.
+    """
+    match = REPORT_BODY_RE.search(content)
+    start = match.start() if match else 0
+    markup = INVISIBLE_RE.sub(' ', content[start:start + limit * 4])
+    return ' '.join(html.unescape(TAG_RE.sub(' ', markup)).split())[:limit]
+
+def report_text(content, limit=REPORT_TEXT_CHARS):
+    """Return the text of a report used for category suggestions: its title and the start of its body text."""
+    title_match = TITLE_RE.search(content)
+    title = title_match.group(1) if title_match else ''
+    return title + '\n' + visible_text(content, limit)
+
+def infer_categories(title, content, classifier=None):
+    """Infer categories from keywords in the title and the visible report text."""
+    return (classifier or default_classifier()).classify(visible_text(content), title)
+
+def parse_report_document(content, path='', classifier=None):
+    """Extract the showcase fields from report HTML that is already in memory."""
+    title_match = TITLE_RE.search(content)
+    # Titles are stored as plain text; the showcase template escapes them
+    title = html.unescape(title_match.group(1).strip()) if title_match else filename_title(path)
+    paragraph = first_paragraph(content)
+    return ReportDocument(
+        title=title,
+        categories=infer_categories(title, content, classifier),
+        description=truncate_snippet(paragraph) if paragraph else DEFAULT_DESCRIPTION,
+    )
+
+def document_cache_path(showcase_file):
+    """Return the document cache file that belongs to a showcase file."""
+    return os.path.join(os.path.dirname(os.path.abspath(showcase_file)), DOCUMENT_CACHE_FILE)
+
+class DocumentCache(BuildCache):
+    """Sidecar cache of ReportDocument fields keyed by report path, size, mtime and hash."""
+
+    def __init__(self, path=DOCUMENT_CACHE_FILE, classifier=None):
+        """
+        Args:
+            path: Location of the cache file
+            classifier: KeywordClassifier the categories come from; entries made
+                with a different keyword table are discarded
+        """
+        classifier = classifier or default_classifier()
+        super().__init__(path, f"{DOCUMENT_CACHE_VERSION}.{classifier.fingerprint}")
+
+    def lookup(self, path):
+        """Return the cached ReportDocument for an unchanged file, or None."""
+        entry = self.fresh_entry(path)
+        if entry is None:
+            return None
+        return ReportDocument(entry["title"], list(entry["categories"]), entry["description"])
+
+    def store(self, path, document, fingerprint):
+        self.entries[path] = {
+            "size": fingerprint["size"],
+            "mtime_ns": fingerprint["mtime_ns"],
+            "sha256": fingerprint["sha256"],
+            "title": document.title,
+            "categories": document.categories,
+            "description": document.description,
+        }
+        self.dirty = True
+
+def parse_report_file(path, classifier=None, with_text=False):
+    """
+    Read and parse one report file. Runs in worker processes, so it doesn't touch a cache.
+
+    Args:
+        path: Path to the report HTML file
+        classifier: KeywordClassifier for the categories, defaults to the built-in keyword table
+        with_text: Also return the report text for category suggestions, from the same read
+
+    Returns:
+        Tuple of (ReportDocument, fingerprint, text); the fingerprint and text are
+        None and the document holds the defaults if the file can't be read
+    """
+    try:
+        with open(path, 'rb') as file:
+            raw = file.read()
+        # Same newline handling as reading in text mode; the hash is of the bytes on disk
+        content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        return (parse_report_document(content, path, classifier), file_fingerprint(path, raw),
+                report_text(content) if with_text else None)
+    except Exception as e:
+        print(f"Error processing {path}: {e}")
+        default_categories = (classifier or default_classifier()).default_categories
+        return ReportDocument(filename_title(path), list(default_categories), DEFAULT_DESCRIPTION), None, None
+
+def read_report_document(path, cache=None, classifier=None):
+    """
+    Read a report file once and extract its title, categories and snippet.
+
+    Args:
+        path: Path to the report HTML file
+        cache: Optional DocumentCache; unchanged files are served from it without being read
+        classifier: KeywordClassifier for the categories, defaults to the built-in keyword table
+
+    Returns:
+        A ReportDocument; the defaults are used if the file can't be read
+    """
+    if cache is not None:
+        document = cache.lookup(path)
+        if document is not None:
+            return document
+    document, fingerprint, _ = parse_report_file(path, classifier)
+    if cache is not None and fingerprint is not None:
+        cache.store(path, document, fingerprint)
+    return document
+
+def read_report_documents(paths, cache=None, workers=1, progress=None, classifier=None, texts=None):
+    """
+    Read many report files, parsing the ones the cache doesn't have in a process pool.
+
+    Args:
+        paths: Report file paths
+        cache: Optional DocumentCache, consulted and updated in this process only
+        workers: Number of worker processes; 1 parses in this process
+        progress: Optional callable(done, total), called as documents become available
+        classifier: KeywordClassifier for the categories, defaults to the built-in keyword table
+        texts: Optional dict whose keys are paths that also need their report text
+            (report_text()); the values are filled in from the same read, or None
+            if the file can't be read
+
+    Returns:
+        Dict of path -> ReportDocument. The result doesn't depend on workers.
+    """
+    texts = {} if texts is None else texts
+    documents = {}
+    pending = []
+    for path in paths:
+        # Reports whose text is wanted are read anyway, so they skip the cache
+        document = cache.lookup(path) if cache is not None and path not in texts else None
+        if document is not None:
+            documents[path] = document
+        elif path not in pending:
+            pending.append(path)
+    total = len(documents) + len(pending)
+    if progress:
+        progress(len(documents), total)
+
+    classifiers = repeat(classifier)
+    with_text = [path in texts for path in pending]
+    if workers > 1 and len(pending) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)))
+        chunksize = max(1, len(pending) // (workers * 4))
+        results = executor.map(parse_report_file, pending, classifiers, with_text, chunksize=chunksize)
+    else:
+        executor = None
+        results = map(parse_report_file, pending, classifiers, with_text)
+    try:
+        for path, (document, fingerprint, text) in zip(pending, results):
+            if cache is not None and fingerprint is not None:
+                cache.store(path, document, fingerprint)
+            documents[path] = document
+            if path in texts:
+                texts[path] = text
+            if progress:
+                progress(len(documents), total)
+    finally:
+        if executor:
+            executor.shutdown()
+    return documents
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Marker-delimited injection of the blocks construct_report.py adds to each report.
+
+Every injected block (custom title CSS, dark mode head script, dark mode body
+script) is wrapped in sentinel comments that carry the block name and version:
+
+    <!-- sway-inject:begin dark-mode-head v1 -->
+    ...
+    <!-- sway-inject:end dark-mode-head -->
+
+Injecting a block first removes any existing copy of it, so running the build
+repeatedly leaves exactly one copy of each block in the file.
+"""
+import re
+
+from dark_theme import DARK_CLASS, DARK_THEME_CSS
+
+# Bump this whenever the content of an injected block changes
+INJECTION_VERSION = 3
+
+CUSTOM_TITLE_CSS = """
+    <style>
+    /* Style for our custom title */
+    .custom-report-title {
+        font-size: 1.75rem;
+        font-weight: 600;
+        color: #23004D;
+        margin: 0 0 15px;
+        padding: 15px 15px 0;
+        line-height: 1.3;
+    }
+    
+    /* Style for social sharing section */
+    .social-sharing {
+        margin-top: 0 !important;
+        padding-top: 0 !important;
+    }
+    </style>
+    """
+
+DARK_MODE_HEAD_SCRIPT = """
+<script>
+  // Dark mode state - starts from the URL parameter, and the index page can
+  // switch it later with postMessage({type: 'sway-darkmode', enabled: true/false})
+  var swayDarkMode = new URLSearchParams(window.location.search).get('darkmode') === 'true';
+
+  function isDarkModeEnabled() {
+    return swayDarkMode;
+  }
+
+  function setDarkModeClass(isDarkMode) {
+    // The whole theme hangs off this class, so it applies before the body is
+    // parsed and there is no flash of light content
+    document.documentElement.classList.toggle('""" + DARK_CLASS + """', isDarkMode);
+  }
+
+  setDarkModeClass(swayDarkMode);
+
+  window.addEventListener('message', function(event) {
+    const data = event.data;
+    if (event.source !== window.parent || !data || data.type !== 'sway-darkmode') return;
+    swayDarkMode = !!data.enabled;
+    setDarkModeClass(swayDarkMode);
+    // Defined by the body script once the page has been parsed
+    if (window.swaySetDarkMode) window.swaySetDarkMode(swayDarkMode);
+  });
+</script>
+
+<style id="darkmode-styles">
+""" + DARK_THEME_CSS + """</style>
+"""
+
+DARK_MODE_BODY_SCRIPT = """
+<script>
+  // Dark mode fix-ups for what the static theme can't reach: inline styles
+  // that win over the stylesheet, and content added after the page loaded.
+  // Only elements with a style attribute and newly added nodes are checked.
+  (function() {
+    // Inline styles overridden here, so light mode can restore them
+    const overridden = new Map();
+    
+    function overrideStyle(el, property, value) {
+      if (!overridden.has(el)) overridden.set(el, {});
+      const saved = overridden.get(el);
+      if (!(property in saved)) {
+        saved[property] = [el.style.getPropertyValue(property), el.style.getPropertyPriority(property)];
+      }
+      el.style.setProperty(property, value, 'important');
+    }
+    
+    function restoreStyles() {
+      overridden.forEach((saved, el) => {
+        for (const property in saved) {
+          const [value, priority] = saved[property];
+          if (value) {
+            el.style.setProperty(property, value, priority);
+          } else {
+            el.style.removeProperty(property);
+          }
+        }
+      });
+      overridden.clear();
+    }
+    
+    // White or very light backgrounds (rgb values close to 255)
+    const LIGHT_BACKGROUND_RE = /^rgb\\((255, 255, 255|248|250|252|245)\\b/;
+    // Dark purples that would be hard to read on a dark background
+    const PURPLE_TEXT = ['rgb(128, 0, 128)', 'rgb(75, 0, 130)', 'rgb(106, 90, 205)', 'rgb(138, 43, 226)',
+                         'rgb(147, 112, 219)', 'rgb(153, 50, 204)', 'rgb(102, 51, 153)', 'rgb(35, 0, 77)'];
+    
+    function isDarkPurple(color) {
+      if (PURPLE_TEXT.includes(color)) return true;
+      if (!color.startsWith('rgb(')) return false;
+      // Any dark purplish color
+      const [r, g, b] = color.match(/\\d+/g).map(Number);
+      return r < 150 && g < 100 && b > 150;
+    }
+    
+    function fixElement(el) {
+      const style = window.getComputedStyle(el);
+      if (LIGHT_BACKGROUND_RE.test(style.backgroundColor)) {
+        overrideStyle(el, 'background-color', 'var(--sway-dark-surface)');
+        overrideStyle(el, 'color', 'var(--sway-dark-text)');
+      }
+      if (isDarkPurple(style.color)) {
+        overrideStyle(el, 'color', 'var(--sway-dark-accent)');
+      }
+    }
+    
+    // Check each added element and its descendants - nothing else is rescanned
+    const observer = new MutationObserver(mutations => {
+      mutations.forEach(mutation => {
+        mutation.addedNodes.forEach(node => {
+          if (node.nodeType !== Node.ELEMENT_NODE) return;
+          fixElement(node);
+          node.querySelectorAll('*').forEach(fixElement);
+        });
+      });
+    });
+    
+    function setDarkMode(isDarkMode) {
+      if (isDarkMode) {
+        // The stylesheet covers everything else; inline styles may still win over it
+        document.querySelectorAll('[style]').forEach(fixElement);
+        observer.observe(document.body, {childList: true, subtree: true});
+      } else {
+        observer.disconnect();
+        restoreStyles();
+      }
+    }
+    window.swaySetDarkMode = setDarkMode;
+    
+    document.addEventListener('DOMContentLoaded', function() {
+      if (isDarkModeEnabled()) setDarkMode(true);
+    });
+  })();
+</script>
+"""
+
+# Injected blocks in the order they are applied: name -> (anchor tag, content)
+INJECTED_BLOCKS = {
+    'custom-title-css': ('</head>', CUSTOM_TITLE_CSS),
+    'dark-mode-head': ('</head>', DARK_MODE_HEAD_SCRIPT),
+    'dark-mode-body': ('</body>', DARK_MODE_BODY_SCRIPT),
+}
+
+# Unmarked copies appended by builds that predate the markers (all identical to
+# the version 1 blocks). Matched by their fixed first and last lines.
+LEGACY_BLOCK_RES = [
+    re.compile(r'\n    <style>\n    /\* Style for our custom title \*/\n    \.custom-report-title \{\n'
+               r'.*?</style>\n    ', flags=re.DOTALL),
+    re.compile(r'\n<script>\n  // Detect dark mode from URL parameter\n'
+               r'.*?<style id="darkmode-styles">\n  /\* Dark mode styles will be enabled via JavaScript \*/\n</style>\n',
+               flags=re.DOTALL),
+    re.compile(r'\n<script>\n  // Dark mode implementation\n  \(function\(\) \{\n    // Only apply if the darkmode parameter is true\n'
+               r'.*?setInterval\(forceDarkElements, 1000\);\n    \}\);\n  \}\)\(\);\n</script>\n', flags=re.DOTALL),
+]
+
+MARKED_BLOCK_RE = re.compile(
+    r'<!-- sway-inject:begin (?P<name>[\w-]+) v(?P<version>\d+) -->'
+    r'.*?'
+    r'<!-- sway-inject:end (?P=name) -->\n?',
+    flags=re.DOTALL
+)
+
+def wrap_block(name, content, version=INJECTION_VERSION):
+    """Wrap block content in begin/end sentinel comments."""
+    return (f'<!-- sway-inject:begin {name} v{version} -->'
+            f'{content}'
+            f'<!-- sway-inject:end {name} -->\n')
+
+def find_injections(html):
+    """Return a dict of block name -> version for every marked block in the HTML."""
+    return {m.group('name'): int(m.group('version')) for m in MARKED_BLOCK_RE.finditer(html)}
+
+def remove_block(html, name):
+    """Remove every marked copy of the named block."""
+    return MARKED_BLOCK_RE.sub(lambda m: '' if m.group('name') == name else m.group(0), html)
+
+def _insert_before(html, anchor, text):
+    """Insert text before the anchor tag: the first </head>, or the last </body>."""
+    lowered = html.lower()
+    index = lowered.rfind(anchor) if anchor == '</body>' else lowered.find(anchor)
+    if index == -1:
+        return html
+    return html[:index] + text + html[index:]
+
+def inject_block(html, name, content=None, anchor=None):
+    """
+    Insert a marked block, replacing any existing copy of it.
+
+    Args:
+        html: The report HTML
+        name: Block name (a key of INJECTED_BLOCKS, or a custom name)
+        content: Block content, defaults to the registered content for the name
+        anchor: Closing tag to insert before, defaults to the registered anchor
+
+    Returns:
+        The HTML with exactly one copy of the block
+    """
+    default_anchor, default_content = INJECTED_BLOCKS.get(name, ('</head>', ''))
+    content = default_content if content is None else content
+    anchor = default_anchor if anchor is None else anchor
+
+    html = remove_block(html, name)
+    return _insert_before(html, anchor, wrap_block(name, content))
+
+def _strip_legacy_text(text):
+    for pattern in LEGACY_BLOCK_RES:
+        text = pattern.sub('', text)
+    return text
+
+def strip_legacy_blocks(html):
+    """
+    Remove unmarked blocks left behind by builds that predate the markers.
+
+    Marked blocks are left alone: the current title CSS still matches the
+    legacy pattern, and must survive a later apply_injections() call.
+    """
+    parts = []
+    position = 0
+    for match in MARKED_BLOCK_RE.finditer(html):
+        parts.append(_strip_legacy_text(html[position:match.start()]))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(_strip_legacy_text(html[position:]))
+    return ''.join(parts)
+
+def strip_injections(html):
+    """Remove all injected blocks, marked or legacy, restoring a clean file."""
+    html = MARKED_BLOCK_RE.sub('', html)
+    return strip_legacy_blocks(html)
+
+def apply_injections(html, names=None):
+    """
+    Bring the report up to date with one marked copy of each injected block.
+
+    Args:
+        html: The report HTML
+        names: Block names to inject, defaults to all of INJECTED_BLOCKS
+
+    Returns:
+        The updated HTML
+    """
+    html = strip_legacy_blocks(html)
+    for name in (names or INJECTED_BLOCKS):
+        html = inject_block(html, name)
+    return html
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Single-scan metadata extraction for Sway report HTML files.
+
+All the patterns used to pull metadata out of a report (generated title,
+h1/h2 fallbacks, Assignment Details, completion deadline, instructor row) are
+combined into one precompiled regex. The document is walked once, and only
+up to the start of the report body (#report-content), where all of this
+metadata lives; the rest of the ~1 MB file is only searched for a title if
+nothing was found in the header.
+"""
+import re
+import logging
+import datetime
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+ReportMetadata = namedtuple('ReportMetadata', [
+    'title',             # Title string, or None if no title pattern matched
+    'title_source',      # Which title pattern matched (one of TITLE_GROUPS), or None
+    'deadline',          # Offset-aware completion deadline, or None
+    'instructor_spans',  # List of (start, end) offsets of instructor names
+])
+
+# Title patterns in priority order - the first kind found wins
+TITLE_GROUPS = ('generated_title', 'h1', 'h2', 'assignment_details')
+
+_TITLE_PATTERNS = [
+    r'<div\s+class="generated-title\s+text-info\s+mb-1">(?P<generated_title>.*?)</div>',
+    r'<h1[^>]*>(?P<h1>.*?)</h1>',
+    r'<h2[^>]*>(?P<h2>.*?)</h2>',
+    r'<div[^>]*>Assignment Details</div>\s*<div[^>]*>(?P<assignment_details>.*?)</div>',
+]
+
+# The value between the label and the utc-time span is not allowed to run
+# into the next row, so a row without a timestamp can't swallow its neighbours
+_DEADLINE_PATTERN = (
+    r'<div\s+class="col-5\s+col-label">\s*Completion deadline:\s*</div>\s*'
+    r'<div\s+class="col-7\s+col-value">(?:(?!col-label).)*?'
+    r'<span\s+class="utc-time"\s+data-utc-time="(?P<deadline>[^"]+)"'
+)
+
+_INSTRUCTOR_PATTERN = (
+    r'<div\s+class="col-5\s+col-label">\s*Instructor:\s*</div>\s*'
+    r'<div\s+class="col-7\s+col-value">(?P<instructor>[^<]*)</div>'
+)
+
+METADATA_RE = re.compile(
+    '|'.join([_DEADLINE_PATTERN, _INSTRUCTOR_PATTERN] + _TITLE_PATTERNS),
+    flags=re.DOTALL
+)
+TITLE_RE = re.compile('|'.join(_TITLE_PATTERNS), flags=re.DOTALL)
+REPORT_BODY_RE = re.compile(r'id="report-content"')
+
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M:%S%z"
+
+def header_end(html):
+    """Return the offset where the report body starts, or the end of the document."""
+    match = REPORT_BODY_RE.search(html)
+    return match.start() if match else len(html)
+
+def _first_title(found):
+    for group in TITLE_GROUPS:
+        if group in found:
+            return found[group], group
+    return None, None
+
+def parse_deadline(deadline_str):
+    """Parse a data-utc-time value, returning None if it isn't a valid timestamp."""
+    try:
+        return datetime.datetime.strptime(deadline_str, DEADLINE_FORMAT)
+    except Exception as e:
+        logger.warning("Error parsing deadline '%s': %s", deadline_str, e)
+        return None
+
+def extract_metadata(html):
+    """
+    Extract title, completion deadline and instructor name offsets in one pass.
+
+    Args:
+        html: The report HTML
+
+    Returns:
+        A ReportMetadata record
+    """
+    end = header_end(html)
+    found = {}
+    deadline_str = None
+    instructor_spans = []
+
+    for match in METADATA_RE.finditer(html, 0, end):
+        group = match.lastgroup
+        if group == 'instructor':
+            instructor_spans.append(match.span('instructor'))
+        elif group == 'deadline':
+            if deadline_str is None:
+                deadline_str = match.group('deadline').strip()
+        elif group not in found:
+            found[group] = match.group(group).strip()
+
+    title, title_source = _first_title(found)
+    if title is None and end < len(html):
+        # Nothing in the header - fall back to searching the report body
+        for match in TITLE_RE.finditer(html, end):
+            group = match.lastgroup
+            if group not in found:
+                found[group] = match.group(group).strip()
+            if group == TITLE_GROUPS[0]:
+                break
+        title, title_source = _first_title(found)
+
+    deadline = parse_deadline(deadline_str) if deadline_str else None
+    return ReportMetadata(title=title, title_source=title_source, deadline=deadline,
+                          instructor_spans=instructor_spans)
+
+def redact_spans(html, spans, replacement='[redacted]'):
+    """Replace each (start, end) span of the HTML with the replacement text."""
+    parts = []
+    position = 0
+    for start, end in spans:
+        parts.append(html[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(html[position:])
+    return ''.join(parts)
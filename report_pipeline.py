@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Single-pass transform pipeline for report HTML files.
+
+A pipeline reads a report once, passes it through a list of stages that work
+on the in-memory string, and writes the result back once. The write goes to a
+temporary file in the same directory which is then renamed over the original,
+so a crash never leaves a half-processed report behind.
+
+Each stage is a function that takes the report dict and updates it in place.
+The dict always carries 'filename' and 'content'; stages are free to add
+their own keys (e.g. 'title' and 'deadline').
+"""
+import os
+import time
+import tempfile
+
+def _current_umask():
+    # The umask can only be read by setting it; done once at import, before any worker threads exist
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+_UMASK = _current_umask()
+
+def write_file_atomic(path, content, encoding="utf-8"):
+    """Write content (str, or bytes for binary files) to path via a temporary file and an atomic rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding)
+        with f:
+            f.write(content)
+        # Keep the permissions of the file we are replacing; mkstemp creates
+        # files as 0600, so new files get the usual default instead
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(temp_path, 0o666 & ~_UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class ReportPipeline:
+    """Read a report once, run it through the stages, and write it once."""
+
+    def __init__(self, stages):
+        """
+        Args:
+            stages: List of functions, each taking the report dict
+        """
+        self.stages = list(stages)
+
+    def process(self, filename, content):
+        """Run all stages over content in memory and return the report dict.
+
+        Per-stage wall-clock times are recorded in report['timings'].
+        """
+        report = {"filename": filename, "content": content, "timings": {}}
+        for stage in self.stages:
+            start = time.perf_counter()
+            stage(report)
+            report["timings"][stage.__name__] = round(time.perf_counter() - start, 6)
+        return report
+
+    def run(self, filename):
+        """
+        Process a report file, writing it back only if a stage changed it.
+
+        Args:
+            filename: Path to the report HTML file
+
+        Returns:
+            The report dict after all stages, with 'changed', 'bytes_in'
+            and 'bytes_out' set
+        """
+        bytes_in = os.path.getsize(filename)
+        with open(filename, "r", encoding="utf-8") as f:
+            original = f.read()
+
+        report = self.process(filename, original)
+        report["changed"] = report["content"] != original
+        if report["changed"]:
+            write_file_atomic(filename, report["content"])
+        report["bytes_in"] = bytes_in
+        report["bytes_out"] = os.path.getsize(filename)
+        return report
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Canonical data store for the instructor reports showcase.
+
+The showcase data - report titles, descriptions, categories, enabled state,
+the report order and the list of categories - lives in one JSON file next to
+the showcase page (instructor_reports_showcase.json):
+
+    {
+      "version": 42,
+      "reports": {"report.html": {"title": ..., "description": ...,
+                                  "categories": [...], "enabled": true}},
+      "order": ["report.html", ...],
+      "categories": ["education", ...]
+    }
+
+category_manager.py, update_showcase.py and recover_showcase_data.py read and
+write this file; the showcase HTML is only ever rendered from it, through the
+Jinja2 template templates/showcase.html. "version" goes up by one on every
+save.
+
+The first time a showcase without a JSON file is loaded, the data is scraped
+out of the existing HTML once (load_or_migrate) and saved.
+
+Every read-modify-write of the store must hold showcase_lock(), an advisory
+file lock that serializes writers across threads and processes (the category
+manager's workers and update_showcase.py).
+"""
+import os
+import html
+import json
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; writes are then only atomic, not serialized
+    fcntl = None
+
+from bs4 import BeautifulSoup
+from jinja2 import Environment, FileSystemLoader
+
+from report_pipeline import write_file_atomic
+from precompress import manifest_path_for, precompress_files
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+SHOWCASE_TEMPLATE = 'showcase.html'
+
+# Compiled once per process; autoescaping takes care of '&', '<' and quotes in
+# titles and descriptions, which are stored as plain text
+_environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+
+_held_locks = threading.local()
+
+@contextmanager
+def showcase_lock(data_path):
+    """
+    Hold an exclusive advisory lock on a showcase data store.
+
+    The lock is taken on a "<store>.lock" file next to the store. It is
+    reentrant within a thread, so code holding it can call helpers that take
+    it again.
+    """
+    key = os.path.abspath(data_path)
+    held = _held_locks.__dict__.setdefault('paths', set())
+    if key in held:
+        yield
+        return
+    with open(key + '.lock', 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        held.add(key)
+        try:
+            yield
+        finally:
+            held.discard(key)
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def showcase_data_path(showcase_file):
+    """Return the path of the JSON store that belongs to a showcase HTML file."""
+    return os.path.splitext(showcase_file)[0] + '.json'
+
+def empty_showcase_data():
+    return {'version': 0, 'reports': {}, 'order': [], 'categories': []}
+
+def normalize_showcase_data(data):
+    """
+    Make the order cover every report exactly once, in place.
+
+    Unknown filenames are dropped from the order, and reports missing from it
+    are appended at the end.
+    """
+    seen = set()
+    order = []
+    for filename in data['order']:
+        if filename in data['reports'] and filename not in seen:
+            order.append(filename)
+            seen.add(filename)
+    order.extend(filename for filename in data['reports'] if filename not in seen)
+    data['order'] = order
+    return data
+
+def load_showcase_data(path):
+    """Load the JSON store, returning None if it doesn't exist yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for key, default in empty_showcase_data().items():
+        data.setdefault(key, default)
+    return normalize_showcase_data(data)
+
+def save_showcase_data(path, data):
+    """Write the JSON store atomically, bumping its version. Returns the new version."""
+    normalize_showcase_data(data)
+    data['version'] = data.get('version', 0) + 1
+    write_file_atomic(path, json.dumps(data, indent=2, ensure_ascii=False))
+    return data['version']
+
+def clean_filename(link):
+    """Return the report filename from a card link, without any query string."""
+    return os.path.basename(link.split('?')[0]) if link else ''
+
+def scrape_showcase_html(showcase_file):
+    """
+    Extract showcase data from the report cards of a showcase HTML page.
+
+    Only used to migrate a showcase that predates the JSON store, and to
+    recover from HTML backups.
+    """
+    with open(showcase_file, 'r', encoding='utf-8') as file:
+        soup = BeautifulSoup(file.read(), 'html.parser')
+
+    data = empty_showcase_data()
+    for pill in soup.select('.category-pill'):
+        category = pill.get('data-category')
+        if category and category != 'all':  # Skip the "All Reports" category
+            data['categories'].append(category)
+
+    for card in soup.select('.report-card'):
+        title_elem = card.select_one('.report-title')
+        desc_elem = card.select_one('.report-description')
+        link_elem = card.select_one('.view-link')
+        # Skip cards missing required elements, and duplicates
+        if not title_elem or not desc_elem or not link_elem:
+            continue
+        filename = clean_filename(link_elem.get('href', ''))
+        if not filename or filename in data['reports']:
+            continue
+
+        # Disabled reports are marked with an attribute, a class, or both
+        is_disabled_attr = card.get('data-disabled') == 'true'
+        is_disabled_class = 'disabled-report' in card.get('class', [])
+        data['reports'][filename] = {
+            'title': html.unescape(title_elem.get_text().strip()),
+            'description': html.unescape(desc_elem.get_text().strip()),
+            'categories': card.get('data-categories', '').split(),
+            'enabled': not (is_disabled_attr or is_disabled_class),
+        }
+        data['order'].append(filename)
+    return data
+
+def load_or_migrate(showcase_file, data_path=None):
+    """
+    Load the showcase data, creating the JSON store from the HTML on first use.
+
+    Returns:
+        The showcase data dict (empty if there is neither a store nor a page)
+    """
+    data_path = data_path or showcase_data_path(showcase_file)
+    data = load_showcase_data(data_path)
+    if data is not None:
+        return data
+    if not os.path.exists(showcase_file):
+        return empty_showcase_data()
+    data = scrape_showcase_html(showcase_file)
+    save_showcase_data(data_path, data)
+    print(f"Migrated showcase data from {showcase_file} to {data_path}")
+    return data
+
+def ordered_reports(data):
+    """Return the reports as a list of dicts in showcase order, with filename and 1-based position."""
+    return [dict(data['reports'][filename], filename=filename, position=index + 1)
+            for index, filename in enumerate(data['order'])]
+
+def data_from_reports(categories, reports, version=0):
+    """Build showcase data from a category list and a list of report dicts (as from ordered_reports)."""
+    data = {'version': version, 'reports': {}, 'order': [], 'categories': list(categories)}
+    if any('position' in report for report in reports):
+        reports = sorted(reports, key=lambda r: r.get('position', float('inf')))
+    for report in reports:
+        filename = clean_filename(report['filename'])
+        data['reports'][filename] = {
+            'title': report['title'],
+            'description': report['description'],
+            # Categories are normalized (lowercase, no empty entries) for filtering
+            'categories': [c.strip().lower() for c in report['categories'] if c.strip()],
+            'enabled': report.get('enabled', True),
+        }
+        data['order'].append(filename)
+    return normalize_showcase_data(data)
+
+class CategoryIndex:
+    """Inverted index of the showcase: category -> set of report filenames.
+
+    Counts of enabled reports per category (and in total, under 'all') are
+    kept up to date as reports are added, removed, re-categorized or toggled,
+    so nothing has to rescan the reports to count them.
+    """
+
+    def __init__(self, categories=(), reports=()):
+        self.members = {category: set() for category in categories}
+        self.categories = {}
+        self.enabled = set()
+        self.counts = {'all': 0}
+        self.counts.update((category, 0) for category in categories)
+        for report in reports:
+            self.add(report['filename'], report['categories'], report.get('enabled', True))
+
+    def _count(self, categories, delta):
+        self.counts['all'] += delta
+        for category in categories:
+            if category in self.counts:
+                self.counts[category] += delta
+
+    def add(self, filename, categories, enabled=True):
+        """Add a report; it replaces any report already indexed under the filename."""
+        self.remove(filename)
+        categories = tuple(dict.fromkeys(categories))
+        self.categories[filename] = categories
+        for category in categories:
+            self.members.setdefault(category, set()).add(filename)
+        if enabled:
+            self.enabled.add(filename)
+            self._count(categories, 1)
+
+    def remove(self, filename):
+        if filename not in self.categories:
+            return
+        categories = self.categories.pop(filename)
+        for category in categories:
+            self.members[category].discard(filename)
+        if filename in self.enabled:
+            self.enabled.discard(filename)
+            self._count(categories, -1)
+
+    def assign(self, filename, categories):
+        """Replace the categories of a report."""
+        self.add(filename, categories, filename in self.enabled)
+
+    def set_enabled(self, filename, enabled):
+        if filename not in self.categories or (filename in self.enabled) == enabled:
+            return
+        if enabled:
+            self.enabled.add(filename)
+        else:
+            self.enabled.discard(filename)
+        self._count(self.categories[filename], 1 if enabled else -1)
+
+    def add_category(self, category):
+        if category not in self.counts:
+            self.members.setdefault(category, set())
+            self.counts[category] = len(self.members[category] & self.enabled)
+
+    def delete_category(self, category):
+        """Remove a category from the index and from every report in it."""
+        for filename in self.members.pop(category, set()):
+            self.categories[filename] = tuple(c for c in self.categories[filename] if c != category)
+        self.counts.pop(category, None)
+
+    def rename_category(self, old_category, new_category):
+        members = self.members.pop(old_category, set())
+        for filename in members:
+            self.categories[filename] = tuple(dict.fromkeys(
+                new_category if c == old_category else c for c in self.categories[filename]))
+        self.members.setdefault(new_category, set()).update(members)
+        if self.counts.pop(old_category, None) is not None or new_category in self.counts:
+            self.counts[new_category] = len(self.members[new_category] & self.enabled)
+
+    def filenames(self, category):
+        """Return the set of report filenames in a category. Shared - do not modify it."""
+        return self.members.get(category, set())
+
+def category_label(category):
+    """Return the display name of a category slug, e.g. 'social-issues' -> 'Social Issues'."""
+    return category.replace('-', ' ').title()
+
+def render_showcase(data):
+    """
+    Render the showcase page from the showcase data.
+
+    Returns:
+        The page HTML; the same data always renders to the same bytes
+    """
+    normalize_showcase_data(data)
+    reports = []
+    for filename in data['order']:
+        report = data['reports'][filename]
+        reports.append({
+            'filename': filename,
+            'title': report['title'],
+            'description': report['description'],
+            # Categories are normalized (lowercase, no empty entries) for filtering
+            'categories': [c.strip().lower() for c in report['categories'] if c.strip()],
+            'enabled': report.get('enabled', True),
+        })
+    # Counts are rendered into the page so the browser doesn't have to count the cards
+    counts = CategoryIndex(data['categories'], reports).counts
+    categories = [{'slug': category, 'label': category_label(category), 'count': counts.get(category, 0)}
+                  for category in data['categories']]
+    return _environment.get_template(SHOWCASE_TEMPLATE).render(categories=categories, reports=reports,
+                                                               total=counts['all'])
+
+def write_showcase_html(showcase_file, data, precompress=True):
+    """
+    Render the showcase page and write it.
+
+    Args:
+        showcase_file: Showcase HTML file to write
+        data: Showcase data dict
+        precompress: Also write .gz/.br copies, so a static server never serves stale bytes
+
+    Returns:
+        False if the page on disk was already up to date and nothing was written
+    """
+    page = render_showcase(data)
+    if os.path.exists(showcase_file):
+        with open(showcase_file, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == page:
+                return False
+    write_file_atomic(showcase_file, page)
+    if precompress:
+        precompress_files([showcase_file], manifest_path_for([showcase_file]))
+    return True
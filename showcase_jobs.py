@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Background runner for showcase update jobs.
+
+The category manager used to run update_showcase.update_showcase() inside the
+request thread, blocking the worker for the whole report scan. Jobs are now
+queued and run one at a time on a single worker thread; requests get a job id
+back straight away and poll GET /api/jobs/<id> for progress.
+
+A request for a run with the same parameters as a job that is still queued
+returns that job instead of queueing another one, so repeated clicks (or a
+burst of category changes) cause a single run.
+"""
+import time
+import uuid
+import queue
+import threading
+import traceback
+from collections import OrderedDict
+
+# Finished jobs kept for status requests
+MAX_FINISHED_JOBS = 100
+
+class JobRunner:
+    """Queue of jobs executed in order by one background thread.
+
+    Args:
+        run: Callable(progress, **params) doing the work. progress is a
+            callable(scanned, total) it may call to report progress; its
+            return value is stored as the job result.
+    """
+
+    def __init__(self, run):
+        self.run = run
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()
+        self.queue = queue.Queue()
+        self.worker = None
+
+    def _ensure_worker(self):
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self._work, name='showcase-jobs', daemon=True)
+            self.worker.start()
+
+    def submit(self, **params):
+        """Queue a job, or return the queued job with the same parameters.
+
+        Returns:
+            A copy of the job dict
+        """
+        with self.lock:
+            for job in self.jobs.values():
+                if job['status'] == 'queued' and job['params'] == params:
+                    job['requests'] += 1
+                    return dict(job)
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'status': 'queued',
+                'params': params,
+                'requests': 1,
+                'progress': {'scanned': 0, 'total': None},
+                'created': time.time(),
+                'started': None,
+                'finished': None,
+                'duration': None,
+                'result': None,
+                'error': None,
+            }
+            self.jobs[job['id']] = job
+            self._prune()
+            self.queue.put(job['id'])
+            self._ensure_worker()
+            return dict(job)
+
+    def get(self, job_id):
+        """Return a copy of a job dict, or None if the id is unknown."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed')]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _work(self):
+        while True:
+            job_id = self.queue.get()
+            with self.lock:
+                job = self.jobs[job_id]
+                job['status'] = 'running'
+                job['started'] = time.time()
+
+            def progress(scanned, total):
+                with self.lock:
+                    job['progress'] = {'scanned': scanned, 'total': total}
+
+            try:
+                result = self.run(progress, **job['params'])
+                status, error = 'done', None
+            except Exception as e:
+                print(f"Job {job_id} failed: {e}\n{traceback.format_exc()}")
+                result, status, error = None, 'failed', str(e)
+            with self.lock:
+                job['status'] = status
+                job['result'] = result
+                job['error'] = error
+                job['finished'] = time.time()
+                job['duration'] = round(job['finished'] - job['started'], 3)
+            self.queue.task_done()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Deduplicated, compressed store of showcase snapshots.
+
+update_showcase.py used to copy the showcase page and its data into a new
+pair of timestamped files in the repository root on every run. Snapshots now
+go into a backups/ directory instead:
+
+    backups/index.json              list of snapshots, oldest first
+    backups/objects/<sha256>.gz     gzip-compressed file contents
+
+Each file is stored once under its content hash, however many snapshots
+refer to it. A snapshot identical to the previous one is not recorded at all,
+and a retention policy (the last N snapshots plus the newest of each recent
+day and week) keeps the index bounded. Objects no longer referenced by any
+snapshot are deleted.
+
+Run this module to import old timestamped backup files:
+
+    python snapshot_store.py --import-legacy [--remove-imported]
+"""
+import os
+import re
+import glob
+import gzip
+import json
+import argparse
+import datetime
+
+from build_cache import content_hash
+from report_pipeline import write_file_atomic
+
+BACKUPS_DIR = "backups"
+SNAPSHOT_INDEX = "index.json"
+
+# Retention policy defaults
+KEEP_LAST = 20
+KEEP_DAILY = 14
+KEEP_WEEKLY = 8
+
+LEGACY_BACKUP_RE = re.compile(r'_(\d{8}_\d{6})_(backup\.html|data\.json)$')
+
+def backups_dir_for(showcase_file):
+    """Return the backups directory that belongs to a showcase file."""
+    return os.path.join(os.path.dirname(os.path.abspath(showcase_file)), BACKUPS_DIR)
+
+class SnapshotStore:
+    """Snapshots of named files (e.g. {"html": ..., "data": ...}) in a backups directory."""
+
+    def __init__(self, directory=BACKUPS_DIR):
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, "objects")
+        self.index_path = os.path.join(directory, SNAPSHOT_INDEX)
+        self.snapshots = self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("snapshots", [])
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable snapshot index {self.index_path}: {e}")
+            return []
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        write_file_atomic(self.index_path, json.dumps({"snapshots": self.snapshots}, indent=2))
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest + ".gz")
+
+    def _write_object(self, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        digest = content_hash(content)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(self.objects_dir, exist_ok=True)
+            write_file_atomic(path, gzip.compress(content, mtime=0))
+        return digest
+
+    def add(self, files, label="", created=None, retain=True):
+        """
+        Record a snapshot unless it is identical to the latest one.
+
+        Args:
+            files: Dict of name -> content (str or bytes)
+            label: Short note of what triggered the snapshot
+            created: Snapshot time, defaults to now
+            retain: Apply the retention policy afterwards (otherwise the index is not saved)
+
+        Returns:
+            The new snapshot entry, or None if nothing changed
+        """
+        hashes = {name: self._write_object(content) for name, content in files.items()}
+        if self.snapshots and self.snapshots[-1]["files"] == hashes:
+            return None
+        created = created or datetime.datetime.now()
+        snapshot = {
+            "id": created.strftime("%Y%m%d_%H%M%S_%f"),
+            "created": created.isoformat(timespec="seconds"),
+            "label": label,
+            "files": hashes,
+        }
+        self.snapshots.append(snapshot)
+        self.snapshots.sort(key=lambda s: s["created"])
+        if retain:
+            self.apply_retention()
+        return snapshot
+
+    def get(self, snapshot_id):
+        return next((s for s in self.snapshots if s["id"] == snapshot_id), None)
+
+    def read(self, snapshot_id, name):
+        """Return the content of one file of a snapshot as text."""
+        snapshot = self.get(snapshot_id)
+        if snapshot is None or name not in snapshot["files"]:
+            raise KeyError(f"{snapshot_id}/{name}")
+        with gzip.open(self._object_path(snapshot["files"][name]), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def apply_retention(self, keep_last=KEEP_LAST, keep_daily=KEEP_DAILY, keep_weekly=KEEP_WEEKLY):
+        """
+        Drop snapshots outside the retention policy and delete unreferenced objects.
+
+        Kept: the newest keep_last snapshots, plus the newest snapshot of each
+        of the keep_daily most recent days and keep_weekly most recent weeks
+        that have snapshots.
+
+        Returns:
+            Number of snapshots dropped
+        """
+        keep = set(s["id"] for s in self.snapshots[-keep_last:]) if keep_last else set()
+        for period, count in (("day", keep_daily), ("week", keep_weekly)):
+            newest = {}
+            for snapshot in self.snapshots:
+                created = datetime.datetime.fromisoformat(snapshot["created"])
+                key = created.date() if period == "day" else created.isocalendar()[:2]
+                newest[key] = snapshot["id"]  # Oldest first, so the newest wins
+            if count:
+                keep.update(newest[key] for key in sorted(newest)[-count:])
+
+        dropped = len(self.snapshots) - len(keep)
+        self.snapshots = [s for s in self.snapshots if s["id"] in keep]
+        self._save_index()
+        if dropped:
+            self._collect_garbage()
+        return dropped
+
+    def _collect_garbage(self):
+        referenced = set(digest for s in self.snapshots for digest in s["files"].values())
+        if not os.path.isdir(self.objects_dir):
+            return
+        with os.scandir(self.objects_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".gz") and entry.name[:-3] not in referenced:
+                    os.remove(entry.path)
+
+def snapshot_showcase(showcase_file, data_file, label=""):
+    """
+    Snapshot the current showcase page and data store.
+
+    Returns:
+        The new snapshot entry, or None if nothing changed since the last one
+    """
+    files = {}
+    for name, path in (("html", showcase_file), ("data", data_file)):
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                files[name] = f.read()
+    if not files:
+        return None
+    snapshot = SnapshotStore(backups_dir_for(showcase_file)).add(files, label)
+    if snapshot:
+        print(f"Created showcase snapshot {snapshot['id']} in {backups_dir_for(showcase_file)}")
+    return snapshot
+
+def import_legacy_backups(showcase_file, remove_imported=False):
+    """
+    Import the old timestamped _backup.html / _data.json files into the snapshot store.
+
+    Files from the same run (same timestamp) become one snapshot. Retention is
+    applied once at the end.
+
+    Returns:
+        Number of snapshots recorded
+    """
+    base = os.path.splitext(showcase_file)[0]
+    runs = {}
+    for path in glob.glob(f"{glob.escape(base)}_*_*"):
+        match = LEGACY_BACKUP_RE.search(path)
+        if match:
+            name = "html" if match.group(2) == "backup.html" else "data"
+            runs.setdefault(match.group(1), {})[name] = path
+
+    store = SnapshotStore(backups_dir_for(showcase_file))
+    recorded = 0
+    for timestamp in sorted(runs):
+        files = {}
+        for name, path in runs[timestamp].items():
+            with open(path, "r", encoding="utf-8") as f:
+                files[name] = f.read()
+        created = datetime.datetime.strptime(timestamp, "%Y%m%d_%H%M%S")
+        if store.add(files, "legacy import", created, retain=False):
+            recorded += 1
+    store.apply_retention()
+
+    if remove_imported:
+        for paths in runs.values():
+            for path in paths.values():
+                os.remove(path)
+    print(f"Imported {sum(len(p) for p in runs.values())} legacy backup files as {recorded} snapshots")
+    return recorded
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage showcase snapshots')
+    parser.add_argument('--showcase-file', default='instructor_reports_showcase.html',
+                        help='Path to the showcase HTML file')
+    parser.add_argument('--import-legacy', action='store_true',
+                        help='Import old timestamped _backup.html/_data.json files into backups/')
+    parser.add_argument('--remove-imported', action='store_true',
+                        help='Delete the legacy files after importing them')
+    args = parser.parse_args()
+
+    if args.import_legacy:
+        import_legacy_backups(args.showcase_file, args.remove_imported)
+    for snapshot in SnapshotStore(backups_dir_for(args.showcase_file)).snapshots:
+        print(f"{snapshot['id']}  {snapshot['label']}  {', '.join(sorted(snapshot['files']))}")
@@ -0,0 +1,45 @@
+import os
+import datetime
+from build_cache import BuildCache, file_fingerprint
+
+def test_unchanged_file_is_served_from_cache(tmp_path):
+    report_path = tmp_path / "report.html"
+    report_path.write_text("<html>processed</html>", encoding="utf-8")
+    cache_path = str(tmp_path / "cache.json")
+    deadline = datetime.datetime(2025, 5, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+    cache = BuildCache(cache_path, version="1")
+    record = {"filename": str(report_path), "title": "Report", "deadline": deadline}
+    cache.store(record, file_fingerprint(str(report_path)))
+    cache.save()
+
+    # Touching the file without changing it still hits the cache
+    os.utime(report_path, None)
+    assert BuildCache(cache_path, version="1").lookup(str(report_path)) == record
+
+def test_modified_file_or_new_version_misses(tmp_path):
+    report_path = tmp_path / "report.html"
+    report_path.write_text("<html>processed</html>", encoding="utf-8")
+    cache_path = str(tmp_path / "cache.json")
+
+    cache = BuildCache(cache_path, version="1")
+    cache.store({"filename": str(report_path), "title": "Report", "deadline": None},
+                file_fingerprint(str(report_path)))
+    cache.save()
+
+    assert BuildCache(cache_path, version="2").lookup(str(report_path)) is None
+    report_path.write_text("<html>edited by hand</html>", encoding="utf-8")
+    assert BuildCache(cache_path, version="1").lookup(str(report_path)) is None
+
+def test_unreadable_cache_is_logged_and_ignored(tmp_path, caplog):
+    from report_document import DocumentCache
+    from category_suggestions import SuggestionIndex
+    cache_path = tmp_path / "cache.json"
+    cache_path.write_text("{not json", encoding="utf-8")
+
+    assert BuildCache(str(cache_path)).entries == {}
+    assert DocumentCache(str(cache_path)).entries == {}
+    assert SuggestionIndex.load(str(cache_path)) is None
+    warnings = [record for record in caplog.records if record.levelname == "WARNING"]
+    assert len(warnings) == 3
+    assert all(str(cache_path) in record.getMessage() for record in warnings)
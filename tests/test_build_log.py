@@ -0,0 +1,71 @@
+import json
+import logging
+import argparse
+
+from build_log import RunLog, add_logging_arguments, level_from_args
+from clean_sway_headers import clean_sway_headers
+import construct_report
+
+REPORT = """<html><head><title>Débat</title></head><body>
+<div class="sway-header-centered">Sway Assignment Report
+Share this assignment with your colleagues</div>
+<h1>Débat sur l'éthique – résumé</h1>
+</body></html>
+"""
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_level_from_args():
+    parser = argparse.ArgumentParser()
+    add_logging_arguments(parser)
+    assert level_from_args(parser.parse_args([])) == logging.INFO
+    assert level_from_args(parser.parse_args(["-v"])) == logging.DEBUG
+    assert level_from_args(parser.parse_args(["-q"])) == logging.WARNING
+    assert level_from_args(parser.parse_args(["-q", "--log-level", "ERROR"])) == logging.ERROR
+
+def test_run_log_without_path_discards_records(tmp_path):
+    with RunLog() as run_log:
+        run_log.write("file", file="report.html")
+    assert list(tmp_path.iterdir()) == []
+
+def test_clean_headers_logs_bytes_on_disk(tmp_path):
+    reports_dir = tmp_path / "instructor_reports"
+    reports_dir.mkdir()
+    report_path = reports_dir / "debat.html"
+    report_path.write_text(REPORT, encoding="utf-8")
+    size_before = report_path.stat().st_size
+    log_path = tmp_path / "run.jsonl"
+
+    with RunLog(str(log_path)) as run_log:
+        clean_sway_headers(str(reports_dir), run_log)
+
+    [record] = read_records(log_path)
+    assert record["event"] == "file"
+    assert record["file"] == "debat.html"
+    assert record["matched"] == "header-block"
+    assert record["seconds"] >= 0
+    # Bytes, not characters: the report has non-ASCII text
+    assert record["bytes_in"] == size_before > len(REPORT)
+    assert record["bytes_out"] == report_path.stat().st_size < size_before
+
+def test_build_logs_stage_timings_and_bytes(tmp_path, monkeypatch):
+    (tmp_path / "html").mkdir()
+    report_path = tmp_path / "html" / "debat.html"
+    report_path.write_text(REPORT, encoding="utf-8")
+    size_before = report_path.stat().st_size
+    log_path = tmp_path / "run.jsonl"
+    monkeypatch.chdir(tmp_path)
+
+    with RunLog(str(log_path)) as run_log:
+        construct_report.main(use_cache=False, run_log=run_log, extract_assets=False, precompress=False)
+
+    [record] = read_records(log_path)
+    assert record["event"] == "report"
+    assert record["file"] == "html/debat.html"
+    assert record["cached"] is False
+    assert record["bytes_in"] == size_before
+    assert record["bytes_out"] == report_path.stat().st_size
+    assert set(record["stage_seconds"]) >= {"extract_metadata_stage", "redact_stage", "inject_dark_mode_stage"}
+    assert all(seconds >= 0 for seconds in record["stage_seconds"].values())
@@ -0,0 +1,41 @@
+import json
+from category_classifier import KeywordClassifier, load_classifier
+
+def make_classifier(**kwargs):
+    keywords = {
+        "healthcare": ["care", "patient*"],
+        "science": ["genetic"],
+        "bioethics": ["genetic engineering"],
+    }
+    return KeywordClassifier(keywords, **kwargs)
+
+def test_matches_whole_words_and_prefixes():
+    classifier = make_classifier()
+    hits = classifier.hits("Careful patients need CARE; scare tactics and outpatient visits don't count.")
+    assert hits == {"healthcare": 2}
+    # Without word boundaries any substring counts
+    assert make_classifier(word_boundary=False).hits("Careful scare")["healthcare"] == 2
+
+def test_phrase_match_counts_contained_keywords():
+    hits = make_classifier().hits("Genetic engineering and genetic testing")
+    assert hits == {"science": 2, "bioethics": 1}
+
+def test_thresholds_and_title_hits():
+    classifier = make_classifier(default_categories=["ethics"], min_hits=2, thresholds={"science": 1})
+    assert classifier.classify("one patient, genetic") == ["ethics", "science"]
+    assert classifier.classify("one patient, another patient") == ["ethics", "healthcare"]
+    assert classifier.classify("nothing here", title="Patient Rights") == ["ethics", "healthcare"]
+
+def test_loads_keyword_table_from_config(tmp_path):
+    config_path = tmp_path / "category_keywords.json"
+    config_path.write_text(json.dumps({
+        "default_categories": [],
+        "min_hits": 1,
+        "categories": {"sports": ["football"], "arts": {"keywords": ["painting"], "min_hits": 2}},
+    }), encoding="utf-8")
+
+    classifier = load_classifier(str(config_path))
+    assert classifier.classify("Football and painting") == ["sports"]
+    assert classifier.classify("Painting after painting") == ["arts"]
+    # The fingerprint tracks the table, so cached categories are redone when it changes
+    assert classifier.fingerprint != load_classifier(str(tmp_path / "missing.json")).fingerprint
@@ -0,0 +1,327 @@
+import json
+
+import category_manager
+import update_showcase
+from category_manager import ShowcaseStore
+from showcase_data import CategoryIndex
+
+SHOWCASE = """<html><body>
+<div class="category-bar">
+  <button class="category-pill active" data-category="all">All Reports</button>
+  <button class="category-pill" data-category="ethics">Ethics</button>
+</div>
+<div class="report-cards">
+  <div class="report-card" data-categories="ethics" data-disabled="false">
+    <div class="report-title">First</div>
+    <div class="report-description">One</div>
+    <a class="view-link" href="instructor_reports/first.html">View</a>
+  </div>
+  <div class="report-card" data-categories="" data-disabled="false">
+    <div class="report-title">Second</div>
+    <div class="report-description">Two</div>
+    <a class="view-link" href="instructor_reports/second.html">View</a>
+  </div>
+</div>
+</body></html>"""
+
+def make_store(tmp_path):
+    path = tmp_path / "showcase.html"
+    path.write_text(SHOWCASE, encoding="utf-8")
+    return ShowcaseStore(str(path)), path
+
+def test_reads_are_served_from_memory(tmp_path):
+    store, _ = make_store(tmp_path)
+    categories, reports = store.read()
+    assert categories == ["ethics"]
+    assert [r["filename"] for r in reports] == ["first.html", "second.html"]
+    assert store.read()[1] is reports
+
+def test_external_change_is_picked_up(tmp_path):
+    store, _ = make_store(tmp_path)
+    store.read()
+    data = json.loads((tmp_path / "showcase.json").read_text(encoding="utf-8"))
+    data["reports"]["first.html"]["title"] = "Renamed plus a longer title"
+    (tmp_path / "showcase.json").write_text(json.dumps(data), encoding="utf-8")
+    assert store.read()[1][0]["title"] == "Renamed plus a longer title"
+
+def test_save_writes_through(tmp_path):
+    store, path = make_store(tmp_path)
+    categories, reports = store.snapshot()
+    reports[1]["categories"] = ["ethics"]
+    reports[0]["enabled"] = False
+    store.save(categories, reports)
+
+    assert store.read() == ShowcaseStore(str(path)).read()
+    assert store.read()[1][1]["categories"] == ["ethics"]
+    assert store.read()[1][0]["enabled"] is False
+    # The page is rendered from the store
+    page = path.read_text(encoding="utf-8")
+    assert page.count('data-categories="ethics"') == 2
+    assert 'data-disabled="true"' in page
+
+def make_client(tmp_path, monkeypatch):
+    store, path = make_store(tmp_path)
+    reports_dir = tmp_path / "instructor_reports"
+    reports_dir.mkdir()
+    for name in ("first.html", "second.html"):
+        (reports_dir / name).write_text("<html><head><title>x</title></head><body><h1>x</h1></body></html>",
+                                        encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(category_manager, "store", store)
+    monkeypatch.setattr(category_manager, "REPORTS_DIR", str(reports_dir))
+    return category_manager.app.test_client(), store, path
+
+def test_batch_applies_all_operations_with_one_save(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "assign", "filename": "second.html", "categories": ["ethics"]},
+        {"op": "retitle", "filename": "second.html", "title": "Tom & Jerry"},
+        {"op": "rename", "old_category": "ethics", "new_category": "Moral Philosophy"},
+        {"op": "reorder", "filename": "second.html", "position": 1},
+        {"op": "toggle", "filename": "first.html", "enabled": False},
+    ]})
+    assert response.get_json() == {"success": True, "applied": 5, "version": 2}
+
+    categories, reports = store.read()
+    assert categories == ["moral-philosophy"]
+    assert [r["filename"] for r in reports] == ["second.html", "first.html"]
+    assert reports[0]["title"] == "Tom & Jerry"
+    assert reports[0]["categories"] == ["moral-philosophy"]
+    assert reports[1]["enabled"] is False
+    assert (tmp_path / "hidden_reports" / "first.html").exists()
+    assert "Tom &amp; Jerry" in (tmp_path / "instructor_reports" / "second.html").read_text(encoding="utf-8")
+    assert json.loads((tmp_path / "showcase.json").read_text(encoding="utf-8"))["version"] == 2
+
+def test_invalid_batch_changes_nothing(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    before = store.read()
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "toggle", "filename": "first.html", "enabled": False},
+        {"op": "assign", "filename": "missing.html", "categories": []},
+    ]})
+    assert response.status_code == 400
+    assert "Operation 1" in response.get_json()["error"]
+    assert store.read() == before
+    assert (tmp_path / "instructor_reports" / "first.html").exists()
+
+def test_if_match_rejects_stale_version(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    etag = client.get("/api/reports").headers["ETag"]
+    operations = {"operations": [{"op": "assign", "filename": "first.html", "categories": []}]}
+
+    response = client.post("/api/batch", json=operations, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    # A second edit based on the old version must not overwrite the first
+    operations["operations"][0]["categories"] = ["ethics"]
+    response = client.post("/api/batch", json=operations, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert store.read()[1][0]["categories"] == []
+
+def test_version_in_body_is_checked_like_if_match(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    version = store.etag()
+    operations = [{"op": "assign", "filename": "first.html", "categories": []}]
+
+    # As sent by the beacon that flushes queued edits on page unload
+    response = client.post("/api/batch", json={"operations": operations, "version": version})
+    assert response.status_code == 200
+
+    operations[0]["categories"] = ["ethics"]
+    response = client.post("/api/batch", json={"operations": operations, "version": version})
+    assert response.status_code == 412
+    assert store.read()[1][0]["categories"] == []
+
+def test_concurrent_writes_are_serialized(tmp_path, monkeypatch):
+    import threading
+    client, store, path = make_client(tmp_path, monkeypatch)
+    start = int(store.etag())
+
+    def retitle(n):
+        category_manager.app.test_client().post("/api/batch", json={"operations": [
+            {"op": "retitle", "filename": "first.html", "title": f"Title {n}"}]})
+
+    threads = [threading.Thread(target=retitle, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Every save read the version the previous one wrote
+    assert int(store.etag()) == start + 8
+
+def test_reads_do_not_wait_for_a_writer_blocked_on_the_file_lock(tmp_path, monkeypatch):
+    import threading
+    from showcase_data import showcase_lock
+    client, store, path = make_client(tmp_path, monkeypatch)
+    store.read()
+    locked, release = threading.Event(), threading.Event()
+
+    def long_job():
+        # Stands in for an update_showcase job scanning the corpus
+        with showcase_lock(store.data_path):
+            locked.set()
+            release.wait(5)
+
+    def writer():
+        with store.transaction():
+            pass
+
+    threads = [threading.Thread(target=long_job), threading.Thread(target=writer)]
+    threads[0].start()
+    locked.wait(5)
+    threads[1].start()
+    threads[1].join(0.2)
+    assert threads[1].is_alive()
+
+    reader = threading.Thread(target=store.read)
+    reader.start()
+    reader.join(2)
+    still_blocked = reader.is_alive()
+    release.set()
+    for thread in threads + [reader]:
+        thread.join(5)
+    assert not still_blocked
+
+def test_hidden_reports_are_paginated(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    hidden_dir = tmp_path / "hidden_reports"
+    hidden_dir.mkdir()
+    for n in range(5):
+        (hidden_dir / f"extra-{n}.html").write_text("<html></html>", encoding="utf-8")
+    client.post("/api/toggle_visibility", json={"filename": "first.html", "enabled": False})
+
+    page = client.get("/hidden_reports?per_page=4").get_data(as_text=True)
+    assert "page 1 of 2" in page
+    assert page.count('class="report-card"') == 4
+    assert "extra 0" in page
+    page = client.get("/hidden_reports?per_page=4&page=2").get_data(as_text=True)
+    # Showcase metadata is used for hidden reports it knows about
+    assert page.count('class="report-card"') == 2
+    assert "First" in page
+
+def test_update_showcase_runs_as_a_job(tmp_path, monkeypatch):
+    import time
+    client, store, path = make_client(tmp_path, monkeypatch)
+    assert client.post("/api/run_update_showcase", json={"workers": 0}).status_code == 400
+    response = client.post("/api/run_update_showcase", json={"workers": 2})
+    assert response.status_code == 202
+    status_url = response.get_json()["status_url"]
+
+    for _ in range(500):
+        job = client.get(status_url).get_json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.01)
+    assert job["status"] == "done", job["error"]
+    assert job["progress"] == {"scanned": 2, "total": 2}
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+def test_batch_finishes_while_an_update_job_scans(tmp_path, monkeypatch):
+    import threading
+    client, store, path = make_client(tmp_path, monkeypatch)
+    scanning, release = threading.Event(), threading.Event()
+    real_read = update_showcase.read_report_documents
+
+    def slow_read(*args, **kwargs):
+        scanning.set()
+        release.wait(5)
+        return real_read(*args, **kwargs)
+
+    monkeypatch.setattr(update_showcase, "read_report_documents", slow_read)
+    status_url = client.post("/api/run_update_showcase", json={"workers": 1}).get_json()["status_url"]
+    assert scanning.wait(5)
+
+    responses = []
+    batch = threading.Thread(target=lambda: responses.append(category_manager.app.test_client().post(
+        "/api/batch", json={"operations": [
+            {"op": "assign", "filename": "second.html", "categories": ["ethics"]},
+            {"op": "toggle", "filename": "first.html", "enabled": False},
+        ]})))
+    batch.start()
+    batch.join(2)
+    finished = not batch.is_alive()
+    release.set()
+    batch.join(5)
+    category_manager.jobs.queue.join()
+    assert finished
+    assert responses[0].status_code == 200
+    assert client.get(status_url).get_json()["status"] == "done"
+    # The job merged its scan into the edited store instead of overwriting it
+    reports = store.lookup()
+    assert reports["second.html"]["categories"] == ["ethics"]
+    assert reports["first.html"]["enabled"] is False
+
+def test_reports_api_filters_pages_and_revalidates(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    response = client.get("/api/reports?category=ethics&fields=filename,title")
+    assert response.get_json() == [{"filename": "first.html", "title": "First"}]
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get("/api/reports?q=TWO&enabled=true")
+    assert [r["filename"] for r in response.get_json()] == ["second.html"]
+    response = client.get("/api/reports?offset=1&limit=1&fields=filename")
+    assert response.get_json() == [{"filename": "second.html"}]
+    assert response.headers["X-Total-Count"] == "2"
+    assert client.get("/api/reports?fields=secret").status_code == 400
+    assert client.get("/api/reports?enabled=maybe").status_code == 400
+
+    etag = response.headers["ETag"]
+    assert client.get("/api/reports", headers={"If-None-Match": etag}).status_code == 304
+    client.post("/api/batch", json={"operations": [{"op": "toggle", "filename": "first.html", "enabled": False}]})
+    assert client.get("/api/reports", headers={"If-None-Match": etag}).status_code == 200
+    assert store.category_counts() == {"all": 1, "ethics": 0}
+
+def test_index_page_loads_reports_from_the_api(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    page = client.get("/?per_page=1").get_data(as_text=True)
+    # Cards are filtered, searched and paged by /api/reports, not in the page
+    assert 'data-filename="first.html"' not in page
+    assert 'data-page-size="1"' in page
+    assert 'data-total="2"' in page
+    assert "data-categories='[\"ethics\"]'" in page
+
+    # The requests the page makes, revalidated with the ETag it got
+    fields = "filename,title,description,categories,enabled,position"
+    response = client.get(f"/api/reports?enabled=true&offset=1&limit=1&fields={fields}")
+    assert [r["filename"] for r in response.get_json()] == ["second.html"]
+    assert response.headers["X-Total-Count"] == "2"
+    etag = response.headers["ETag"]
+    response = client.get(f"/api/reports?enabled=true&offset=1&limit=1&fields={fields}",
+                          headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_incremental_index_matches_rebuild(tmp_path, monkeypatch):
+    client, store, path = make_client(tmp_path, monkeypatch)
+    client.post("/categories", data={"action": "add", "new_category": "Law"})
+    client.post("/api/batch", json={"operations": [
+        {"op": "assign", "filename": "second.html", "categories": ["ethics", "law"]},
+        {"op": "toggle", "filename": "first.html", "enabled": False},
+        {"op": "rename", "old_category": "ethics", "new_category": "morals"},
+    ]})
+    client.post("/categories", data={"action": "delete", "category": "law"})
+
+    rebuilt = CategoryIndex(*store.read())
+    assert store.category_counts() == rebuilt.counts == {"all": 1, "morals": 1}
+    assert store.category_index.members == rebuilt.members
+    assert [r["filename"] for r in store.query(category="morals")] == ["first.html", "second.html"]
+    # The showcase page carries the counts
+    page = path.read_text(encoding="utf-8")
+    assert 'data-category="morals" data-count="1">Morals (1)' in page
+    assert 'data-count="1">All Reports (1)' in page
+    # Category changes queue a showcase update; let it finish inside tmp_path
+    category_manager.jobs.queue.join()
+
+def test_suggest_categories_endpoint(tmp_path, monkeypatch):
+    from category_suggestions import SuggestionIndex, suggestions_path_for
+    client, store, path = make_client(tmp_path, monkeypatch)
+    assert client.get("/api/suggest_categories?filename=first.html").status_code == 404
+    assert client.get("/api/suggest_categories?filename=../first.html").status_code == 400
+
+    (tmp_path / "instructor_reports" / "first.html").write_text(
+        '<div id="report-content"><p>Consent and autonomy</p></div>', encoding="utf-8")
+    SuggestionIndex.train([("consent autonomy", ["ethics"]), ("autonomy rights", ["ethics"]),
+                           ("habitat loss", ["environment"])]).save(suggestions_path_for(str(path)))
+    response = client.get("/api/suggest_categories?filename=first.html")
+    assert response.status_code == 200
+    assert response.get_json()["suggestions"][0]["category"] == "ethics"
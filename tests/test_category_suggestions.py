@@ -0,0 +1,71 @@
+from category_suggestions import SuggestionIndex, report_text, train_showcase_index, suggestions_path_for
+from showcase_data import save_showcase_data, showcase_data_path
+
+EXAMPLES = [
+    ("Hospital patients and nurses debated triage in the clinic", ["healthcare"]),
+    ("Nurses described clinic staffing and patients waiting for triage", ["healthcare"]),
+    ("Rivers, forests and wetlands: protecting the watershed habitat", ["environment"]),
+    ("Forests and wetlands lose habitat as the river watershed dries", ["environment"]),
+    ("Clinic patients living near polluted rivers and wetlands", ["healthcare", "environment"]),
+]
+
+def test_suggests_categories_from_assigned_examples():
+    index = SuggestionIndex.train(EXAMPLES)
+    assert index.suggest("A triage nurse at the clinic")[0][0] == "healthcare"
+    assert index.suggest("Restoring wetlands along the river")[0][0] == "environment"
+    assert index.suggest("Nothing in common") == []
+    # A batch gives the same result as one report at a time
+    texts = ["A triage nurse at the clinic", "Restoring wetlands along the river"]
+    assert index.suggest_many(texts) == [index.suggest(text) for text in texts]
+
+def test_index_is_persisted_and_trained_from_the_showcase(tmp_path):
+    reports_dir = tmp_path / "instructor_reports"
+    reports_dir.mkdir()
+    (tmp_path / "hidden_reports").mkdir()
+    data = {'version': 0, 'reports': {}, 'order': [], 'categories': ['healthcare', 'environment']}
+    for number, (text, categories) in enumerate(EXAMPLES):
+        filename = f"report-{number}.html"
+        directory = reports_dir if number % 2 else tmp_path / "hidden_reports"
+        (directory / filename).write_text(
+            f'<h1 class="generated-title">Report {number}</h1><div id="report-content"><p>{text}</p></div>',
+            encoding="utf-8")
+        data['reports'][filename] = {'title': text, 'description': '', 'categories': categories, 'enabled': True}
+    showcase = str(tmp_path / "showcase.html")
+    save_showcase_data(showcase_data_path(showcase), data)
+
+    index = train_showcase_index(showcase, str(reports_dir))
+    assert index.documents == len(EXAMPLES)
+    assert index.trained_version == 1
+    loaded = SuggestionIndex.load(suggestions_path_for(showcase))
+    text = report_text('<div id="report-content"><p>Patients at the clinic</p></div>')
+    assert loaded.suggest(text) == index.suggest(text)
+    assert loaded.suggest(text)[0][0] == "healthcare"
+
+def test_update_showcase_reads_new_reports_once(tmp_path, monkeypatch):
+    import builtins
+    from update_showcase import update_showcase
+    reports_dir = tmp_path / "instructor_reports"
+    reports_dir.mkdir()
+    data = {'version': 0, 'reports': {}, 'order': [], 'categories': ['healthcare', 'environment']}
+    for number, (text, categories) in enumerate(EXAMPLES):
+        filename = f"report-{number}.html"
+        (reports_dir / filename).write_text(f'<div id="report-content"><p>{text}</p></div>', encoding="utf-8")
+        data['reports'][filename] = {'title': text, 'description': '', 'categories': categories, 'enabled': True}
+    showcase = str(tmp_path / "showcase.html")
+    save_showcase_data(showcase_data_path(showcase), data)
+    train_showcase_index(showcase, str(reports_dir))
+
+    new_report = reports_dir / "new.html"
+    new_report.write_text('<div id="report-content"><p>Patients waiting at the clinic</p></div>', encoding="utf-8")
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if str(file) == str(new_report):
+            opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    result = update_showcase(showcase, str(reports_dir), precompress=False)
+    assert result['reports']['new.html']['categories'][0] == "healthcare"
+    assert len(opened) == 1
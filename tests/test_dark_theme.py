@@ -0,0 +1,32 @@
+from dark_theme import (
+    check_theme_coverage, build_theme_css, DARK_THEME_RULES, DARK_THEME_CSS, ACCENT_TEXT
+)
+from report_injection import apply_injections
+
+def test_theme_covers_colours_patched_by_polling():
+    assert check_theme_coverage() == []
+
+def test_coverage_check_reports_missing_colours():
+    # Drop the purple fix-up rule and every purple should be reported
+    rules = [rule for rule in DARK_THEME_RULES if '[style*="#23004d" i]' not in rule[0]]
+    missing = check_theme_coverage(build_theme_css(rules))
+    assert 'rgb(35, 0, 77)' in missing
+    assert 'rgb(255, 255, 255)' not in missing
+
+def test_coverage_check_reads_the_stylesheet_text():
+    # A selector missing from the emitted CSS, or a rule that sets the wrong colour
+    css = DARK_THEME_CSS.replace('[style*="#9932cc" i]', '[style*="#9932cd" i]')
+    assert check_theme_coverage(css) == ['#9932cc']
+    css = build_theme_css([(['[style*="rgb(248" i]'], {'background-color': 'white'})])
+    assert 'rgb(248' in check_theme_coverage(css)
+
+def test_theme_is_scoped_to_dark_class():
+    css = build_theme_css([(['html', 'p'], ACCENT_TEXT)], variables={})
+    assert 'html.sway-dark,\n' in css
+    assert 'html.sway-dark p {' in css
+
+def test_report_has_static_theme_and_no_polling():
+    html = apply_injections("<html><head></head><body></body></html>")
+    assert DARK_THEME_CSS in html
+    assert 'setInterval' not in html
+    assert 'MutationObserver' in html
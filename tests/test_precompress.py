@@ -0,0 +1,48 @@
+import gzip
+import json
+
+from precompress import precompress_files
+
+def test_precompress_writes_siblings_and_skips_unchanged(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<p>hello</p>" * 200, encoding="utf-8")
+    manifest_path = tmp_path / "manifest.json"
+
+    assert precompress_files([str(page)], str(manifest_path)) == {"compressed": 1, "skipped": 0}
+    assert gzip.decompress((tmp_path / "page.html.gz").read_bytes()) == page.read_bytes()
+    entry = json.loads(manifest_path.read_text())["page.html"]
+    assert entry["encodings"][".gz"]["ratio"] < 0.1
+
+    assert precompress_files([str(page)], str(manifest_path)) == {"compressed": 0, "skipped": 1}
+
+    page.write_text("<p>changed</p>", encoding="utf-8")
+    assert precompress_files([str(page)], str(manifest_path)) == {"compressed": 1, "skipped": 0}
+    assert gzip.decompress((tmp_path / "page.html.gz").read_bytes()) == b"<p>changed</p>"
+
+def test_missing_sibling_is_recreated(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text("<p>hello</p>", encoding="utf-8")
+    manifest_path = tmp_path / "manifest.json"
+    precompress_files([str(page)], str(manifest_path))
+    (tmp_path / "page.html.gz").unlink()
+    assert precompress_files([str(page)], str(manifest_path))["compressed"] == 1
+    assert (tmp_path / "page.html.gz").exists()
+
+def test_update_showcase_recompresses_rewritten_reports(tmp_path, monkeypatch):
+    import base64
+    from update_showcase import update_showcase
+    reports_dir = tmp_path / "site" / "instructor_reports"
+    reports_dir.mkdir(parents=True)
+    report = reports_dir / "report.html"
+    image = base64.b64encode(b"\x89PNG\r\n\x1a\nfake image bytes").decode("ascii")
+    report.write_text(f'<html><body><img src="data:image/png;base64,{image}"></body></html>', encoding="utf-8")
+    precompress_files([str(report)])
+    # Run from somewhere else: the manifest still goes next to the showcase
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+
+    update_showcase(str(tmp_path / "site" / "showcase.html"), str(reports_dir), extract_assets=True)
+    assert gzip.decompress((reports_dir / "report.html.gz").read_bytes()) == report.read_bytes()
+    manifest = json.loads((tmp_path / "site" / "compression_manifest.json").read_text())
+    assert set(manifest) == {"showcase.html", "instructor_reports/report.html"}
+    assert not (tmp_path / "elsewhere" / "compression_manifest.json").exists()
@@ -0,0 +1,40 @@
+import os
+import base64
+
+from report_assets import extract_inline_images, extract_assets_in_file, asset_name
+
+PNG = b'\x89PNG\r\n\x1a\nfake image bytes'
+INLINE = base64.b64encode(PNG).decode('ascii')
+
+def make_report(*images):
+    tags = ''.join(f'<img src="data:image/png;base64,{data}" alt="chart">' for data in images)
+    return f'<html><body>{tags}<img src="logo.png"></body></html>'
+
+def test_identical_images_are_written_once(tmp_path):
+    html_path = tmp_path / 'report.html'
+    html, assets, written = extract_inline_images(make_report(INLINE, INLINE), str(html_path))
+    name = asset_name(PNG, 'png')
+    assert assets == [str(tmp_path / 'assets' / name)]
+    assert written == 1
+    assert html.count(f'src="assets/{name}"') == 2
+    assert 'data:image' not in html
+    assert 'src="logo.png"' in html
+    assert (tmp_path / 'assets' / name).read_bytes() == PNG
+
+def test_shared_assets_dir_across_reports(tmp_path):
+    assets_dir = tmp_path / 'assets'
+    for directory in ('visible', 'hidden'):
+        report = tmp_path / directory / 'report.html'
+        report.parent.mkdir()
+        report.write_text(make_report(INLINE), encoding='utf-8')
+        extract_assets_in_file(str(report), str(assets_dir))
+        assert f'src="../assets/{asset_name(PNG, "png")}"' in report.read_text(encoding='utf-8')
+    assert len(os.listdir(assets_dir)) == 1
+
+def test_extraction_is_idempotent(tmp_path):
+    report = tmp_path / 'report.html'
+    report.write_text(make_report(INLINE), encoding='utf-8')
+    extract_assets_in_file(str(report))
+    first = report.read_text(encoding='utf-8')
+    assert extract_assets_in_file(str(report)) == ([], 0)
+    assert report.read_text(encoding='utf-8') == first
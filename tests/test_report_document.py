@@ -0,0 +1,125 @@
+import report_document
+from report_document import (
+    DEFAULT_DESCRIPTION, DocumentCache, parse_report_document, read_report_document, read_report_documents,
+    truncate_snippet
+)
+from showcase_data import load_showcase_data, showcase_data_path
+from update_showcase import update_showcase
+
+REPORT = """<html><head><title>Report</title></head><body>
+<h1 class="generated-title">Climate &amp; Justice</h1>
+<p>Header paragraph outside the report body.</p>
+<div class="markdown-content" id="report-content">
+<h2>Summary</h2>
+<p>Students debated <strong>carbon taxes</strong> &amp; fairness.</p>
+<p>Second paragraph.</p>
+</div></body></html>
+"""
+
+def test_extracts_title_categories_and_first_body_paragraph():
+    document = parse_report_document(REPORT, 'climate.html')
+    assert document.title == "Climate & Justice"
+    assert document.description == "Students debated carbon taxes & fairness."
+    assert document.categories == ["ethics", "environment", "social-issues"]
+
+def test_falls_back_to_filename_and_default_description():
+    document = parse_report_document('<div id="report-content"><h2>No paragraphs</h2></div><p>Later</p>',
+                                     'reports/organ-markets.html')
+    assert document.title == "organ markets"
+    assert document.description == DEFAULT_DESCRIPTION
+
+def test_long_paragraph_is_truncated_after_the_sentence():
+    text = ' '.join(['word'] * 55) + ' end here. More text follows.'
+    assert truncate_snippet(text) == ' '.join(['word'] * 50) + ' word word word word word end here....'
+
+def test_unreadable_file_returns_defaults(tmp_path):
+    document = read_report_document(str(tmp_path / 'missing-report.html'))
+    assert document.title == "missing report"
+    assert document.categories == ["ethics"]
+    assert document.description == DEFAULT_DESCRIPTION
+
+def test_cache_serves_unchanged_reports_and_reparses_edits(tmp_path, monkeypatch):
+    report = tmp_path / 'climate.html'
+    report.write_text(REPORT, encoding='utf-8')
+    cache_path = str(tmp_path / 'cache.json')
+
+    cache = DocumentCache(cache_path)
+    document = read_report_document(str(report), cache)
+    cache.save()
+
+    # An unchanged file is not parsed again
+    monkeypatch.setattr(report_document, 'parse_report_document', None)
+    assert read_report_document(str(report), DocumentCache(cache_path)) == document
+    monkeypatch.undo()
+
+    report.write_text(REPORT.replace('Climate', 'Ocean'), encoding='utf-8')
+    assert read_report_document(str(report), DocumentCache(cache_path)).title == "Ocean & Justice"
+
+def test_unchanged_update_keeps_version(tmp_path):
+    reports_dir = tmp_path / 'instructor_reports'
+    reports_dir.mkdir()
+    (reports_dir / 'climate.html').write_text(REPORT, encoding='utf-8')
+    showcase = str(tmp_path / 'showcase.html')
+
+    update_showcase(showcase, str(reports_dir), precompress=False)
+    version = load_showcase_data(showcase_data_path(showcase))['version']
+    result = update_showcase(showcase, str(reports_dir), precompress=False)
+    assert result['reports']['climate.html']['title'] == "Climate & Justice"
+    assert load_showcase_data(showcase_data_path(showcase))['version'] == version
+
+def test_parallel_read_matches_serial(tmp_path):
+    paths = []
+    for index in range(6):
+        path = tmp_path / f'report-{index}.html'
+        path.write_text(REPORT.replace('Climate', f'Climate {index}'), encoding='utf-8')
+        paths.append(str(path))
+    paths.append(str(tmp_path / 'missing.html'))
+
+    cache = DocumentCache(str(tmp_path / 'cache.json'))
+    parallel = read_report_documents(paths, cache, workers=3)
+    assert parallel == read_report_documents(paths, workers=1)
+    assert list(parallel) == paths
+    # Unreadable files are not cached
+    assert sorted(cache.entries) == sorted(paths[:-1])
+
+def test_update_showcase_extract_helpers(tmp_path):
+    from update_showcase import extract_title_and_categories, extract_first_paragraph
+    report = tmp_path / 'climate.html'
+    report.write_text(REPORT, encoding='utf-8')
+    assert extract_title_and_categories(str(report)) == ("Climate & Justice", ["ethics", "environment", "social-issues"])
+    assert extract_first_paragraph(str(report)) == "Students debated carbon taxes & fairness."
+
+def test_edits_during_the_scan_are_merged(tmp_path, monkeypatch):
+    import threading
+    import update_showcase as update_module
+    from showcase_data import save_showcase_data, showcase_lock
+    reports_dir = tmp_path / 'instructor_reports'
+    reports_dir.mkdir()
+    for name in ('climate.html', 'ocean.html'):
+        (reports_dir / name).write_text(REPORT, encoding='utf-8')
+    showcase = str(tmp_path / 'showcase.html')
+    update_showcase(showcase, str(reports_dir), precompress=False)
+    data_path = showcase_data_path(showcase)
+
+    def edit():
+        # What the category manager does for an assign and a hide
+        with showcase_lock(data_path):
+            data = load_showcase_data(data_path)
+            data['reports']['climate.html']['categories'] = ['law']
+            data['reports']['ocean.html']['enabled'] = False
+            (reports_dir / 'ocean.html').rename(tmp_path / 'hidden_reports' / 'ocean.html')
+            save_showcase_data(data_path, data)
+
+    real_read = update_module.read_report_documents
+    def read_and_edit(*args, **kwargs):
+        editor = threading.Thread(target=edit)
+        editor.start()
+        editor.join(5)
+        assert not editor.is_alive(), "the scan holds the store lock"
+        return real_read(*args, **kwargs)
+
+    monkeypatch.setattr(update_module, 'read_report_documents', read_and_edit)
+    update_showcase(showcase, str(reports_dir), precompress=False)
+    reports = load_showcase_data(data_path)['reports']
+    assert reports['climate.html']['categories'] == ['law']
+    assert reports['ocean.html']['enabled'] is False
@@ -0,0 +1,63 @@
+from report_injection import (
+    apply_injections, strip_injections, find_injections, INJECTED_BLOCKS, INJECTION_VERSION
+)
+
+CLEAN_REPORT = "<html><head><title>Report</title></head><body><p>Hello</p></body></html>"
+
+# Abbreviated copies of the unmarked blocks older builds appended on every run
+LEGACY_CSS = """
+    <style>
+    /* Style for our custom title */
+    .custom-report-title {
+        font-size: 1.75rem;
+    }
+    </style>
+    """
+LEGACY_HEAD = """
+<script>
+  // Detect dark mode from URL parameter
+  function isDarkModeEnabled() {}
+</script>
+
+<style id="darkmode-styles">
+  /* Dark mode styles will be enabled via JavaScript */
+</style>
+"""
+LEGACY_BODY = """
+<script>
+  // Dark mode implementation
+  (function() {
+    // Only apply if the darkmode parameter is true
+    if (!isDarkModeEnabled()) return;
+    document.addEventListener('DOMContentLoaded', function() {
+      setInterval(forceDarkElements, 1000);
+    });
+  })();
+</script>
+"""
+
+def test_apply_injections_is_idempotent():
+    once = apply_injections(CLEAN_REPORT)
+    twice = apply_injections(once)
+    assert once == twice
+    assert find_injections(once) == {name: INJECTION_VERSION for name in INJECTED_BLOCKS}
+    assert once.count('id="darkmode-styles"') == 1
+
+def test_strip_injections_restores_clean_file():
+    assert strip_injections(apply_injections(CLEAN_REPORT)) == CLEAN_REPORT
+
+def test_legacy_unmarked_blocks_are_replaced():
+    # Simulate several runs of the old build that appended blocks every time
+    legacy = CLEAN_REPORT
+    for _ in range(3):
+        legacy = legacy.replace("</head>", LEGACY_CSS + LEGACY_HEAD + "</head>")
+        legacy = legacy.replace("</body>", LEGACY_BODY + "</body>")
+    assert strip_injections(legacy) == CLEAN_REPORT
+    assert apply_injections(legacy) == apply_injections(CLEAN_REPORT)
+
+def test_separate_injection_passes_keep_earlier_blocks():
+    # construct_report.py injects the title CSS and the dark mode blocks in separate passes
+    html = apply_injections(CLEAN_REPORT, names=['custom-title-css'])
+    html = apply_injections(html, names=['dark-mode-head', 'dark-mode-body'])
+    assert ".custom-report-title {" in html
+    assert html == apply_injections(CLEAN_REPORT)
@@ -0,0 +1,34 @@
+import datetime
+from report_metadata import extract_metadata, redact_spans
+
+REPORT_HEADER = """<html><head><style>h1 { color: red; }</style></head><body>
+<h1 class="generated-title">Debating Organ Markets</h1>
+<div class="row">
+<div class="col-5 col-label">Completion deadline:</div>
+<div class="col-7 col-value"><span class="utc-time" data-utc-time="2025-04-21 03:59:00+0000">Apr 21</span></div>
+</div>
+<div class="row">
+<div class="col-5 col-label">Instructor:</div>
+<div class="col-7 col-value">Jane Doe</div>
+</div>
+"""
+
+def test_extracts_all_metadata_from_header():
+    html = REPORT_HEADER + '<div class="markdown-content" id="report-content"><h2>Summary</h2></div></body></html>'
+    metadata = extract_metadata(html)
+
+    assert metadata.title == "Debating Organ Markets"
+    assert metadata.deadline == datetime.datetime(2025, 4, 21, 3, 59, tzinfo=datetime.timezone.utc)
+    assert "Jane Doe" not in redact_spans(html, metadata.instructor_spans)
+    assert "[redacted]" in redact_spans(html, metadata.instructor_spans)
+
+def test_generated_title_div_takes_priority_over_headings():
+    html = '<h1>Heading</h1><div class="generated-title text-info mb-1">Generated</div>'
+    assert extract_metadata(html).title == "Generated"
+
+def test_title_falls_back_to_report_body():
+    html = '<html><body><div id="report-content"><h2>Only In Body</h2></div></body></html>'
+    metadata = extract_metadata(html)
+    assert metadata.title == "Only In Body"
+    assert metadata.deadline is None
+    assert metadata.instructor_spans == []
@@ -0,0 +1,42 @@
+import os
+import stat
+from report_pipeline import ReportPipeline, write_file_atomic
+
+def test_pipeline_reads_once_and_writes_once(tmp_path):
+    report_path = tmp_path / "report.html"
+    report_path.write_text("<html><body>Instructor: Jane</body></html>", encoding="utf-8")
+
+    def extract(report):
+        report["title"] = "Report"
+
+    def redact(report):
+        report["content"] = report["content"].replace("Jane", "[redacted]")
+
+    report = ReportPipeline([extract, redact]).run(str(report_path))
+
+    assert report["changed"]
+    assert report["title"] == "Report"
+    assert report_path.read_text(encoding="utf-8") == "<html><body>Instructor: [redacted]</body></html>"
+    # The temporary file used for the atomic write is cleaned up by the rename
+    assert os.listdir(tmp_path) == ["report.html"]
+
+def test_pipeline_skips_write_when_unchanged(tmp_path):
+    report_path = tmp_path / "report.html"
+    report_path.write_text("<html></html>", encoding="utf-8")
+    mtime = os.stat(report_path).st_mtime_ns
+
+    report = ReportPipeline([lambda report: None]).run(str(report_path))
+
+    assert not report["changed"]
+    assert os.stat(report_path).st_mtime_ns == mtime
+
+def test_atomic_write_uses_default_permissions_for_new_files(tmp_path):
+    umask = os.umask(0o022)
+    os.umask(umask)
+    new_path = tmp_path / "new.html"
+    write_file_atomic(str(new_path), "<html></html>")
+    assert stat.S_IMODE(os.stat(new_path).st_mode) == 0o666 & ~umask
+
+    os.chmod(new_path, 0o640)
+    write_file_atomic(str(new_path), b"<html>again</html>")
+    assert stat.S_IMODE(os.stat(new_path).st_mode) == 0o640
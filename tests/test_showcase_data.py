@@ -0,0 +1,56 @@
+from showcase_data import (
+    load_or_migrate, load_showcase_data, save_showcase_data, scrape_showcase_html,
+    render_showcase, write_showcase_html, showcase_data_path
+)
+
+def make_data():
+    return {
+        'version': 0,
+        'reports': {
+            'a.html': {'title': 'Tom & Jerry', 'description': 'Uses <b> & "quotes"', 'categories': ['ethics'], 'enabled': True},
+            'b.html': {'title': 'Second', 'description': 'Two', 'categories': [], 'enabled': False},
+        },
+        'order': ['b.html', 'missing.html', 'b.html'],
+        'categories': ['ethics'],
+    }
+
+def test_save_bumps_version_and_normalizes_order(tmp_path):
+    path = str(tmp_path / 'showcase.json')
+    data = make_data()
+    assert save_showcase_data(path, data) == 1
+    assert save_showcase_data(path, data) == 2
+    loaded = load_showcase_data(path)
+    assert loaded['version'] == 2
+    assert loaded['order'] == ['b.html', 'a.html']
+
+def test_rendered_page_round_trips(tmp_path):
+    showcase = tmp_path / 'showcase.html'
+    data = make_data()
+    save_showcase_data(showcase_data_path(str(showcase)), data)
+    write_showcase_html(str(showcase), data, precompress=False)
+
+    scraped = scrape_showcase_html(str(showcase))
+    assert scraped['order'] == data['order']
+    assert scraped['categories'] == data['categories']
+    assert scraped['reports']['a.html']['title'] == 'Tom & Jerry'
+    assert scraped['reports']['a.html']['description'] == 'Uses <b> & "quotes"'
+    assert scraped['reports']['b.html']['enabled'] is False
+
+def test_migrates_from_html_once(tmp_path):
+    showcase = tmp_path / 'showcase.html'
+    data = make_data()
+    write_showcase_html(str(showcase), data, precompress=False)
+
+    migrated = load_or_migrate(str(showcase))
+    assert migrated['version'] == 1
+    assert (tmp_path / 'showcase.json').exists()
+    # Once the store exists the page is no longer read
+    showcase.write_text('', encoding='utf-8')
+    assert load_or_migrate(str(showcase)) == migrated
+
+def test_render_escapes_text_and_is_deterministic():
+    page = render_showcase(make_data())
+    assert 'Tom &amp; Jerry' in page
+    assert 'Uses &lt;b&gt; &amp; &#34;quotes&#34;' in page
+    assert '&amp;amp;' not in page
+    assert page == render_showcase(make_data())
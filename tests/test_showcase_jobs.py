@@ -0,0 +1,49 @@
+import threading
+import time
+
+from showcase_jobs import JobRunner
+
+def wait_for(runner, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = runner.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_queued_duplicates_are_coalesced():
+    release = threading.Event()
+    runs = []
+
+    def run(progress, name):
+        release.wait(5)
+        progress(1, 1)
+        runs.append(name)
+        return name
+
+    runner = JobRunner(run)
+    first = runner.submit(name='a')
+    second = runner.submit(name='a')
+    third = runner.submit(name='a')
+    # The first job may already be running; later identical requests share one queued job
+    assert second['id'] == third['id']
+    assert runner.get(third['id'])['requests'] >= 2
+    release.set()
+
+    job = wait_for(runner, third['id'])
+    wait_for(runner, first['id'])
+    assert job['result'] == 'a'
+    assert job['progress'] == {'scanned': 1, 'total': 1}
+    assert job['duration'] is not None
+    assert len(runs) <= 2
+
+def test_failed_job_reports_error():
+    def run(progress):
+        raise RuntimeError("boom")
+
+    runner = JobRunner(run)
+    job = wait_for(runner, runner.submit()['id'])
+    assert job['status'] == 'failed'
+    assert job['error'] == 'boom'
+    assert runner.get('missing') is None
@@ -0,0 +1,50 @@
+import datetime
+import os
+
+from snapshot_store import SnapshotStore, import_legacy_backups
+
+def objects(directory):
+    return sorted(os.listdir(os.path.join(directory, "objects")))
+
+def test_identical_snapshots_are_skipped_and_content_deduplicated(tmp_path):
+    store = SnapshotStore(str(tmp_path / "backups"))
+    first = store.add({"html": "<p>a</p>", "data": "{}"}, "first")
+    assert first is not None
+    assert store.add({"html": "<p>a</p>", "data": "{}"}, "again") is None
+    second = store.add({"html": "<p>b</p>", "data": "{}"}, "second")
+    # The unchanged data file is stored once
+    assert len(objects(store.directory)) == 3
+    assert second["files"]["data"] == first["files"]["data"]
+
+    reloaded = SnapshotStore(store.directory)
+    assert [s["label"] for s in reloaded.snapshots] == ["first", "second"]
+    assert reloaded.read(first["id"], "html") == "<p>a</p>"
+
+def test_retention_keeps_recent_daily_and_weekly(tmp_path):
+    store = SnapshotStore(str(tmp_path / "backups"))
+    start = datetime.datetime(2025, 1, 1, 12)
+    # Three snapshots a day for 60 days
+    for n in range(180):
+        created = start + datetime.timedelta(hours=8 * n)
+        store.add({"data": str(n)}, created=created, retain=False)
+    store.apply_retention(keep_last=5, keep_daily=7, keep_weekly=4)
+
+    kept = [datetime.datetime.fromisoformat(s["created"]) for s in store.snapshots]
+    assert len(kept) < 20
+    assert kept[-1] == start + datetime.timedelta(hours=8 * 179)
+    # One per day for the last 7 days, and weekly snapshots reach further back
+    assert len({k.date() for k in kept}) >= 7
+    assert min(kept) < kept[-1] - datetime.timedelta(days=14)
+    # Objects of dropped snapshots are deleted
+    assert len(objects(store.directory)) == len(kept)
+
+def test_import_legacy_backups(tmp_path):
+    showcase = tmp_path / "showcase.html"
+    for stamp, data in (("20250101_100000", "{}"), ("20250101_110000", "{}"), ("20250102_100000", "[]")):
+        (tmp_path / f"showcase_{stamp}_backup.html").write_text("<p>same</p>", encoding="utf-8")
+        (tmp_path / f"showcase_{stamp}_data.json").write_text(data, encoding="utf-8")
+
+    assert import_legacy_backups(str(showcase), remove_imported=True) == 2
+    store = SnapshotStore(str(tmp_path / "backups"))
+    assert [s["created"] for s in store.snapshots] == ["2025-01-01T10:00:00", "2025-01-02T10:00:00"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["backups"]
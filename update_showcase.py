@@ -1,244 +1,69 @@
 #!/usr/bin/env python3
 import os
-import re
+import copy
 import random
-import html
-import json
-import shutil
 import argparse
-from datetime import datetime
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+from report_assets import ASSETS_DIR, extract_assets_in_file
+from precompress import manifest_path_for, precompress_files
+from snapshot_store import snapshot_showcase
+from report_document import DocumentCache, document_cache_path, read_report_document, read_report_documents
+from category_classifier import keywords_file_for, load_classifier
+from category_suggestions import load_showcase_index
+from showcase_data import (
+    load_or_migrate, save_showcase_data, showcase_data_path, scrape_showcase_html, write_showcase_html,
+    showcase_lock
+)
 
 def extract_title_and_categories(html_file):
     """
     Extract the title and infer categories based on the filename and content.
-    Only used for NEW reports that don't exist in the showcase yet.
-    
+
     Args:
         html_file: Path to HTML file
-    
+
     Returns:
         Tuple of (title, categories)
     """
-    # Default categories if we can't infer any
-    default_categories = ["ethics"]
-    
-    try:
-        with open(html_file, 'r', encoding='utf-8') as file:
-            content = file.read()
-            
-        # Extract title
-        title_match = re.search(r'<h1\s+class="generated-title">\s*(.*?)\s*</h1>', content, re.DOTALL)
-        if title_match:
-            title = title_match.group(1).strip()
-        else:
-            # Use filename as fallback
-            title = os.path.basename(html_file).replace('.html', '').replace('-', ' ')
-            
-        # Infer categories from title and content
-        categories = default_categories.copy()
-        
-        # Keywords for different categories
-        category_keywords = {
-            "healthcare": ["health", "hospital", "patient", "medical", "doctor", "care", "treatment", "therapy", "illness", "disease"],
-            "science": ["science", "scientific", "research", "biology", "physics", "chemistry", "species", "evolution", "genetic"],
-            "philosophy": ["philosophy", "philosophical", "ethics", "moral", "value", "virtue", "principle", "duty", "utilitarianism", "deontology", "morality"],
-            "bioethics": ["bioethics", "abortion", "euthanasia", "clone", "genetic engineering", "enhancement", "reproductive"],
-            "environment": ["environment", "climate", "ecology", "conservation", "species", "extinction", "habitat", "animal", "sustainability"],
-            "social-issues": ["social", "society", "community", "inequality", "justice", "discrimination", "policy", "politics", "economic", "poverty"]
-        }
-        
-        # Check title and content for keywords
-        lowercase_title = title.lower()
-        lowercase_content = content.lower()
-        
-        for category, keywords in category_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in lowercase_title or keyword.lower() in lowercase_content[:10000]:  # Only search first part of content
-                    if category not in categories:
-                        categories.append(category)
-                    break
-                        
-        return title, categories
-    
-    except Exception as e:
-        print(f"Error processing {html_file}: {e}")
-        return os.path.basename(html_file).replace('.html', '').replace('-', ' '), default_categories
+    document = read_report_document(html_file)
+    return document.title, document.categories
 
 def extract_first_paragraph(html_file):
     """
     Extract the first paragraph from the instructor report,
     limiting to 50 words plus the remainder of the current sentence, followed by ellipsis.
-    
+
     Args:
         html_file: Path to HTML file
-    
+
     Returns:
         String containing the truncated first paragraph text, or a default message if not found
     """
-    try:
-        with open(html_file, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        # Look for the report content div
-        report_content = soup.find('div', id='report-content', class_='markdown-content')
-        
-        # If not found, try alternative selectors
-        if not report_content:
-            report_content = soup.find('div', id='report-content')
-        
-        if not report_content:
-            report_content = soup.find('div', class_='markdown-content')
-        
-        if report_content:
-            # Find the first paragraph
-            first_paragraph = report_content.find('p')
-            
-            if first_paragraph:
-                text = first_paragraph.get_text().strip()
-                
-                # Process the text to limit to 50 words + remainder of sentence
-                words = text.split()
-                
-                if len(words) <= 50:
-                    # If the paragraph is less than 50 words, return it all
-                    return text
-                
-                # Get the first 50 words
-                truncated_text = ' '.join(words[:50])
-                
-                # Find the end of the current sentence after 50 words
-                remaining_text = ' '.join(words[50:])
-                sentence_end_match = re.search(r'^(.*?[.!?])', remaining_text)
-                
-                if sentence_end_match:
-                    # Add the remainder of the current sentence
-                    truncated_text += ' ' + sentence_end_match.group(1)
-                
-                # Add ellipsis
-                truncated_text += '...'
-                
-                return truncated_text
-        
-        # Fall back to a default description if we couldn't find the paragraph
-        return "Instructor report for this assignment."
-        
-    except Exception as e:
-        print(f"Error extracting paragraph from {html_file}: {e}")
-        return "Instructor report for this assignment."
+    return read_report_document(html_file).description
 
 def extract_existing_reports_data(showcase_file):
     """
-    Extract existing reports' data from the showcase file.
-    This preserves categories, order, and other custom settings.
+    Extract reports' data from the report cards of a showcase HTML file.
+    The showcase data now lives in the JSON store (see showcase_data.py); this
+    is only needed to read HTML backups.
     
     Args:
         showcase_file: Path to the showcase HTML file
         
     Returns:
-        Dictionary of filename -> report data
+        Dictionary with 'reports' (filename -> report data), 'order' and 'categories'
     """
     if not os.path.exists(showcase_file):
-        return {}
-        
+        return {'reports': {}, 'order': [], 'categories': []}
     try:
-        with open(showcase_file, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        soup = BeautifulSoup(content, 'html.parser')
-        
-        existing_reports = {}
-        report_order = []
-        
-        # Extract all categories first
-        all_categories = []
-        category_pills = soup.select('.category-pill')
-        for pill in category_pills:
-            if 'data-category' in pill.attrs:
-                category = pill['data-category']
-                if category != 'all':  # Skip the "All Reports" category
-                    all_categories.append(category)
-        
-        # Extract all report cards
-        report_cards = soup.select('.report-card')
-        print(f"DEBUG: Found {len(report_cards)} report card elements in HTML")
-        
-        processed_filenames = set()  # Track filenames to avoid duplicates
-        
-        for card in report_cards:
-            # Extract report data
-            title_elem = card.select_one('.report-title')
-            desc_elem = card.select_one('.report-description')
-            link_elem = card.select_one('.view-link')
-            
-            # Skip if any required element is missing
-            if not title_elem or not desc_elem or not link_elem:
-                print(f"DEBUG: Skipping card missing required elements")
-                continue
-                
-            # Get title, description, and filename
-            title = html.unescape(title_elem.get_text().strip())
-            description = html.unescape(desc_elem.get_text().strip())
-            href = link_elem.get('href', '')
-            
-            # Extract filename from href, handling different formats
-            if href:
-                if '?' in href:
-                    # Remove query parameters if present
-                    href = href.split('?')[0]
-                filename = os.path.basename(href)
-            else:
-                filename = None
-            
-            # Skip if filename is missing or already processed
-            if not filename:
-                print(f"DEBUG: Skipping card with missing filename")
-                continue
-                
-            if filename in processed_filenames:
-                print(f"DEBUG: Skipping duplicate filename: {filename}")
-                continue
-            
-            processed_filenames.add(filename)
-            
-            # Get categories
-            categories = []
-            if 'data-categories' in card.attrs:
-                categories = card['data-categories'].split()
-            
-            # Properly detect if a report is disabled (using both attribute and class)
-            is_disabled_attr = 'data-disabled' in card.attrs and card['data-disabled'] == 'true'
-            is_disabled_class = 'disabled-report' in card.get('class', [])
-            enabled = not (is_disabled_attr or is_disabled_class)
-            
-            # Store report data
-            existing_reports[filename] = {
-                'title': title,
-                'description': description,
-                'categories': categories,
-                'enabled': enabled
-            }
-            
-            # Track the order
-            report_order.append(filename)
-        
-        print(f"DEBUG: Successfully processed {len(existing_reports)} unique reports")
-        
-        # Add order information to the return value
-        return {
-            'reports': existing_reports,
-            'order': report_order,
-            'categories': all_categories
-        }
-        
+        return scrape_showcase_html(showcase_file)
     except Exception as e:
         print(f"Error extracting existing reports: {e}")
         return {'reports': {}, 'order': [], 'categories': []}
 
-def update_showcase(showcase_file, reports_dir, refresh_existing=False):
+def update_showcase(showcase_file, reports_dir, refresh_existing=False, extract_assets=False, precompress=True,
+                    progress=None, use_cache=True, workers=1, keywords_file=None):
     """
     Update the showcase HTML file with new report cards while preserving
     existing categorization, order, and settings.
@@ -247,11 +72,16 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
         showcase_file: Path to the showcase HTML file
         reports_dir: Path to the directory containing report HTML files
         refresh_existing: If True, refresh data for existing reports from their HTML files
+        extract_assets: If True, move inline base64 images in the reports to a shared assets directory
+        precompress: If True, write .gz/.br copies of the showcase file (and of the reports
+            rewritten by extract_assets) for static serving
+        progress: Optional callable(scanned, total), called as report files are processed
+        use_cache: If True, serve the fields of unchanged reports from the document cache
+            instead of parsing them again
+        workers: Number of processes parsing reports; the result is the same for any number
+        keywords_file: JSON keyword table for inferring categories, defaults to
+            category_keywords.json next to the showcase file (or the built-in table)
     """
-    if not os.path.exists(showcase_file):
-        print(f"Showcase file {showcase_file} not found.")
-        return
-        
     if not os.path.exists(reports_dir):
         print(f"Reports directory {reports_dir} not found.")
         return
@@ -260,25 +90,16 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
     hidden_dir = os.path.join(os.path.dirname(reports_dir), "hidden_reports")
     os.makedirs(hidden_dir, exist_ok=True)
     
-    # Create a real timestamped backup of the showcase file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = f"{showcase_file.replace('.html', '')}_{timestamp}_backup.html"
-    try:
-        shutil.copy2(showcase_file, backup_path)
-        print(f"Created backup of showcase file: {backup_path}")
-    except Exception as e:
-        print(f"Warning: Failed to create backup: {e}")
-        # Continue anyway - we might be creating a new file
-    
-    # Extract existing data from the showcase file
-    existing_data = extract_existing_reports_data(showcase_file)
-    existing_reports = existing_data.get('reports', {})
-    existing_order = existing_data.get('order', [])
-    all_categories = existing_data.get('categories', [])
-    
-    print(f"Found {len(existing_reports)} existing reports with {len(all_categories)} categories")
-    
-    # Get all HTML files in both the reports directory and hidden directory
+    # Scan and classify the corpus without the store lock, so category manager
+    # edits don't wait for it; only the load-merge-save below holds the lock
+    documents, suggested, cache, classifier = _scan_reports(showcase_file, reports_dir, hidden_dir, extract_assets,
+                                                            precompress, progress, use_cache, workers, keywords_file)
+    with showcase_lock(showcase_data_path(showcase_file)):
+        return _merge_reports(showcase_file, reports_dir, hidden_dir, refresh_existing, precompress, documents,
+                              suggested, cache, classifier)
+
+def list_report_files(reports_dir, hidden_dir):
+    """Return (filename, path, is_visible) for the reports in the visible and hidden directories."""
     html_files = []
     
     # Reports from the main directory (visible reports)
@@ -291,6 +112,92 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
         hidden_files = [f for f in os.listdir(hidden_dir) if f.endswith('.html') and not f.startswith('.')]
         for f in hidden_files:
             html_files.append((f, os.path.join(hidden_dir, f), False))  # filename, path, is_visible
+    return html_files
+
+def _scan_reports(showcase_file, reports_dir, hidden_dir, extract_assets, precompress, progress, use_cache, workers,
+                  keywords_file):
+    """
+    Read and classify every report. Runs without the store lock.
+    
+    Returns:
+        Tuple of (path -> ReportDocument, path -> suggested categories for new
+        reports, DocumentCache or None, KeywordClassifier)
+    """
+    # Migrating from the showcase page writes the store, so this load takes the lock briefly
+    with showcase_lock(showcase_data_path(showcase_file)):
+        scanned_data = load_or_migrate(showcase_file)
+    known_reports = scanned_data.get('reports', {})
+    html_files = list_report_files(reports_dir, hidden_dir)
+    
+    if extract_assets:
+        # One assets directory next to both report directories, so links keep
+        # working when a report is moved between visible and hidden
+        assets_dir = os.path.join(os.path.dirname(reports_dir), ASSETS_DIR)
+        asset_count = 0
+        rewritten = []
+        for filename, file_path, is_visible in html_files:
+            assets, written = extract_assets_in_file(file_path, assets_dir)
+            asset_count += written
+            if assets:
+                rewritten.append(file_path)
+                print(f"Moved {len(assets)} inline images out of {filename}")
+        print(f"Wrote {asset_count} new asset files to {assets_dir}")
+        if precompress and rewritten:
+            # The old .gz/.br copies of the rewritten reports are stale now; the
+            # manifest is shared with the showcase page
+            precompress_files(rewritten, manifest_path_for([showcase_file] + rewritten))
+    
+    # New reports get the categories learned from the existing assignments, if
+    # a suggestion index has been trained; the keyword categories otherwise.
+    # Their suggestion text comes from the same read as their showcase fields.
+    new_paths = [file_path for filename, file_path, is_visible in html_files if filename not in known_reports]
+    index = load_showcase_index(showcase_file, scanned_data.get('version')) if new_paths else None
+    texts = dict.fromkeys(new_paths) if index is not None else {}
+    
+    # Parse the reports first (in parallel if asked to), then merge them in
+    # html_files order, so the result is the same as a serial run
+    classifier = load_classifier(keywords_file or keywords_file_for(showcase_file))
+    cache = DocumentCache(document_cache_path(showcase_file), classifier) if use_cache else None
+    documents = read_report_documents([file_path for filename, file_path, is_visible in html_files], cache,
+                                      workers, progress, classifier, texts)
+    
+    suggested = {}
+    if index is not None:
+        suggestions = index.suggest_many([texts[file_path] or '' for file_path in new_paths])
+        for file_path, file_suggestions in zip(new_paths, suggestions):
+            suggested[file_path] = [category for category, score in file_suggestions]
+    return documents, suggested, cache, classifier
+
+def _merge_reports(showcase_file, reports_dir, hidden_dir, refresh_existing, precompress, documents, suggested, cache,
+                   classifier):
+    """Merge the scanned reports into the current store and save it. Runs with the store lock held."""
+    # Snapshot the showcase before changing it; unchanged content isn't stored again
+    if os.path.exists(showcase_file):
+        try:
+            snapshot_showcase(showcase_file, showcase_data_path(showcase_file), 'before update_showcase')
+        except Exception as e:
+            print(f"Warning: Failed to create snapshot: {e}")
+    else:
+        print(f"Showcase file {showcase_file} not found. Creating a new one...")
+    
+    # Load the store again: edits saved during the scan are merged, not overwritten
+    existing_data = load_or_migrate(showcase_file)
+    existing_reports = existing_data.get('reports', {})
+    existing_order = existing_data.get('order', [])
+    all_categories = existing_data.get('categories', [])
+    # Compared with the result at the end, so a run that changes nothing doesn't save
+    original_data = copy.deepcopy({'reports': existing_reports, 'order': existing_order, 'categories': all_categories})
+    
+    print(f"Found {len(existing_reports)} existing reports with {len(all_categories)} categories")
+    
+    # List the files again too: reports shown or hidden during the scan have moved
+    html_files = list_report_files(reports_dir, hidden_dir)
+    for filename, file_path, is_visible in html_files:
+        if file_path not in documents:
+            documents[file_path] = read_report_document(file_path, cache, classifier)
+    if cache:
+        cache.prune([file_path for filename, file_path, is_visible in html_files])
+        cache.save()
     
     # Track new reports and updated reports
     new_reports = []
@@ -303,8 +210,7 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
             # For existing reports, update title and description data
             # but preserve enabled state unless changed by the file location
             print(f"Updating title and description for existing report: {filename}")
-            title, categories = extract_title_and_categories(file_path)
-            description = extract_first_paragraph(file_path)
+            title, categories, description = documents[file_path]
             
             # Update the enabled state based on file location
             # Preserve the existing state if it matches the file location
@@ -343,8 +249,10 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
         else:
             # This is a new report, process it
             print(f"Processing new report: {filename}")
-            title, categories = extract_title_and_categories(file_path)
-            description = extract_first_paragraph(file_path)
+            title, categories, description = documents[file_path]
+            if suggested.get(file_path):
+                categories = suggested[file_path]
+                print(f"Suggested categories for {filename}: {', '.join(categories)}")
             
             # Store new report data - enabled state based on file location
             existing_reports[filename] = {
@@ -361,6 +269,7 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
             
             new_reports.append(filename)
     
+    
     # Update the order to include new reports at the end
     updated_order = existing_order.copy()
     for filename in new_reports:
@@ -372,216 +281,24 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
         if filename not in updated_order:
             updated_order.append(filename)
     
-    # If we have a showcase file, use its structure as a base
-    if os.path.exists(showcase_file):
-        with open(showcase_file, 'r', encoding='utf-8') as file:
-            showcase_content = file.read()
-        soup = BeautifulSoup(showcase_content, 'html.parser')
+    # Save the data, then render the showcase page from it
+    showcase_data = {
+        'version': existing_data.get('version', 0),
+        'reports': existing_reports,
+        'order': updated_order,
+        'categories': all_categories
+    }
+    snapshot = None
+    if {key: showcase_data[key] for key in original_data} == original_data and os.path.exists(showcase_file):
+        # Nothing changed: keep the version (and so the ETags the category manager hands out)
+        print("Showcase data is unchanged")
+        write_showcase_html(showcase_file, showcase_data, precompress=precompress)
     else:
-        # Create a basic structure if no file exists
-        soup = BeautifulSoup('''
-        <html>
-        <head>
-            <title>Instructor Reports Showcase</title>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/5.15.3/css/all.min.css">
-            <style>
-                /* Basic styling will be added here */
-                body { font-family: Arial, sans-serif; margin: 0; padding: 0; }
-                .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-                .category-bar { display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 20px; }
-                .category-pill { background: #f0f0f0; border: none; padding: 8px 16px; border-radius: 20px; cursor: pointer; }
-                .category-pill.active { background: #007bff; color: white; }
-                .report-cards { display: grid; grid-template-columns: repeat(auto-fill, minmax(300px, 1fr)); gap: 20px; }
-                .report-card { border: 1px solid #ddd; border-radius: 8px; padding: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-                .report-title { font-size: 18px; font-weight: bold; margin-bottom: 10px; }
-                .report-description { font-size: 14px; color: #666; margin-bottom: 15px; }
-                .view-link { display: inline-block; color: #007bff; text-decoration: none; font-size: 14px; }
-                /* Dark mode */
-                body.dark-mode { background-color: #222; color: #eee; }
-                body.dark-mode .report-card { background-color: #333; border-color: #444; }
-                body.dark-mode .report-description { color: #bbb; }
-                body.dark-mode .category-pill { background: #444; color: #eee; }
-                body.dark-mode .category-pill.active { background: #0066cc; }
-                .theme-toggle { position: fixed; top: 20px; right: 20px; background: none; border: none; color: inherit; font-size: 24px; cursor: pointer; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>Instructor Reports Showcase</h1>
-                <div class="category-bar">
-                    <button class="category-pill active" data-category="all">All Reports</button>
-                </div>
-                <div class="report-cards">
-                    <!-- Report cards will be inserted here -->
-                </div>
-            </div>
-            <button class="theme-toggle" id="theme-toggle" aria-label="Toggle Dark Mode">
-                <i class="fas fa-moon"></i>
-            </button>
-            <script>
-                // Category filtering
-                document.querySelectorAll('.category-pill').forEach(pill => {
-                    pill.addEventListener('click', () => {
-                        // Update active state
-                        document.querySelectorAll('.category-pill').forEach(p => p.classList.remove('active'));
-                        pill.classList.add('active');
-                        
-                        const category = pill.getAttribute('data-category');
-                        
-                        // Filter cards
-                        document.querySelectorAll('.report-card').forEach(card => {
-                            if (category === 'all' || card.getAttribute('data-categories').includes(category)) {
-                                card.style.display = '';
-                            } else {
-                                card.style.display = 'none';
-                            }
-                        });
-                    });
-                });
-                
-                // Theme toggle
-                const themeToggle = document.getElementById('theme-toggle');
-                const body = document.body;
-                const icon = themeToggle.querySelector('i');
-                
-                // Check for saved theme preference
-                const savedTheme = localStorage.getItem('theme');
-                if (savedTheme === 'dark') {
-                    body.classList.add('dark-mode');
-                    icon.classList.remove('fa-moon');
-                    icon.classList.add('fa-sun');
-                }
-                
-                themeToggle.addEventListener('click', () => {
-                    body.classList.toggle('dark-mode');
-                    
-                    if (body.classList.contains('dark-mode')) {
-                        icon.classList.remove('fa-moon');
-                        icon.classList.add('fa-sun');
-                        localStorage.setItem('theme', 'dark');
-                    } else {
-                        icon.classList.remove('fa-sun');
-                        icon.classList.add('fa-moon');
-                        localStorage.setItem('theme', 'light');
-                    }
-                });
-                
-                // Don't show disabled reports
-                document.querySelectorAll('.report-card[data-disabled="true"]').forEach(card => {
-                    card.style.display = 'none';
-                });
-            </script>
-        </body>
-        </html>
-        ''', 'html.parser')
-    
-    # Update category pills - preserve existing categories
-    category_bar = soup.select_one('.category-bar')
-    if category_bar:
-        category_bar.clear()
-        
-        # Add "All Reports" pill
-        all_pill = soup.new_tag('button')
-        all_pill['class'] = 'category-pill active'
-        all_pill['data-category'] = 'all'
-        all_pill.string = 'All Reports'
-        category_bar.append(all_pill)
-        
-        # Add all other category pills
-        for category in all_categories:
-            pill = soup.new_tag('button')
-            pill['class'] = 'category-pill'
-            pill['data-category'] = category
-            pill.string = category.replace('-', ' ').title()
-            category_bar.append(pill)
-    
-    # Update report cards
-    report_cards_container = soup.select_one('.report-cards')
-    if report_cards_container:
-        # First completely clear the container by removing all children
-        while report_cards_container.contents:
-            report_cards_container.contents[0].decompose()
+        save_showcase_data(showcase_data_path(showcase_file), showcase_data)
+        write_showcase_html(showcase_file, showcase_data, precompress=precompress)
         
-        # Add cards in the specified order
-        for filename in updated_order:
-            if filename in existing_reports:
-                report_data = existing_reports[filename]
-                
-                # Create a new report card
-                card = soup.new_tag('div')
-                card['class'] = 'report-card'
-                
-                # Ensure categories are normalized (lowercase, no extra spaces)
-                normalized_categories = [c.strip().lower() for c in report_data['categories']]
-                # Remove any empty categories
-                normalized_categories = [c for c in normalized_categories if c]
-                
-                # Set the data-categories attribute - this is critical for filtering
-                card['data-categories'] = ' '.join(normalized_categories)
-                
-                # Add disabled attribute if report is disabled
-                if not report_data.get('enabled', True):
-                    card['data-disabled'] = 'true'
-                    card['style'] = 'display: none;'  # Initially hidden
-                    card['class'] = 'report-card disabled-report'  # Add disabled-report class
-                
-                # Add title - use a direct HTML approach to avoid escaping issues
-                title_div = soup.new_tag('div')
-                title_div['class'] = 'report-title'
-                title_div.clear()
-                
-                # Insert as raw HTML instead of text to preserve entities
-                title_html = BeautifulSoup(f"<span>{report_data['title']}</span>", 'html.parser')
-                title_div.append(title_html.span.contents[0])
-                card.append(title_div)
-                
-                # Add description - same approach
-                desc_div = soup.new_tag('div')
-                desc_div['class'] = 'report-description'
-                desc_div.clear()
-                
-                # Insert as raw HTML instead of text to preserve entities
-                desc_html = BeautifulSoup(f"<span>{report_data['description']}</span>", 'html.parser')
-                desc_div.append(desc_html.span.contents[0])
-                card.append(desc_div)
-                
-                # Add link
-                link = soup.new_tag('a')
-                link['class'] = 'view-link'
-                link['href'] = f"instructor_reports/{filename}?from_category_manager=1"
-                # No target attribute, so it opens in the same tab
-                
-                # Add icon to link
-                icon = soup.new_tag('i')
-                icon['class'] = ['fas', 'fa-external-link-alt', 'mr-1']
-                link.append(icon)
-                
-                # Add text to link
-                link.append(" View Full Report")
-                
-                card.append(link)
-                
-                # Add the report card to the container
-                report_cards_container.append(card)
-    
-    # Remove the footer if it exists
-    footer = soup.find('footer')
-    if footer:
-        footer.decompose()
-    html_output = str(soup)
-    with open(showcase_file, 'w', encoding='utf-8') as file:
-        file.write(html_output)
-    
-    # Also save a JSON backup of all report data for safer recovery
-    json_backup = f"{showcase_file.replace('.html', '')}_{timestamp}_data.json"
-    with open(json_backup, 'w', encoding='utf-8') as f:
-        json.dump({
-            'reports': existing_reports,
-            'order': updated_order,
-            'categories': all_categories
-        }, f, indent=2)
+        # Also snapshot the result for safer recovery
+        snapshot = snapshot_showcase(showcase_file, showcase_data_path(showcase_file), 'update_showcase')
     
     # Count reports in both directories
     visible_html_files = [f for f in os.listdir(reports_dir) if f.endswith('.html') and not f.startswith('.')]
@@ -593,7 +310,8 @@ def update_showcase(showcase_file, reports_dir, refresh_existing=False):
     
     print(f"Updated showcase with {len(existing_reports)} reports ({len(new_reports)} new, {len(updated_reports)} refreshed)")
     print(f"Visible reports: {len(visible_html_files)}, Hidden reports: {len(hidden_html_files)}")
-    print(f"JSON backup of all report data saved to: {json_backup}")
+    if snapshot:
+        print(f"Snapshot of the updated showcase saved as {snapshot['id']}")
     
     return {
         'reports': existing_reports,
@@ -614,11 +332,25 @@ if __name__ == "__main__":
     parser.add_argument('--reports-dir', type=str,
                        default="/Users/simon/Documents/GitHub/SwayReports/instructor_reports",
                        help='Path to the directory containing instructor reports')
+    parser.add_argument('--extract-assets', action='store_true',
+                       help='Move inline base64 images in the reports to content-addressed files in assets/')
+    parser.add_argument('--no-precompress', action='store_true',
+                       help='Skip writing pre-compressed .gz/.br copies of the showcase file '
+                            'and of reports rewritten by --extract-assets')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Parse every report again instead of using the report document cache')
+    parser.add_argument('--keywords-file', type=str,
+                       help='JSON keyword table for inferring categories (default: category_keywords.json '
+                            'next to the showcase file, if present)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for parsing reports (0 = one per CPU)')
     
     args = parser.parse_args()
     
     # Run the update with the specified options
-    result = update_showcase(args.showcase_file, args.reports_dir, args.refresh_existing)
+    result = update_showcase(args.showcase_file, args.reports_dir, args.refresh_existing, args.extract_assets,
+                             not args.no_precompress, use_cache=not args.no_cache,
+                             workers=args.workers or os.cpu_count() or 1, keywords_file=args.keywords_file)
     
     # Show a summary
     if args.refresh_existing and result['updated_reports']: